@@ -19,17 +19,18 @@ Base and utility classes for Koalas objects.
 """
 
 from functools import wraps
-from typing import Union
+from typing import List, Union
 
 import numpy as np
 import pandas as pd
 from pandas.api.types import is_list_like
 from pyspark import sql as spark
 from pyspark.sql import functions as F, Window
-from pyspark.sql.types import DoubleType, FloatType, LongType, StringType, TimestampType, \
-    to_arrow_type
+from pyspark.sql.types import BooleanType, DateType, DoubleType, FloatType, LongType, \
+    NumericType, StringType, TimestampType, to_arrow_type
 
 from databricks import koalas as ks  # For running doctests and reference resolution in PyCharm.
+from databricks.koalas.config import get_option
 from databricks.koalas.internal import _InternalFrame
 from databricks.koalas.typedef import pandas_wraps
 from databricks.koalas.utils import align_diff_series, scol_for
@@ -272,9 +273,9 @@ class IndexOpsMixin(object):
         Return boolean if values in the object are monotonically increasing.
 
         .. note:: the current implementation of is_monotonic_increasing uses Spark's
-            Window without specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            Window without specifying partition specification. When the data has more rows
+            than 'compute.ordered_window_rows' if set, it is checked per range of the index in
+            parallel, otherwise all data is moved into single partition in single machine.
 
         Returns
         -------
@@ -304,9 +305,7 @@ class IndexOpsMixin(object):
         >>> ser.rename("a").to_frame().set_index("a").index.is_monotonic
         True
         """
-        col = self._scol
-        window = Window.orderBy(self._kdf._internal.index_scols).rowsBetween(-1, -1)
-        return self._with_new_scol((col >= F.lag(col, 1).over(window)) & col.isNotNull()).all()
+        return self._is_monotonic(ascending=True)
 
     is_monotonic_increasing = is_monotonic
 
@@ -316,9 +315,9 @@ class IndexOpsMixin(object):
         Return boolean if values in the object are monotonically decreasing.
 
         .. note:: the current implementation of is_monotonic_decreasing uses Spark's
-            Window without specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            Window without specifying partition specification. When the data has more rows
+            than 'compute.ordered_window_rows' if set, it is checked per range of the index in
+            parallel, otherwise all data is moved into single partition in single machine.
 
         Returns
         -------
@@ -348,9 +347,55 @@ class IndexOpsMixin(object):
         >>> ser.rename("a").to_frame().set_index("a").index.is_monotonic_decreasing
         True
         """
+        return self._is_monotonic(ascending=False)
+
+    def _is_monotonic(self, ascending):
         col = self._scol
-        window = Window.orderBy(self._kdf._internal.index_scols).rowsBetween(-1, -1)
-        return self._with_new_scol((col <= F.lag(col, 1).over(window)) & col.isNotNull()).all()
+        index_scols = self._kdf._internal.index_scols
+
+        def is_ordered(prev, value):
+            return value >= prev if ascending else value <= prev
+
+        ranges = self._kdf._internal.ordered_ranges(index_scols)
+        if ranges is None:
+            window = Window.orderBy(index_scols).rowsBetween(-1, -1)
+            return self._with_new_scol(is_ordered(F.lag(col, 1).over(window), col)
+                                       & col.isNotNull()).all()
+
+        # Checks each range of the index in parallel, and collects only the verdict and the
+        # first and last values of each range to check the boundaries between them. The range
+        # is projected first so that the window and the aggregation share the same shuffle.
+        range_scol, _ = ranges
+        index_columns = ['__index_{}__'.format(i) for i in range(len(index_scols))]
+        sdf = self._kdf._internal.sdf.select(
+            [range_scol.alias('__range__'), col.alias('__value__')] +
+            [scol.alias(name) for scol, name in zip(index_scols, index_columns)])
+        value = F.col('__value__')
+        window = Window.partitionBy('__range__').orderBy(index_columns).rowsBetween(-1, -1)
+        ordered = F.coalesce(is_ordered(F.lag(value, 1).over(window), value), F.lit(True))
+        row = F.struct(*(index_columns + ['__value__']))
+        summaries = sdf.select('__range__', (ordered & value.isNotNull()).alias('ordered'),
+                               row.alias('row')) \
+            .groupby('__range__') \
+            .agg(F.min('ordered').alias('ordered'),
+                 F.min('row').getField('__value__').alias('first'),
+                 F.max('row').getField('__value__').alias('last'))
+
+        def sort_key(value):
+            # Spark sorts NaN after any other values.
+            if isinstance(value, float) and np.isnan(value):
+                return (1, 0.0)
+            return (0, value)
+
+        prev_last = None
+        for summary in sorted(summaries.collect(), key=lambda summary: summary[0]):
+            if not summary['ordered']:
+                return False
+            if prev_last is not None and \
+                    not is_ordered(sort_key(prev_last), sort_key(summary['first'])):
+                return False
+            prev_last = summary['last']
+        return True
 
     def astype(self, dtype):
         """
@@ -647,9 +692,11 @@ class IndexOpsMixin(object):
         Shift Series/Index by desired number of periods.
 
         .. note:: the current implementation of shift uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         Parameters
         ----------
@@ -695,9 +742,80 @@ class IndexOpsMixin(object):
         if not isinstance(periods, int):
             raise ValueError('periods should be an int; however, got [%s]' % type(periods))
 
-        col = self._scol
-        window = Window.partitionBy(*part_cols).orderBy(self._internal.index_scols)\
-            .rowsBetween(-periods, -periods)
-        lag_col = F.lag(col, periods).over(window)
+        lag_col = self._lag(periods, part_cols)
         col = F.when(lag_col.isNull() | F.isnan(lag_col), fill_value).otherwise(lag_col)
         return self._with_new_scol(col).rename(self.name)
+
+    def _lag(self, periods, part_cols=()):
+        """
+        Returns the Spark Column of the values `periods` rows before, or after if negative, in
+        the order of the index within each group of `part_cols`.
+
+        Without `part_cols`, the lags are computed per range of the index given by
+        `_InternalFrame.ordered_ranges` in parallel. The first or last `periods` values of
+        each range are collected and carried to the rows near the boundaries of the adjacent
+        ranges. The carried values are bounded by 'compute.shortcut_limit'.
+        """
+        index_scols = self._internal.index_scols
+        window = Window.partitionBy(*part_cols).orderBy(index_scols)\
+            .rowsBetween(-periods, -periods)
+        lag_col = F.lag(self._scol, periods).over(window)
+
+        spark_type = self.spark_type
+        if (len(part_cols) > 0 or periods == 0 or not isinstance(
+                spark_type, (NumericType, StringType, BooleanType, DateType, TimestampType))):
+            return lag_col
+        ranges = self._internal.ordered_ranges(index_scols)
+        if ranges is None:
+            return lag_col
+        range_scol, num_ranges = ranges
+        p = abs(periods)
+        if p * num_ranges > get_option("compute.shortcut_limit"):
+            return lag_col
+
+        # The `p` rows at the start of each range for positive periods, or at the end for
+        # negative periods, take the values carried from the adjacent ranges. `position` is
+        # the position of each row from that side of its range.
+        ascending = index_scols
+        descending = [scol.desc() for scol in index_scols]
+        position = F.row_number().over(Window.partitionBy(range_scol).orderBy(
+            ascending if periods > 0 else descending))
+
+        # The last `p` values of each range for positive periods, otherwise the first `p`
+        # values, in the order of the index.
+        edge_position = F.row_number().over(Window.partitionBy(range_scol).orderBy(
+            descending if periods > 0 else ascending))
+        rows = self._internal.sdf \
+            .select(range_scol.alias('range'), edge_position.alias('position'),
+                    self._scol.alias('value')) \
+            .filter(F.col('position') <= p).collect()
+        edges = [[] for _ in range(num_ranges)]  # type: List[list]
+        for row in sorted(rows, key=lambda row: (row['range'],
+                                                 -row['position'] if periods > 0
+                                                 else row['position'])):
+            edges[row['range']].append(row['value'])
+
+        carried = []
+        if periods > 0:
+            # The last `p` values before each range.
+            preceding = [None] * p
+            for values in edges:
+                carried.append(preceding[-p:])
+                preceding = preceding + values
+        else:
+            # The first `p` values after each range.
+            following = [None] * p
+            for values in reversed(edges):
+                carried.append(following[:p])
+                following = values + following
+            carried.reverse()
+
+        carried_scol = F.array(*[F.array(*[F.lit(value).cast(spark_type) for value in values])
+                                 for values in carried])[range_scol]
+        if periods > 0:
+            carried_scol = carried_scol[position - 1]
+        else:
+            carried_scol = carried_scol[p - position]
+        range_window = Window.partitionBy(range_scol).orderBy(index_scols)
+        return F.when(position <= p, carried_scol) \
+            .otherwise(F.lag(self._scol, periods).over(range_window))
@@ -18,11 +18,13 @@
 Infrastructure of options for Koalas.
 """
 import json
-from typing import Union, Any, Tuple, Callable, List
+from collections import OrderedDict
+from typing import Union, Any, Tuple, Callable, Dict, List
 
 from pyspark._globals import _NoValue, _NoValueType
+from pyspark.accumulators import Accumulator
 
-from databricks.koalas.utils import default_session
+from databricks.koalas.utils import default_session, CacheInfo, LRUCache, UDFMetrics
 
 
 __all__ = ['get_option', 'set_option', 'reset_option']
@@ -169,6 +171,149 @@ _options = [
             lambda v: v in ('sequence', 'distributed', 'distributed-sequence'),
             "Index type should be one of 'sequence', 'distributed', 'distributed-sequence'.")),
 
+    Option(
+        key='compute.index_cache_size',
+        doc=(
+            "'compute.index_cache_size' sets the maximum number of the per-partition "
+            "row counts cached for the 'distributed-sequence' default index, and of the "
+            "range boundaries sampled for 'compute.ordered_window_rows'. They are cached "
+            "per the logical plan of the Spark DataFrame so that wrapping the same Spark "
+            "DataFrame again does not recompute them. The least recently used entries are "
+            "evicted first. Set 0 to disable the cache. Default is 128."),
+        default=128,
+        types=int,
+        check_func=(
+            lambda v: v >= 0,
+            "'compute.index_cache_size' should be greater than or equal to 0.")),
+
+    Option(
+        key='compute.ordered_window_rows',
+        doc=(
+            "'compute.ordered_window_rows' sets the number of rows per range of the index "
+            "for cummin, cummax, cumsum, cumprod, shift, diff, ffill, bfill and is_monotonic, "
+            "and of the values for rank, which are computed in the order of the whole data "
+            "unless grouped. Larger data is split into ranges whose boundaries are sampled, "
+            "each range is computed in parallel, and the values carried over from the adjacent "
+            "ranges are combined in a second pass. Sampling the boundaries and collecting the "
+            "carried values run Spark jobs when these functions are called. Note that the "
+            "'sequence' default index still moves all data into a single partition to be "
+            "attached. Default is `None`, which always uses a single window over the whole "
+            "data."),
+        default=None,
+        types=(int, type(None)),
+        check_func=(
+            lambda v: v is None or v > 0,
+            "'compute.ordered_window_rows' should be greater than 0.")),
+
+    Option(
+        key='compute.broadcast_join_rows',
+        doc=(
+            "'compute.broadcast_join_rows' sets the maximum number of rows of a side of "
+            "DataFrame.merge and DataFrame.join that is broadcast when `broadcast='auto'`. The "
+            "side must also be estimated to fit Spark's 'spark.sql.autoBroadcastJoinThreshold' "
+            "in bytes. The sizes are taken from the statistics of the Spark plan or, if Spark "
+            "cannot estimate them, from the row counts cached by Koalas and the default sizes "
+            "of the column types. No Spark job is run to estimate them. Set 0 to only use the "
+            "size in bytes. Default is 100000."),
+        default=100000,
+        types=int,
+        check_func=(
+            lambda v: v >= 0,
+            "'compute.broadcast_join_rows' should be greater than or equal to 0.")),
+
+    Option(
+        key='compute.result_cache',
+        doc=(
+            "'compute.result_cache' sets whether the pandas DataFrames collected to the driver, "
+            "for instance, by repr(), head() or to_pandas(), are cached per the analyzed plan "
+            "of the Spark DataFrame so that collecting an unchanged DataFrame again does not "
+            "rerun the Spark job. Note that the cached result is returned even when the data "
+            "source changes afterwards, so enable it only for data which does not change. "
+            "Default is False."),
+        default=False,
+        types=bool),
+
+    Option(
+        key='compute.result_cache_bytes',
+        doc=(
+            "'compute.result_cache_bytes' sets the maximum total size in bytes of the pandas "
+            "DataFrames cached by 'compute.result_cache'. The least recently used results are "
+            "evicted first, and results larger than this are not cached. "
+            "Default is 100 MiB."),
+        default=100 * 1024 * 1024,
+        types=int,
+        check_func=(
+            lambda v: v >= 0,
+            "'compute.result_cache_bytes' should be greater than or equal to 0.")),
+
+    Option(
+        key='compute.to_pandas_batch_rows',
+        doc=(
+            "'compute.to_pandas_batch_rows' sets the number of rows converted at once when "
+            "to_pandas() copies the data into the pandas DataFrame allocated for all the rows. "
+            "This bounds the driver memory close to the size of the result, although it runs "
+            "one more Spark job to count the rows. The rows are fetched partition by "
+            "partition. Set `None` to collect all the data at once. Default is None."),
+        default=None,
+        types=(int, type(None)),
+        check_func=(
+            lambda v: v is None or (not isinstance(v, bool) and v > 0),
+            "'compute.to_pandas_batch_rows' should be an integer greater than 0.")),
+
+    Option(
+        key='compute.fused_transform',
+        doc=(
+            "'compute.fused_transform' sets whether DataFrame.transform without a return type "
+            "hint applies the function to all the columns of the same result type within one "
+            "pandas UDF call, which returns them together as an array, instead of one pandas "
+            "UDF per column. Default is True."),
+        default=True,
+        types=bool),
+
+    Option(
+        key='compute.groupby_probe_groups',
+        doc=(
+            "'compute.groupby_probe_groups' sets the number of groups sampled to infer the "
+            "return type of GroupBy.apply without a type hint. The groups are picked from the "
+            "first rows and all of their rows are collected, up to 'compute.shortcut_limit' "
+            "rows. If they fit, their results are reused instead of being recomputed. The cost "
+            "of the probe is reported as 'GroupBy.apply probe' when 'compute.udf_metrics' is "
+            "enabled. Set `None` to infer it from the first 'compute.shortcut_limit' rows. "
+            "Default is None."),
+        default=None,
+        types=(int, type(None)),
+        check_func=(
+            lambda v: v is None or v > 0,
+            "'compute.groupby_probe_groups' should be greater than 0.")),
+
+    Option(
+        key='compute.udf_max_rows_per_call',
+        doc=(
+            "'compute.udf_max_rows_per_call' sets the maximum number of rows passed to the "
+            "function in one call in the pandas UDFs of DataFrame.transform, Series.apply and "
+            "pandas_wraps. It caps the memory the function needs per call by splitting each "
+            "Arrow batch in the Python worker. It does not change the Arrow batches, which "
+            "Spark's 'spark.sql.execution.arrow.maxRecordsPerBatch' sizes for all the "
+            "operations of a job, so it only takes effect below that. It is read when the "
+            "operation is called. GroupBy.apply, GroupBy.filter and GroupBy.transform always "
+            "pass whole groups. Set `None` to pass each Arrow batch as is. Default is None."),
+        default=None,
+        types=(int, type(None)),
+        check_func=(
+            lambda v: v is None or v > 0,
+            "'compute.udf_max_rows_per_call' should be greater than 0.")),
+
+    Option(
+        key='compute.udf_metrics',
+        doc=(
+            "'compute.udf_metrics' sets whether the pandas UDFs built by Koalas record the "
+            "rows and batches processed, the time spent in the Python function and the bytes "
+            "of its input and output in pandas. The metrics are accumulated while the Spark "
+            "jobs run, and can be seen by `databricks.koalas.config.udf_metrics()`. "
+            "Default is False."),
+        default=False,
+        types=bool),
+
     Option(
         key='plotting.max_rows',
         doc=(
@@ -293,6 +438,86 @@ def reset_option(key: str) -> None:
     default_session().conf.unset(_key_format(key))
 
 
+# Caches used internally by Koalas, keyed by the option which bounds each of them.
+_caches = {
+    'compute.index_cache_size': LRUCache(),
+    'compute.result_cache_bytes': LRUCache(),
+}  # type: Dict[str, LRUCache]
+
+
+# The metrics of the pandas UDFs built while 'compute.udf_metrics' is enabled, accumulated
+# per the name of the operation.
+_udf_metrics = OrderedDict()  # type: Dict[str, Accumulator]
+
+
+def udf_metrics() -> List[UDFMetrics]:
+    """
+    Returns the metrics of the pandas UDFs built while 'compute.udf_metrics' is enabled,
+    per the name of the operation in the order they were first built.
+
+    The metrics are accumulated while the Spark jobs using the pandas UDFs run.
+
+    Returns
+    -------
+    result : a list of named tuples of name, rows, batches, python_time and bytes.
+    """
+    return [UDFMetrics(name, *accumulator.value) for name, accumulator in _udf_metrics.items()]
+
+
+def clear_udf_metrics() -> None:
+    """
+    Forgets the metrics of the pandas UDFs built so far.
+
+    Returns
+    -------
+    None
+    """
+    _udf_metrics.clear()
+
+
+def cache_info(key: str) -> CacheInfo:
+    """
+    Returns the statistics of the cache bounded by the specified option.
+
+    Parameters
+    ----------
+    key : str
+        The key of the option which bounds the cache, e.g.,
+        'compute.index_cache_size'.
+
+    Returns
+    -------
+    result : a named tuple of hits, misses, maxsize and currsize.
+    """
+    _check_cache(key)
+    return _caches[key].cache_info()
+
+
+def clear_cache(key: str) -> None:
+    """
+    Clears the cache bounded by the specified option and resets its statistics.
+
+    Parameters
+    ----------
+    key : str
+        The key of the option which bounds the cache, e.g.,
+        'compute.index_cache_size'.
+
+    Returns
+    -------
+    None
+    """
+    _check_cache(key)
+    _caches[key].clear()
+
+
+def _check_cache(key: str) -> None:
+    if key not in _caches:
+        raise OptionError(
+            "No such cache: '{}'. Available caches are [{}]".format(
+                key, ", ".join(list(_caches.keys()))))
+
+
 def _check_option(key: str) -> None:
     if key not in _options_dict:
         raise OptionError(
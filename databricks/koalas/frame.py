@@ -17,16 +17,17 @@
 """
 A wrapper class for Spark DataFrame to behave similar to pandas DataFrame.
 """
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from distutils.version import LooseVersion
 import re
 import warnings
 import inspect
 import json
+import logging
 from functools import partial, reduce
 import sys
 from itertools import zip_longest
-from typing import Any, Optional, List, Tuple, Union, Generic, TypeVar
+from typing import Any, Dict, Optional, List, Tuple, Union, Generic, TypeVar
 
 import numpy as np
 import pandas as pd
@@ -37,10 +38,12 @@ else:
     from pandas.core.dtypes.common import _get_dtype_from_object as infer_dtype_from_object
 from pandas.core.accessor import CachedAccessor
 from pandas.core.dtypes.inference import is_sequence
+from py4j.protocol import Py4JError
 from pyspark import sql as spark
 from pyspark.sql import functions as F, Column
-from pyspark.sql.types import (BooleanType, ByteType, DecimalType, DoubleType, FloatType,
-                               IntegerType, LongType, NumericType, ShortType, StructType)
+from pyspark.sql.types import (ArrayType, BooleanType, ByteType, DataType, DateType,
+                               DecimalType, DoubleType, FloatType, IntegerType, LongType,
+                               NumericType, ShortType, StringType, StructType, TimestampType)
 from pyspark.sql.utils import AnalysisException
 from pyspark.sql.window import Window
 from pyspark.sql.functions import pandas_udf, PandasUDFType
@@ -49,14 +52,18 @@ from databricks import koalas as ks  # For running doctests and reference resolu
 from databricks.koalas.config import get_option
 from databricks.koalas.utils import validate_arguments_and_invoke_function, align_diff_frames
 from databricks.koalas.generic import _Frame
-from databricks.koalas.internal import _InternalFrame, IndexMap
+from databricks.koalas.internal import _InternalFrame, _KeyIndex, IndexMap
 from databricks.koalas.missing.frame import _MissingPandasLikeDataFrame
 from databricks.koalas.ml import corr
-from databricks.koalas.utils import column_index_level, scol_for
+from databricks.koalas.utils import column_index_level, default_session, scol_for, \
+    wrap_pandas_udf_func
 from databricks.koalas.typedef import as_spark_type
 from databricks.koalas.plot import KoalasFramePlotMethods
 from databricks.koalas.config import get_option
 
+
+logger = logging.getLogger(__name__)
+
 # These regular expression patterns are complied and defined here to avoid to compile the same
 # pattern every time it is used in _repr_ and _repr_html_ in DataFrame.
 # Two patterns basically seek the footer string from Pandas'
@@ -410,7 +417,7 @@ class DataFrame(_Frame, Generic[T]):
                         col_sdf = sfun(col_sdf, col_type)
                     exprs.append(col_sdf.alias(str(idx) if len(idx) > 1 else idx[0]))
 
-            sdf = self._sdf.select(*exprs)
+            sdf = self._internal.index_agnostic_sdf.select(*exprs)
             pdf = sdf.toPandas()
 
             if self._internal.column_index_level > 1:
@@ -850,6 +857,120 @@ class DataFrame(_Frame, Generic[T]):
         internal = self._internal.copy(sdf=sdf, data_columns=[c.name for c in applied])
         return DataFrame(internal)
 
+    def aggregate(self, func: Union[List[str], Dict[str, Union[str, List[str]]]]):
+        """Aggregate using one or more operations over the specified axis.
+
+        All the requested aggregations are computed together in a single Spark job, so
+        ``df.agg(['mean', 'std', 'min', 'max', 'count'])`` scans the data once instead of
+        once per reduction.
+
+        Parameters
+        ----------
+        func : list or dict
+            a list of aggregate function names (string) applied to every column, or
+            a dict mapping from column name (string) to
+            aggregate functions (string or list of strings).
+
+        Returns
+        -------
+        Series or DataFrame
+
+            The return can be:
+
+            * Series : when DataFrame.agg is called with a dict of single functions. It is
+              a pandas Series as the results of the other reductions such as `sum` are.
+            * DataFrame : when DataFrame.agg is called with several functions
+
+            Return Series or DataFrame.
+
+        Notes
+        -----
+        `agg` is an alias for `aggregate`. Use the alias.
+
+        See Also
+        --------
+        databricks.koalas.GroupBy.aggregate : Aggregate per group.
+
+        Examples
+        --------
+        >>> df = ks.DataFrame([[1, 2, 3],
+        ...                    [4, 5, 6],
+        ...                    [7, 8, 9],
+        ...                    [np.nan, np.nan, np.nan]],
+        ...                   columns=['A', 'B', 'C'])
+
+        >>> df
+             A    B    C
+        0  1.0  2.0  3.0
+        1  4.0  5.0  6.0
+        2  7.0  8.0  9.0
+        3  NaN  NaN  NaN
+
+        Aggregate these functions over the rows.
+
+        >>> df.agg(['sum', 'min'])
+              A     B     C
+        sum  12.0  15.0  18.0
+        min   1.0   2.0   3.0
+
+        Different aggregations per column.
+
+        >>> df.agg({'A' : ['sum', 'min'], 'B' : ['min', 'max']})[['A', 'B']]
+                A    B
+        sum  12.0  NaN
+        min   1.0  2.0
+        max   NaN  8.0
+
+        A single aggregation per column returns a Series.
+
+        >>> df.agg({'A': 'sum', 'B': 'max'}).sort_index()
+        A    12.0
+        B     8.0
+        dtype: float64
+        """
+        from databricks.koalas.groupby import GroupBy
+
+        if isinstance(func, list):
+            if all(isinstance(f, str) for f in func):
+                func = OrderedDict([(column, func) for column in self._internal.data_columns])
+            else:
+                raise ValueError("If the given function is a list, it "
+                                 "should only contains function names as strings.")
+
+        if not isinstance(func, dict) or \
+                not all(isinstance(key, str) and
+                        (isinstance(value, str) or
+                         isinstance(value, list) and all(isinstance(v, str) for v in value))
+                        for key, value in func.items()):
+            raise ValueError("aggs must be a dict mapping from column name (string) to aggregate "
+                             "functions (string or list of strings).")
+
+        multi_aggs = any(isinstance(v, list) for v in func.values())
+        sdf = GroupBy._spark_groupby(self, func)
+        # The result is a single row; reshape it locally to have one row per aggregate function.
+        # Each value is taken from its own column so that it keeps the type of the column.
+        pdf = sdf.toPandas()
+        results = [pdf.iloc[:, i].iloc[0] for i in range(len(pdf.columns))]
+
+        if not multi_aggs:
+            # Like the other reductions, return the single row as a pandas Series without name.
+            # TODO: return Koalas series.
+            return pd.Series(results, index=list(func.keys()))
+
+        values = iter(results)
+        aggfuncs = []  # type: List[str]
+        data = OrderedDict()  # type: Dict[str, Dict[str, Any]]
+        for key, value in func.items():
+            aggs = [value] if isinstance(value, str) else value
+            data[key] = OrderedDict((aggfunc, next(values)) for aggfunc in aggs)
+            for aggfunc in aggs:
+                if aggfunc not in aggfuncs:
+                    aggfuncs.append(aggfunc)
+
+        return DataFrame(pd.DataFrame(data, index=aggfuncs, columns=list(data.keys())))
+
+    agg = aggregate
+
     def corr(self, method='pearson'):
         """
         Compute pairwise correlation of columns, excluding NA/null values.
@@ -1658,14 +1779,7 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             if len(pdf) <= limit:
                 return kdf
 
-            applied = []
-            for input_column, output_column in zip(
-                    self._internal.data_columns, kdf._internal.data_columns):
-                pandas_func = pandas_udf(
-                    func,
-                    returnType=return_schema[output_column].dataType,
-                    functionType=PandasUDFType.SCALAR)
-                applied.append(pandas_func(self[input_column]._scol).alias(output_column))
+            return self._transform_columns(func, return_schema, kdf._internal.data_columns)
         else:
             wrapped = ks.pandas_wraps(func)
             applied = []
@@ -1678,6 +1792,64 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
 
         return DataFrame(internal)
 
+    def _transform_columns(self, func, return_schema, output_columns):
+        """
+        Applies `func` to each column with pandas UDFs, given the schema of the results.
+
+        If 'compute.fused_transform' is enabled, the columns whose results have the same type
+        are transformed within one pandas UDF, which returns the results as an array that is
+        unpacked into the output columns afterwards. Otherwise, or when the type cannot be an
+        array element in Arrow, each column is transformed by its own pandas UDF.
+        """
+        fused = get_option("compute.fused_transform")
+        applied = [None] * len(output_columns)  # type: List[Optional[Column]]
+        fused_columns = OrderedDict()  # type: Dict[DataType, List[int]]
+        for i, output_column in enumerate(output_columns):
+            return_type = return_schema[output_column].dataType
+            if fused and (isinstance(return_type, (BooleanType, StringType)) or
+                          (isinstance(return_type, NumericType) and
+                           not isinstance(return_type, DecimalType))):
+                fused_columns.setdefault(return_type, []).append(i)
+            else:
+                applied[i] = self._transform_column(func, return_type, i, output_column)
+
+        def transform_all(*pssers):
+            return pd.Series(list(np.column_stack([func(pser) for pser in pssers])))
+
+        transform_all = wrap_pandas_udf_func("DataFrame.transform", transform_all)
+
+        fused_scols = []
+        for return_type, indices in fused_columns.items():
+            if len(indices) == 1:
+                i = indices[0]
+                applied[i] = self._transform_column(func, return_type, i, output_columns[i])
+            else:
+                # Nondeterministic so that Spark does not collapse the projections below and
+                # inline the pandas UDF into each of the unpacked output columns.
+                pandas_func = pandas_udf(transform_all,
+                                         returnType=ArrayType(return_type),
+                                         functionType=PandasUDFType.SCALAR).asNondeterministic()
+                fused_column = '__fused_transform_{}__'.format(len(fused_scols))
+                fused_scols.append(pandas_func(*[self._internal.data_scols[i] for i in indices])
+                                   .alias(fused_column))
+                for j, i in enumerate(indices):
+                    applied[i] = F.col(fused_column)[j].alias(output_columns[i])
+
+        sdf = self._sdf
+        if len(fused_scols) > 0:
+            # Evaluate each fused pandas UDF once in its own projection before unpacking.
+            sdf = sdf.select(self._internal.index_scols + self._internal.data_scols + fused_scols)
+        sdf = sdf.select(self._internal.index_scols + applied)
+        internal = self._internal.copy(sdf=sdf)
+
+        return DataFrame(internal)
+
+    def _transform_column(self, func, return_type, i, output_column):
+        pandas_func = pandas_udf(wrap_pandas_udf_func("DataFrame.transform", func),
+                                 returnType=return_type,
+                                 functionType=PandasUDFType.SCALAR)
+        return pandas_func(self._internal.data_scols[i]).alias(output_column)
+
     @property
     def index(self):
         """The index (row labels) Column of the DataFrame.
@@ -1710,7 +1882,8 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         >>> ks.DataFrame({}, index=list('abc')).empty
         True
         """
-        return len(self._internal.data_columns) == 0 or self._sdf.rdd.isEmpty()
+        return (len(self._internal.data_columns) == 0
+                or self._internal.index_agnostic_sdf.rdd.isEmpty())
 
     @property
     def style(self):
@@ -2143,9 +2316,11 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         Shift DataFrame by desired number of periods.
 
         .. note:: the current implementation of shift uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         Parameters
         ----------
@@ -2201,9 +2376,11 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         DataFrame (default is the element in the same column of the previous row).
 
         .. note:: the current implementation of diff uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         Parameters
         ----------
@@ -2316,8 +2493,8 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         """
         if axis != 0:
             raise ValueError("The 'nunique' method only works with axis=0 at the moment")
-        res = self._sdf.select([self[column]._nunique(dropna, approx, rsd)
-                                for column in self.columns])
+        res = self._internal.index_agnostic_sdf.select(
+            [self[column]._nunique(dropna, approx, rsd) for column in self.columns])
         return res.toPandas().T.iloc[:, 0]
 
     def round(self, decimals=0):
@@ -2565,6 +2742,51 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         """
         return _CachedDataFrame(self._internal)
 
+    def create_index(self, num_partitions: Optional[int] = None):
+        """
+        Yields and caches the current DataFrame with an index for looking up rows by labels.
+
+        The data is range-partitioned and sorted by the index, and cached. The range of the
+        index values of each partition is kept in the driver, so that ``at`` with a label reads
+        only the partition which contains it instead of scanning the whole data. ``loc`` with
+        labels filters the sorted cached data, where Spark skips the cached batches whose
+        ranges of the index values do not contain the labels.
+
+        The lookups fall back to scanning the data when the index is changed or after the
+        DataFrame is uncached. Only indices with level 1 of numeric or string values are
+        supported.
+
+        .. note:: Building the index sorts all the data once, and the rows of the yielded
+            DataFrame are ordered by the index.
+
+        Parameters
+        ----------
+        num_partitions : int, optional
+            The number of the partitions of the cached data. The same number as the current
+            DataFrame if not given.
+
+        Examples
+        --------
+        >>> df = ks.DataFrame({'dogs': [.2, .0, .6], 'cats': [.3, .6, .0]},
+        ...                   columns=['dogs', 'cats'], index=[30, 10, 20])
+        >>> with df.create_index() as indexed_df:
+        ...     print(indexed_df.at[20, 'dogs'])
+        ...
+        0.6
+
+        >>> df = df.create_index()
+        >>> df.at[10, 'cats']
+        0.6
+
+        To uncache the dataframe and drop the index, use `unpersist` function
+
+        >>> df.unpersist()
+        """
+        if num_partitions is not None and (not isinstance(num_partitions, int)
+                                           or num_partitions <= 0):
+            raise ValueError("num_partitions should be a positive integer")
+        return _IndexedDataFrame(self._internal, num_partitions)
+
     def to_table(self, name: str, format: Optional[str] = None, mode: str = 'error',
                  partition_cols: Union[str, List[str], None] = None,
                  **options):
@@ -2815,11 +3037,50 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         2   0.6   0.0
         3   0.2   0.1
         """
+        batch_rows = get_option("compute.to_pandas_batch_rows")
+        if batch_rows is not None:
+            return self._internal.bounded_pandas_df(batch_rows)
         return self._internal.pandas_df.copy()
 
     # Alias to maintain backward compatibility with Spark
     toPandas = to_pandas
 
+    def to_pandas_iter(self, batch_rows=10000):
+        """
+        Return an iterator of pandas DataFrames with at most `batch_rows` rows each.
+
+        The data is fetched partition by partition and converted batch by batch, so that
+        the driver does not have to hold the whole data at once.
+
+        .. note:: This runs a Spark job per partition.
+
+        Parameters
+        ----------
+        batch_rows : int, default 10000
+            The maximum number of rows in each pandas DataFrame.
+
+        Returns
+        -------
+        iterator of pandas DataFrame
+
+        Examples
+        --------
+        >>> df = ks.DataFrame([(.2, .3), (.0, .6), (.6, .0), (.2, .1)],
+        ...                   columns=['dogs', 'cats'])
+        >>> for pdf in df.to_pandas_iter(batch_rows=3):
+        ...     print(pdf)
+           dogs  cats
+        0   0.2   0.3
+        1   0.0   0.6
+        2   0.6   0.0
+           dogs  cats
+        3   0.2   0.1
+        """
+        if not isinstance(batch_rows, int) or batch_rows <= 0:
+            raise ValueError("batch_rows should be a positive integer; however, got %s."
+                             % batch_rows)
+        return self._internal.pandas_df_iter(batch_rows)
+
     def assign(self, **kwargs):
         """
         Assign new columns to a DataFrame.
@@ -3167,8 +3428,7 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
                 else:
                     raise TypeError('must specify how or thresh')
 
-            sdf = self._sdf.filter(pred)
-            internal = self._internal.copy(sdf=sdf)
+            internal = self._internal.with_filter(pred)
             if inplace:
                 self._internal = internal
             else:
@@ -3182,9 +3442,10 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         """Fill NA/NaN values.
 
         .. note:: the current implementation of 'method' parameter in fillna uses Spark's Window
-            without specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            without specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is filled per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine.
 
         Parameters
         ----------
@@ -3294,10 +3555,11 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         """
         Synonym for `DataFrame.fillna()` with ``method=`bfill```.
 
-        .. note:: the current implementation of 'bfiff' uses Spark's Window
-            without specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+        .. note:: the current implementation of 'bfill' uses Spark's Window
+            without specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is filled per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine.
 
         Parameters
         ----------
@@ -3349,10 +3611,11 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         """
         Synonym for `DataFrame.fillna()` with ``method=`ffill```.
 
-        .. note:: the current implementation of 'ffiff' uses Spark's Window
-            without specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+        .. note:: the current implementation of 'ffill' uses Spark's Window
+            without specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is filled per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine.
 
         Parameters
         ----------
@@ -3648,6 +3911,109 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
 
         return DataFrame(self._internal.copy(sdf=self._sdf.limit(n)))
 
+    def tail(self, n=5):
+        """
+        Return the last `n` rows.
+
+        This function returns last `n` rows from the object based on
+        position. It is useful for quickly verifying data, for example,
+        after sorting or appending rows.
+
+        For negative values of `n`, this function returns all rows except
+        the first `n` rows, equivalent to ``df[n:]``.
+
+        .. note:: The positions of the rows follow the order of the partitions and of the rows
+            within each partition, as ``head`` does. The partitions are scanned from the last
+            one until `n` rows are collected, so that only the trailing partitions are read.
+            The collected rows are brought to the driver, so `n` should be small.
+
+        Parameters
+        ----------
+        n : int, default 5
+            Number of rows to select.
+
+        Returns
+        -------
+        type of caller
+            The last `n` rows of the caller object.
+
+        See Also
+        --------
+        DataFrame.head : The first `n` rows of the caller object.
+
+        Examples
+        --------
+        >>> df = ks.DataFrame({'animal':['alligator', 'bee', 'falcon', 'lion',
+        ...                    'monkey', 'parrot', 'shark', 'whale', 'zebra']})
+        >>> df
+              animal
+        0  alligator
+        1        bee
+        2     falcon
+        3       lion
+        4     monkey
+        5     parrot
+        6      shark
+        7      whale
+        8      zebra
+
+        Viewing the last 5 lines
+
+        >>> df.tail()
+           animal
+        4  monkey
+        5  parrot
+        6   shark
+        7   whale
+        8   zebra
+
+        Viewing the last `n` lines (three in this case)
+
+        >>> df.tail(3)
+          animal
+        6  shark
+        7  whale
+        8  zebra
+
+        For negative values of `n`
+
+        >>> df.tail(-3)
+           animal
+        3    lion
+        4  monkey
+        5  parrot
+        6   shark
+        7   whale
+        8   zebra
+        """
+        if not isinstance(n, (int, np.integer)):
+            raise TypeError("n must be an integer")
+        n = int(n)
+        if n < 0:
+            return self.iloc[-n:]
+        sdf = self._sdf
+        if n == 0:
+            return DataFrame(self._internal.copy(sdf=sdf.limit(0)))
+
+        # Scan the partitions from the last one, collecting the last rows of each partition
+        # up to the number of the rows still needed. The number of the partitions scanned at
+        # once is scaled up by 4 times as Spark's `limit` does.
+        rdd = sdf.rdd
+        rows = []  # type: List
+        end = rdd.getNumPartitions()
+        num_partitions = 1
+        while end > 0 and len(rows) < n:
+            start = max(0, end - num_partitions)
+            needed = n - len(rows)
+            collected = rdd.context.runJob(
+                rdd, lambda iterator: deque(iterator, maxlen=needed), list(range(start, end)))
+            rows = collected[-needed:] + rows
+            end = start
+            num_partitions *= 4
+
+        sdf = default_session().createDataFrame(rows, schema=sdf.schema)
+        return DataFrame(self._internal.copy(sdf=sdf))
+
     def pivot_table(self, values=None, index=None, columns=None,
                     aggfunc='mean', fill_value=None):
         """
@@ -4580,7 +4946,7 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
                           inplace=inplace, na_position=na_position)
 
     # TODO:  add keep = First
-    def nlargest(self, n: int, columns: 'Any') -> 'DataFrame':
+    def nlargest(self, n: int, columns: 'Any', keep: str = 'first') -> 'DataFrame':
         """
         Return the first `n` rows ordered by `columns` in descending order.
 
@@ -4590,9 +4956,14 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
 
         This method is equivalent to
         ``df.sort_values(columns, ascending=False).head(n)``, but more
-        performant in Pandas.
-        In Koalas, thanks to Spark's lazy execution and query optimizer,
-        the two would have same performance.
+        performant.
+
+        .. note:: When `n` is not larger than 'compute.shortcut_limit', the rows are selected
+            by Spark's top-k operator, which keeps the `n` largest rows of each partition and
+            merges them, instead of sorting the whole data. Note that this runs a Spark job
+            when this method is called, unlike most of the other methods, and collects the
+            selected rows to the driver to create a new DataFrame. Otherwise, the whole data is
+            sorted lazily.
 
         Parameters
         ----------
@@ -4600,6 +4971,9 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             Number of rows to return.
         columns : label or list of labels
             Column label(s) to order by.
+        keep : {'first'}, default 'first'
+            When there are duplicate values, take the first occurrences. 'last' and 'all'
+            are not supported yet.
 
         Returns
         -------
@@ -4651,12 +5025,9 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         4  6.0  10
 
         """
-        kdf = self.sort_values(by=columns, ascending=False)  # type: Optional[DataFrame]
-        assert kdf is not None
-        return kdf.head(n=n)
+        return self._select_n(n, columns, ascending=False, keep=keep)
 
-    # TODO: add keep = First
-    def nsmallest(self, n: int, columns: 'Any') -> 'DataFrame':
+    def nsmallest(self, n: int, columns: 'Any', keep: str = 'first') -> 'DataFrame':
         """
         Return the first `n` rows ordered by `columns` in ascending order.
 
@@ -4665,8 +5036,14 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         well, but not used for ordering.
 
         This method is equivalent to ``df.sort_values(columns, ascending=True).head(n)``,
-        but more performant. In Koalas, thanks to Spark's lazy execution and query optimizer,
-        the two would have same performance.
+        but more performant.
+
+        .. note:: When `n` is not larger than 'compute.shortcut_limit', the rows are selected
+            by Spark's top-k operator, which keeps the `n` smallest rows of each partition and
+            merges them, instead of sorting the whole data. Note that this runs a Spark job
+            when this method is called, unlike most of the other methods, and collects the
+            selected rows to the driver to create a new DataFrame. Otherwise, the whole data is
+            sorted lazily.
 
         Parameters
         ----------
@@ -4674,6 +5051,9 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             Number of items to retrieve.
         columns : list or str
             Column name or names to order by.
+        keep : {'first'}, default 'first'
+            When there are duplicate values, take the first occurrences. 'last' and 'all'
+            are not supported yet.
 
         Returns
         -------
@@ -4717,10 +5097,49 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         0  1.0   6
         1  2.0   7
         2  3.0   8
+
+        The rows with the same values are taken in the order of their positions.
+
+        >>> df = ks.DataFrame({'X': [3, 1, 2, 1, 1]}, index=['a', 'b', 'c', 'd', 'e'])
+        >>> df.nsmallest(n=2, columns='X')
+           X
+        b  1
+        d  1
         """
-        kdf = self.sort_values(by=columns, ascending=True)  # type: Optional[DataFrame]
-        assert kdf is not None
-        return kdf.head(n=n)
+        return self._select_n(n, columns, ascending=True, keep=keep)
+
+    def _select_n(self, n: int, columns: 'Any', ascending: bool, keep: str) -> 'DataFrame':
+        """
+        Return the first `n` rows ordered by `columns`, with nulls last. The ties are broken by
+        the positions of the rows so that the first occurrences are taken as pandas does with
+        `keep='first'`.
+
+        Up to 'compute.shortcut_limit' rows, the selected rows are collected when this is
+        called, and the returned DataFrame is created from them.
+        """
+        if keep not in ('first', 'last', 'all'):
+            raise ValueError('keep must be either "first", "last" or "all"')
+        if keep != 'first':
+            raise NotImplementedError("keep currently works only for 'first'")
+        if isinstance(columns, str):
+            columns = [columns]
+        by = [self[column]._scol for column in columns]
+        if ascending:
+            by = [Column(scol._jc.asc_nulls_last()) for scol in by]
+        else:
+            by = [Column(scol._jc.desc_nulls_last()) for scol in by]
+
+        # `monotonically_increasing_id` increases with the positions of the rows.
+        sdf = self._sdf.select(self._internal.scols +
+                               [F.monotonically_increasing_id().alias('__position__')])
+        sdf = sdf.orderBy(*(by + [F.col('__position__')])).limit(n)
+        if n <= get_option("compute.shortcut_limit"):
+            # Spark plans the sort followed by the limit at the end of the collected query as
+            # the top-k operator, which shuffles only `n` rows per partition. This collects the
+            # rows eagerly.
+            sdf = default_session().createDataFrame(sdf.collect(), schema=sdf.schema)
+        sdf = sdf.select([scol_for(sdf, column) for column in self._internal.columns])
+        return DataFrame(self._internal.copy(sdf=sdf))
 
     def isin(self, values):
         """
@@ -4812,7 +5231,8 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
               left_on: Optional[Union[str, List[str]]] = None,
               right_on: Optional[Union[str, List[str]]] = None,
               left_index: bool = False, right_index: bool = False,
-              suffixes: Tuple[str, str] = ('_x', '_y')) -> 'DataFrame':
+              suffixes: Tuple[str, str] = ('_x', '_y'),
+              broadcast: Union[str, bool] = 'auto') -> 'DataFrame':
         """
         Merge DataFrame objects with a database-style join.
 
@@ -4854,6 +5274,15 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             left_index.
         suffixes: Suffix to apply to overlapping column names in the left and right side,
             respectively.
+        broadcast: Whether to broadcast one side to the other instead of shuffling both.
+            {'auto', True, False}, default 'auto'
+
+            auto: broadcast the smaller side if its size is estimated to fit in
+                'spark.sql.autoBroadcastJoinThreshold' and its number of rows, if known, in
+                'compute.broadcast_join_rows'.
+            True: broadcast the right side, or the left side for how='right'. For how='inner',
+                the smaller side by the estimates is broadcast.
+            False: do not add a broadcast hint. Spark can still broadcast a side by itself.
 
         Returns
         -------
@@ -4921,6 +5350,13 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         -----
         As described in #263, joining string columns currently returns None for missing values
             instead of NaN.
+
+        Spark can broadcast only the right side of a left join and the left side of a right
+        join, and neither side of an outer join. With broadcast='auto', the sizes are estimated
+        from the statistics of the Spark plan or, if Spark cannot estimate them, from the row
+        counts Koalas has already cached for the same data, for example, by `iloc` or `ffill`,
+        without running a Spark job. Which side is broadcast is logged at INFO level by the
+        'databricks.koalas.frame' logger.
         """
         _to_list = lambda o: o if o is None or is_list_like(o) else [o]
 
@@ -4965,10 +5401,19 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         if how not in ('inner', 'left', 'right', 'full'):
             raise ValueError("The 'how' parameter has to be amongst the following values: ",
                              "['inner', 'left', 'right', 'outer']")
+        if not (isinstance(broadcast, bool) or broadcast == 'auto'):
+            raise ValueError("broadcast must be either 'auto', True or False, got %s"
+                             % repr(broadcast))
 
         left_table = self._sdf.alias('left_table')
         right_table = right._sdf.alias('right_table')
 
+        broadcast_side = DataFrame._broadcast_side(self._sdf, right._sdf, how, broadcast)
+        if broadcast_side == 'left':
+            left_table = F.broadcast(left_table)
+        elif broadcast_side == 'right':
+            right_table = F.broadcast(right_table)
+
         left_key_columns = [scol_for(left_table, col) for col in left_keys]  # type: ignore
         right_key_columns = [scol_for(right_table, col) for col in right_keys]  # type: ignore
 
@@ -5065,8 +5510,61 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         else:
             return DataFrame(selected_columns)
 
+    @staticmethod
+    def _broadcast_side(left_sdf: spark.DataFrame, right_sdf: spark.DataFrame, how: str,
+                        broadcast: Union[str, bool]) -> Optional[str]:
+        """
+        Return the side to broadcast in the join of the given Spark DataFrames, 'left' or
+        'right', or None to add no broadcast hint.
+
+        :param how: the join type in Spark, 'inner', 'left', 'right' or 'full'.
+        :param broadcast: 'auto', True or False. See `DataFrame.merge`.
+        """
+        # Spark cannot broadcast the side whose unmatched rows are kept.
+        sides = {'inner': ['right', 'left'], 'left': ['right'], 'right': ['left'],
+                 'full': []}[how]
+        if broadcast is False:
+            logger.info("DataFrame.merge does not broadcast as requested.")
+            return None
+        if broadcast is True and len(sides) == 0:
+            raise ValueError("broadcast=True is not supported with how='outer'.")
+        if broadcast is True and len(sides) == 1:
+            logger.info("DataFrame.merge broadcasts the %s side as requested.", sides[0])
+            return sides[0]
+
+        estimates = {'left': _InternalFrame._estimated_size(left_sdf),
+                     'right': _InternalFrame._estimated_size(right_sdf)}
+        max_rows = get_option("compute.broadcast_join_rows")
+        try:
+            max_bytes = left_sdf.sql_ctx._jsparkSession.sessionState().conf() \
+                .autoBroadcastJoinThreshold()
+        except Py4JError:
+            max_bytes = -1
+
+        def fits(side):
+            # The size in bytes must be known and fit even if the number of rows does.
+            rows, size = estimates[side]
+            return (max_bytes >= 0 and size is not None and size <= max_bytes
+                    and (max_rows == 0 or rows is None or rows <= max_rows))
+
+        def smaller(side):
+            rows, size = estimates[side]
+            return (sys.maxsize if size is None else size, sys.maxsize if rows is None else rows)
+
+        candidates = sides if broadcast is True else [side for side in sides if fits(side)]
+        if len(candidates) == 0:
+            logger.info("DataFrame.merge does not broadcast; estimated (rows, bytes) are %s "
+                        "for the left side and %s for the right side.",
+                        estimates['left'], estimates['right'])
+            return None
+        side = min(candidates, key=smaller)
+        logger.info("DataFrame.merge broadcasts the %s side; estimated (rows, bytes) are %s.",
+                    side, estimates[side])
+        return side
+
     def join(self, right: 'DataFrame', on: Optional[Union[str, List[str]]] = None,
-             how: str = 'left', lsuffix: str = '', rsuffix: str = '') -> 'DataFrame':
+             how: str = 'left', lsuffix: str = '', rsuffix: str = '',
+             broadcast: Union[str, bool] = 'auto') -> 'DataFrame':
         """
         Join columns of another DataFrame.
 
@@ -5094,6 +5592,9 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             Suffix to use from left frame's overlapping columns.
         rsuffix : str, default ''
             Suffix to use from `right` frame's overlapping columns.
+        broadcast : {'auto', True, False}, default 'auto'
+            Whether to broadcast one side to the other instead of shuffling both. See
+            `DataFrame.merge`.
 
         Returns
         -------
@@ -5166,10 +5667,10 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         if on:
             self = self.set_index(on)
             join_kdf = self.merge(right, left_index=True, right_index=True, how=how,
-                                  suffixes=(lsuffix, rsuffix)).reset_index()
+                                  suffixes=(lsuffix, rsuffix), broadcast=broadcast).reset_index()
         else:
             join_kdf = self.merge(right, left_index=True, right_index=True, how=how,
-                                  suffixes=(lsuffix, rsuffix))
+                                  suffixes=(lsuffix, rsuffix), broadcast=broadcast)
         return join_kdf
 
     def append(self, other: 'DataFrame', ignore_index: bool = False,
@@ -5571,7 +6072,8 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         return DataFrame(internal)
 
     # TODO: include, and exclude should be implemented.
-    def describe(self, percentiles: Optional[List[float]] = None) -> 'DataFrame':
+    def describe(self, percentiles: Optional[List[float]] = None,
+                 accuracy: int = 10000) -> 'DataFrame':
         """
         Generate descriptive statistics that summarize the central tendency,
         dispersion and shape of a dataset's distribution, excluding
@@ -5586,6 +6088,9 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         ----------
         percentiles : list of ``float`` in range [0.0, 1.0], default [0.25, 0.5, 0.75]
             A list of percentiles to be computed.
+        accuracy : int, optional
+            Default accuracy of approximation of the percentiles. Larger value means better
+            accuracy. The relative error can be deduced by 1.0 / accuracy.
 
         Returns
         -------
@@ -5605,7 +6110,17 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         For numeric data, the result's index will include ``count``,
         ``mean``, ``std``, ``min``, ``25%``, ``50%``, ``75%``, ``max``.
 
-        Currently only numeric data is supported.
+        For object data (e.g. strings, booleans or timestamps), the result's index
+        will include ``count``, ``unique``, ``top``, and ``freq``. The ``top``
+        is the most common value. The ``freq`` is the most common value's
+        frequency. Timestamps also include the ``first`` and ``last`` items.
+        Since a column holds a single type in Spark, these statistics are
+        returned as strings.
+
+        If the DataFrame has numeric columns, only those are described.
+        Otherwise all the object columns are described.
+
+        The percentiles are approximated as in :meth:`Series.quantile`.
 
         Examples
         --------
@@ -5641,6 +6156,15 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         75%         3.0       6.0
         max         3.0       6.0
 
+        Describing a ``DataFrame`` without numeric columns.
+
+        >>> df[['object']].describe()
+               object
+        count       3
+        unique      3
+        top         c
+        freq        1
+
         Describing a ``DataFrame`` and selecting custom percentiles.
 
         >>> df = ks.DataFrame({'numeric1': [1, 2, 3],
@@ -5686,38 +6210,140 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         max      3.0
         Name: numeric1, dtype: float64
         """
-        exprs = []
-        data_columns = []
-        for col in self.columns:
-            kseries = self[col]
-            spark_type = kseries.spark_type
-            if isinstance(spark_type, DoubleType) or isinstance(spark_type, FloatType):
-                exprs.append(F.nanvl(kseries._scol, F.lit(None)).alias(kseries.name))
-                data_columns.append(kseries.name)
-            elif isinstance(spark_type, NumericType):
-                exprs.append(kseries._scol)
-                data_columns.append(kseries.name)
-
-        if len(exprs) == 0:
-            raise ValueError("Cannot describe a DataFrame without columns")
-
-        if percentiles is not None:
-            if any((p < 0.0) or (p > 1.0) for p in percentiles):
-                raise ValueError("Percentiles should all be in the interval [0, 1]")
-            # appending 50% if not in percentiles already
-            percentiles = (percentiles + [0.5]) if 0.5 not in percentiles else percentiles
+        if not isinstance(accuracy, int):
+            raise ValueError("accuracy must be an integer; however, got [%s]" % type(accuracy))
+
+        numeric_columns = []
+        object_columns = []
+        for col, idx in zip(self._internal.data_columns, self._internal.column_index):
+            spark_type = self._internal.spark_type_for(col)
+            if isinstance(spark_type, NumericType):
+                numeric_columns.append((col, idx, spark_type))
+            elif isinstance(spark_type, (StringType, BooleanType, TimestampType, DateType)):
+                object_columns.append((col, idx, spark_type))
+
+        if len(numeric_columns) > 0:
+            if percentiles is not None:
+                if any((p < 0.0) or (p > 1.0) for p in percentiles):
+                    raise ValueError("Percentiles should all be in the interval [0, 1]")
+                # appending 50% if not in percentiles already
+                percentiles = (percentiles + [0.5]) if 0.5 not in percentiles else percentiles
+            else:
+                percentiles = [0.25, 0.5, 0.75]
+            return self._describe_numeric(numeric_columns, sorted(percentiles), accuracy)
+        elif len(object_columns) > 0:
+            return self._describe_object(object_columns)
         else:
-            percentiles = [0.25, 0.5, 0.75]
-
-        formatted_perc = ["{:.0%}".format(p) for p in sorted(percentiles)]
-        stats = ["count", "mean", "stddev", "min", *formatted_perc, "max"]
-
-        sdf = self._sdf.select(*exprs).summary(stats)
+            raise ValueError("Cannot describe a DataFrame without columns")
 
-        internal = _InternalFrame(sdf=sdf.replace("stddev", "std", subset='summary'),
-                                  data_columns=data_columns,
+    def _describe_numeric(self, columns, percentiles, accuracy):
+        """
+        Describes the numeric columns with a single aggregation of typed expressions.
+        """
+        exprs = []
+        for i, (col, _, spark_type) in enumerate(columns):
+            scol = self._internal.scol_for(col)
+            if isinstance(spark_type, (FloatType, DoubleType)):
+                scol = F.nanvl(scol, F.lit(None))
+            exprs.append(scol.cast(DoubleType()).alias('__describe_{}__'.format(i)))
+        sdf = self._internal.index_agnostic_sdf.select(*exprs)
+
+        args = ", ".join(map(str, percentiles))
+        aggs = []
+        for i in range(len(columns)):
+            name = '__describe_{}__'.format(i)
+            scol = scol_for(sdf, name)
+            aggs.extend([F.count(scol).cast(DoubleType()).alias('{}count'.format(name)),
+                         F.mean(scol).alias('{}mean'.format(name)),
+                         F.stddev(scol).alias('{}std'.format(name)),
+                         F.min(scol).alias('{}min'.format(name)),
+                         F.expr("approx_percentile(`%s`, array(%s), %s)"
+                                % (name, args, accuracy)).alias('{}percentiles'.format(name)),
+                         F.max(scol).alias('{}max'.format(name))])
+        sdf = sdf.select(*aggs)
+
+        def stat_scol(i, stat):
+            return scol_for(sdf, '__describe_{}__{}'.format(i, stat))
+
+        stats = [("count", lambda i: stat_scol(i, "count")),
+                 ("mean", lambda i: stat_scol(i, "mean")),
+                 ("std", lambda i: stat_scol(i, "std")),
+                 ("min", lambda i: stat_scol(i, "min"))]
+        for j, p in enumerate(percentiles):
+            stats.append(("{:.0%}".format(p),
+                          partial(lambda j, i: stat_scol(i, "percentiles")[j], j)))
+        stats.append(("max", lambda i: stat_scol(i, "max")))
+        return self._describe_result(sdf, columns, stats)
+
+    def _describe_object(self, columns):
+        """
+        Describes the object columns. The counts and the first/last items are computed by one
+        aggregation, and the most common values by another one, which are joined together.
+        """
+        exprs = [self._internal.scol_for(col).alias('__describe_{}__'.format(i))
+                 for i, (col, _, _) in enumerate(columns)]
+        sdf = self._internal.index_agnostic_sdf.select(*exprs)
+
+        has_timestamp = any(isinstance(spark_type, (TimestampType, DateType))
+                            for _, _, spark_type in columns)
+        aggs = []
+        for i, (_, _, spark_type) in enumerate(columns):
+            name = '__describe_{}__'.format(i)
+            scol = scol_for(sdf, name)
+            aggs.extend([F.count(scol).alias('{}count'.format(name)),
+                         F.countDistinct(scol).alias('{}unique'.format(name))])
+            if has_timestamp:
+                is_timestamp = isinstance(spark_type, (TimestampType, DateType))
+                aggs.extend([(F.min(scol) if is_timestamp else F.lit(None))
+                             .alias('{}first'.format(name)),
+                             (F.max(scol) if is_timestamp else F.lit(None))
+                             .alias('{}last'.format(name))])
+        counts_sdf = sdf.select(*aggs)
+
+        # Count each value in all the columns at once, and pick the most common value
+        # of each column as `struct(count, value)`.
+        values = F.explode(F.array(*[
+            F.struct(F.lit(i).alias('index'),
+                     scol_for(sdf, '__describe_{}__'.format(i)).cast(StringType()).alias('value'))
+            for i in range(len(columns))])).alias('__describe__')
+        top_sdf = sdf.select(values).select('__describe__.*') \
+            .where(F.col('value').isNotNull()) \
+            .groupby('index', 'value').count() \
+            .groupby('index').agg(F.max(F.struct('count', 'value')).alias('top'))
+        top_sdf = top_sdf.select(*[
+            F.max(F.when(F.col('index') == i, F.col('top'))).alias('__describe_{}__top'.format(i))
+            for i in range(len(columns))])
+
+        sdf = counts_sdf.crossJoin(top_sdf)
+
+        def stat_scol(i, stat):
+            return scol_for(sdf, '__describe_{}__{}'.format(i, stat))
+
+        stats = [("count", lambda i: stat_scol(i, "count")),
+                 ("unique", lambda i: stat_scol(i, "unique")),
+                 ("top", lambda i: stat_scol(i, "top").getField('value')),
+                 ("freq", lambda i: stat_scol(i, "top").getField('count'))]
+        if has_timestamp:
+            stats.extend([("first", lambda i: stat_scol(i, "first")),
+                          ("last", lambda i: stat_scol(i, "last"))])
+        stats = [(stat, partial(lambda f, i: f(i).cast(StringType()), f)) for stat, f in stats]
+        return self._describe_result(sdf, columns, stats)
+
+    def _describe_result(self, sdf, columns, stats):
+        """
+        Transposes the single row of aggregated statistics in `sdf` into one row per statistic.
+        """
+        rows = [F.struct(F.lit(stat).alias('summary'),
+                         *[f(i).alias(col) for i, (col, _, _) in enumerate(columns)])
+                for stat, f in stats]
+        sdf = sdf.select(F.explode(F.array(*rows)).alias('__describe__')) \
+            .select('__describe__.*')
+        internal = _InternalFrame(sdf=sdf,
+                                  data_columns=[col for col, _, _ in columns],
+                                  column_index=[idx for _, idx, _ in columns],
+                                  column_index_names=self._internal.column_index_names,
                                   index_map=[('summary', None)])
-        return DataFrame(internal).astype('float64')
+        return DataFrame(internal)
 
     def _cum(self, func, skipna: bool):
         # This is used for cummin, cummax, cumxum, etc.
@@ -6328,9 +6954,10 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
         assigned a rank that is the average of the ranks of those values.
 
         .. note:: the current implementation of rank uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the values in
+            parallel, otherwise all data is moved into single partition in single
+            machine.
 
         Parameters
         ----------
@@ -6588,7 +7215,7 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
             # TODO Should not implement alignment, too dangerous?
             # It is assumed to be only a filter, otherwise .loc should be used.
             bcol = key._scol.cast("boolean")
-            return DataFrame(self._internal.copy(sdf=self._sdf.filter(bcol)))
+            return DataFrame(self._internal.with_filter(bcol))
         raise NotImplementedError(key)
 
     def _to_internal_pandas(self):
@@ -6709,7 +7336,7 @@ defaultdict(<class 'list'>, {'col..., 'col...})]
                 "'%s' object has no attribute '%s'" % (self.__class__.__name__, key))
 
     def __len__(self):
-        return self._sdf.count()
+        return self._internal.index_agnostic_sdf.count()
 
     def __dir__(self):
         fields = [f for f in self._sdf.schema.fieldNames() if ' ' not in f]
@@ -6755,7 +7382,7 @@ class _CachedDataFrame(DataFrame):
     it caches the corresponding Spark DataFrame.
     """
     def __init__(self, internal):
-        self._cached = internal._sdf.cache()
+        self._cached = internal.sdf.cache()
         super(_CachedDataFrame, self).__init__(internal)
 
     def __enter__(self):
@@ -6781,3 +7408,21 @@ class _CachedDataFrame(DataFrame):
         """
         if self._cached.is_cached:
             self._cached.unpersist()
+
+
+class _IndexedDataFrame(_CachedDataFrame):
+    """
+    Cached Koalas DataFrame which is range-partitioned and sorted by the index, with the lookup
+    structure of the partitions by the index values used by `at` and `loc`.
+    """
+    def __init__(self, internal, num_partitions=None):
+        if len(internal.index_columns) != 1:
+            raise ValueError("'create_index' only supports indices with level 1 right now")
+        index_column = internal.index_columns[0]
+        sdf = internal.sdf
+        if num_partitions is None:
+            num_partitions = sdf.rdd.getNumPartitions()
+        sdf = sdf.repartitionByRange(num_partitions, scol_for(sdf, index_column))
+        sdf = sdf.sortWithinPartitions(scol_for(sdf, index_column))
+        super(_IndexedDataFrame, self).__init__(internal.copy(sdf=sdf))
+        self._internal = self._internal.copy(key_index=_KeyIndex(self._cached, index_column))
@@ -52,9 +52,11 @@ class _Frame(object):
         Returns a DataFrame or Series of the same size containing the cumulative minimum.
 
         .. note:: the current implementation of cummin uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         Parameters
         ----------
@@ -112,9 +114,11 @@ class _Frame(object):
         Returns a DataFrame or Series of the same size containing the cumulative maximum.
 
         .. note:: the current implementation of cummax uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         Parameters
         ----------
@@ -173,9 +177,11 @@ class _Frame(object):
         Returns a DataFrame or Series of the same size containing the cumulative sum.
 
         .. note:: the current implementation of cumsum uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         Parameters
         ----------
@@ -236,9 +242,11 @@ class _Frame(object):
         Returns a DataFrame or Series of the same size containing the cumulative product.
 
         .. note:: the current implementation of cumprod uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         .. note:: unliike pandas', Koalas' emulates cumulative product by ``exp(sum(log(...)))``
             trick. Therefore, it only works for positive numbers.
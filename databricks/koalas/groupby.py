@@ -19,13 +19,15 @@ A wrapper for GroupedData to behave similar to pandas GroupBy.
 """
 
 import inspect
+import itertools
+import logging
+import time
 from collections import Callable
-from functools import partial
-from typing import Any, List
+from functools import partial, reduce
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
-from pandas._libs.parsers import is_datetime64_dtype
-from pandas.core.dtypes.common import is_datetime64tz_dtype
+import pandas as pd
 
 from pyspark.sql import Window, functions as F
 from pyspark.sql.types import FloatType, DoubleType, NumericType, StructField, StructType
@@ -34,11 +36,16 @@ from pyspark.sql.functions import PandasUDFType, pandas_udf, Column
 from databricks import koalas as ks  # For running doctests and reference resolution in PyCharm.
 from databricks.koalas.typedef import _infer_return_type
 from databricks.koalas.frame import DataFrame
-from databricks.koalas.internal import _InternalFrame
+from databricks.koalas.internal import _InternalFrame, _pandas_to_rows, _rows_to_pandas
 from databricks.koalas.missing.groupby import _MissingPandasLikeDataFrameGroupBy, \
     _MissingPandasLikeSeriesGroupBy
 from databricks.koalas.series import Series, _col
 from databricks.koalas.config import get_option
+from databricks.koalas.utils import default_session, scol_for, udf_metrics_accumulator, \
+    wrap_pandas_udf_func, _memory_usage
+
+
+logger = logging.getLogger(__name__)
 
 
 class GroupBy(object):
@@ -59,6 +66,15 @@ class GroupBy(object):
         func : dict
              a dict mapping from column name (string) to
              aggregate functions (string or list of strings).
+             Besides the Spark SQL aggregate functions, 'approx_nunique' and
+             'approx_quantile' are supported, see `GroupBy.approx_nunique` and
+             `GroupBy.approx_quantile`.
+        rsd : float, default 0.05
+            Maximum estimation error allowed in the HyperLogLog algorithm of 'approx_nunique'.
+        q : float, default 0.5
+            Quantile to compute by 'approx_quantile'.
+        accuracy : int, default 10000
+            Accuracy of the approximation of 'approx_quantile'.
 
         Returns
         -------
@@ -111,6 +127,16 @@ class GroupBy(object):
         1    1    2
         2    3    4
 
+        Approximate distinct counts and quantiles are cheaper than exact ones on big data.
+
+        >>> aggregated = df.groupby('A').agg({'B': 'approx_nunique', 'C': 'approx_quantile'},
+        ...                                  rsd=0.01, q=0.0)
+        >>> aggregated[['B', 'C']]  # doctest: +NORMALIZE_WHITESPACE
+           B      C
+        A
+        1  2  0.227
+        2  2 -0.562
+
         """
         if not isinstance(func_or_funcs, dict) or \
                 not all(isinstance(key, str) and
@@ -120,26 +146,15 @@ class GroupBy(object):
             raise ValueError("aggs must be a dict mapping from column name (string) to aggregate "
                              "functions (string or list of strings).")
 
-        sdf = self._kdf._sdf
         groupkeys = self._groupkeys
-        groupkey_cols = [s._scol.alias('__index_level_{}__'.format(i))
-                         for i, s in enumerate(groupkeys)]
+        sdf = GroupBy._spark_groupby(self._kdf, func_or_funcs, groupkeys,
+                                     rsd=kwargs.get('rsd', 0.05), q=kwargs.get('q', 0.5),
+                                     accuracy=kwargs.get('accuracy', 10000))
         multi_aggs = any(isinstance(v, list) for v in func_or_funcs.values())
-        reordered = []
-        data_columns = []
-        column_index = []
-        for key, value in func_or_funcs.items():
-            for aggfunc in [value] if isinstance(value, str) else value:
-                data_col = "('{0}', '{1}')".format(key, aggfunc) if multi_aggs else key
-                data_columns.append(data_col)
-                column_index.append((key, aggfunc))
-                if aggfunc == "nunique":
-                    reordered.append(F.expr('count(DISTINCT `{0}`) as `{1}`'.format(key, data_col)))
-                else:
-                    reordered.append(F.expr('{1}(`{0}`) as `{2}`'.format(key, aggfunc, data_col)))
-        sdf = sdf.groupby(*groupkey_cols).agg(*reordered)
+        column_index = [(key, aggfunc) for key, value in func_or_funcs.items()
+                        for aggfunc in ([value] if isinstance(value, str) else value)]
         internal = _InternalFrame(sdf=sdf,
-                                  data_columns=data_columns,
+                                  data_columns=sdf.columns[len(groupkeys):],
                                   column_index=column_index if multi_aggs else None,
                                   index_map=[('__index_level_{}__'.format(i), s.name)
                                              for i, s in enumerate(groupkeys)])
@@ -150,6 +165,35 @@ class GroupBy(object):
 
     agg = aggregate
 
+    @staticmethod
+    def _spark_groupby(kdf, func, groupkeys=(), rsd=0.05, q=0.5, accuracy=10000):
+        """
+        Runs all the aggregate functions in `func` as a single Spark aggregation over `kdf`,
+        grouped by `groupkeys` if given.
+
+        The group keys become the columns '__index_level_{i}__', followed by one column per
+        pair of column name and aggregate function in the order of `func`. `rsd` is used by
+        'approx_nunique', and `q` and `accuracy` by 'approx_quantile'.
+        """
+        groupkey_cols = [s._scol.alias('__index_level_{}__'.format(i))
+                         for i, s in enumerate(groupkeys)]
+        multi_aggs = any(isinstance(v, list) for v in func.values())
+        reordered = []
+        for key, value in func.items():
+            for aggfunc in [value] if isinstance(value, str) else value:
+                data_col = "('{0}', '{1}')".format(key, aggfunc) if multi_aggs else key
+                if aggfunc == "nunique":
+                    reordered.append(F.expr('count(DISTINCT `{0}`) as `{1}`'.format(key, data_col)))
+                elif aggfunc == "approx_nunique":
+                    reordered.append(F.expr('approx_count_distinct(`{0}`, {1}) as `{2}`'
+                                            .format(key, rsd, data_col)))
+                elif aggfunc == "approx_quantile":
+                    reordered.append(F.expr('approx_percentile(`{0}`, {1}, {2}) as `{3}`'
+                                            .format(key, q, accuracy, data_col)))
+                else:
+                    reordered.append(F.expr('{1}(`{0}`) as `{2}`'.format(key, aggfunc, data_col)))
+        return kdf._internal.index_agnostic_sdf.groupby(*groupkey_cols).agg(*reordered)
+
     def count(self):
         """
         Compute count of group, excluding missing values.
@@ -412,7 +456,7 @@ class GroupBy(object):
         groupkeys = self._groupkeys
         groupkey_cols = [s._scol.alias('__index_level_{}__'.format(i))
                          for i, s in enumerate(groupkeys)]
-        sdf = self._kdf._sdf
+        sdf = self._kdf._internal.index_agnostic_sdf
         sdf = sdf.groupby(*groupkey_cols).count()
         if (len(self._agg_columns) > 0) and (self._have_agg_columns):
             name = self._agg_columns[0].name
@@ -712,6 +756,9 @@ class GroupBy(object):
              `c0, c1, c2 ... cn`. These names are positionally mapped to the returned
              DataFrame in ``func``. See examples below.
 
+             Alternatively, set 'compute.groupby_probe_groups' to infer the type from a few
+             complete groups, whose results are reused.
+
         .. note:: the dataframe within ``func`` is actually a pandas dataframe. Therefore,
             any pandas APIs within this function is allowed.
 
@@ -801,19 +848,35 @@ class GroupBy(object):
         should_infer_schema = return_schema is None
         input_groupnames = [s.name for s in self._groupkeys]
 
+        probed_pred = None
         if should_infer_schema:
             # Here we execute with the first 1000 to get the return type.
             # If the records were less than 1000, it uses pandas API directly for a shortcut.
             limit = get_option("compute.shortcut_limit")
             pdf = self._kdf.head(limit + 1)._to_internal_pandas()
-            pdf = pdf.groupby(input_groupnames).apply(func)
-            kdf = DataFrame(pdf)
-            return_schema = kdf._sdf.schema
             if len(pdf) <= limit:
-                return kdf
+                return DataFrame(pdf.groupby(input_groupnames).apply(func))
+
+            probe_groups = get_option("compute.groupby_probe_groups")
+            if probe_groups is not None:
+                pdf, probed_pred = self._probe_groups(pdf, probe_groups, limit)
+
+            accumulator = udf_metrics_accumulator("GroupBy.apply probe")
+            start = time.time()
+            applied = pdf.groupby(input_groupnames).apply(func)
+            if accumulator is not None:
+                accumulator.add((len(pdf), pdf.groupby(input_groupnames).ngroups,
+                                 time.time() - start, _memory_usage(pdf) + _memory_usage(applied)))
+            kdf = DataFrame(applied)
+            return_schema = kdf._sdf.schema
 
         sdf = self._spark_group_map_apply(
-            func, return_schema, retain_index=should_infer_schema)
+            func, return_schema, retain_index=should_infer_schema,
+            pred=None if probed_pred is None else ~probed_pred)
+
+        if probed_pred is not None:
+            # The probed groups are complete, so reuse their results instead of recomputing.
+            sdf = sdf.union(kdf._sdf)
 
         if should_infer_schema:
             # If schema is inferred, we can restore indexes too.
@@ -845,6 +908,11 @@ class GroupBy(object):
         Each subframe is endowed the attribute 'name' in case you need to know
         which group you are working on.
 
+        If ``func`` only compares aggregates of the columns, such as ``sum``, ``mean``,
+        ``min``, ``max``, ``count``, ``std``, ``var`` and ``nunique``, the predicate is
+        computed with Spark window aggregates without pandas UDFs. Which way is taken is
+        logged at INFO level by the 'databricks.koalas.groupby' logger.
+
         Examples
         --------
         >>> df = ks.DataFrame({'A' : ['foo', 'bar', 'foo', 'bar',
@@ -861,6 +929,10 @@ class GroupBy(object):
         if not isinstance(func, Callable):
             raise TypeError("%s object is not callable" % type(func))
 
+        filtered = self._native_filter(func)
+        if filtered is not None:
+            return filtered
+
         data_schema = self._kdf._sdf.schema
         groupby_names = [s.name for s in self._groupkeys]
 
@@ -868,32 +940,111 @@ class GroupBy(object):
             return pdf.groupby(groupby_names).filter(func)
 
         sdf = self._spark_group_map_apply(
-            pandas_filter, data_schema, retain_index=True)
+            pandas_filter, data_schema, retain_index=True, name="GroupBy.filter")
+        # The rows of each group stay together, which later groupby on the same keys can use.
+        return DataFrame(self._kdf._internal.copy(sdf=sdf,
+                                                  partitioned_by=self._groupkey_columns()))
+
+    def _probe_groups(self, pdf, num_groups, limit):
+        """
+        Samples complete groups to infer the return type of `apply`.
+
+        The first `num_groups` group keys in `pdf`, which is the head of the DataFrame, are
+        picked up, and all the rows of these groups are collected up to `limit` rows. Returns
+        the rows, and the predicate for the rows of the sampled groups if all of their rows
+        fit in `limit` rows. Otherwise, returns `pdf` with None since the results of
+        incomplete groups cannot be reused.
+        """
+        input_groupnames = [s.name for s in self._groupkeys]
+        keys = pdf[input_groupnames].dropna().drop_duplicates().head(num_groups)
+
+        def to_python(value):
+            if isinstance(value, pd.Timestamp):
+                return value.to_pydatetime()
+            elif isinstance(value, np.generic):
+                return value.item()
+            else:
+                return value
+
+        preds = []
+        for key in keys.itertuples(index=False):
+            preds.append(reduce(lambda x, y: x & y,
+                                [s._scol == to_python(value)
+                                 for s, value in zip(self._groupkeys, key)]))
+        pred = F.coalesce(reduce(lambda x, y: x | y, preds), F.lit(False))
+
+        probed = DataFrame(self._kdf._internal.with_filter(pred))
+        probed_pdf = probed.head(limit + 1)._to_internal_pandas()
+        if len(probed_pdf) <= limit:
+            return probed_pdf, pred
+        else:
+            return pdf, None
+
+    def _native_filter(self, func):
+        """
+        Runs `filter` with Spark window aggregates if the predicate can be traced.
+
+        `func` is called once with a `_GroupTrace` standing for every group. If it returns
+        a predicate built from aggregates of the columns, the predicate is computed over
+        the window of each group. Otherwise, returns None so that the pandas UDF is used.
+        """
+        window = Window.partitionBy(*[s._scol for s in self._groupkeys])
+        try:
+            pred = func(_GroupTrace(self._kdf, window))
+            if not isinstance(pred, _AggregateTrace):
+                raise TypeError("the predicate is {}, not an aggregate.".format(type(pred)))
+        except Exception as e:
+            logger.info("GroupBy.filter runs with a pandas UDF since the predicate cannot be "
+                        "traced: %s", e)
+            return None
+
+        logger.info("GroupBy.filter runs with Spark window aggregates.")
+        # The groups of missing keys are dropped as pandas does.
+        cond = pred._scol
+        for s in self._groupkeys:
+            cond = cond & s._scol.isNotNull()
+            if isinstance(s.spark_type, (FloatType, DoubleType)):
+                cond = cond & ~F.isnan(s._scol)
+        sdf = self._kdf._sdf
+        sdf = sdf.select('*', cond.alias('__filter__')).filter('__filter__') \
+            .drop('__filter__')
         return DataFrame(self._kdf._internal.copy(sdf=sdf))
 
-    def _spark_group_map_apply(self, func, return_schema, retain_index):
+    def _spark_group_map_apply(self, func, return_schema, retain_index, name="GroupBy.apply",
+                               pred=None):
         index_columns = self._kdf._internal.index_columns
         index_names = self._kdf._internal.index_names
         data_columns = self._kdf._internal.data_columns
 
-        def rename_output(pdf):
-            # TODO: This logic below was borrowed from `DataFrame.pandas_df` to set the index
-            #   within each pdf properly. we might have to deduplicate it.
-            import pandas as pd
+        # The column names to restore the index of the results, cached per the structure of
+        # the index and the columns so that they are not recomputed for each group.
+        output_columns_cache = {}  # type: Dict[Tuple, List[str]]
 
-            if len(index_columns) > 0:
-                append = False
-                for index_field in index_columns:
-                    drop = index_field not in data_columns
-                    pdf = pdf.set_index(index_field, drop=drop, append=append)
-                    append = True
-                pdf = pdf[data_columns]
+        def output_columns(index, columns):
+            key = (tuple(index.names), tuple(columns))
+            if key not in output_columns_cache:
+                # TODO: deduplicate this logic with _InternalFrame.from_pandas
+                if isinstance(index, pd.MultiIndex):
+                    new_index_columns = [
+                        '__index_level_{}__'.format(i) if name is None else name
+                        for i, name in enumerate(index.names)]
+                else:
+                    new_index_columns = [
+                        index.name if index.name is not None else '__index_level_0__']
+                output_columns_cache[key] = \
+                    new_index_columns + [str(col) for col in columns]
+            return output_columns_cache[key]
 
-            if len(index_names) > 0:
-                if isinstance(pdf.index, pd.MultiIndex):
-                    pdf.index.names = index_names
+        def rename_output(pdf):
+            if len(index_columns) > 0:
+                # Restore the index at once instead of setting each level one by one.
+                if len(index_columns) == 1:
+                    index = pd.Index(pdf[index_columns[0]], name=index_names[0])
                 else:
-                    pdf.index.name = index_names[0]
+                    index = pd.MultiIndex.from_arrays(
+                        [pdf[index_column] for index_column in index_columns], names=index_names)
+                pdf = pdf[data_columns]
+                pdf.index = index
 
             pdf = func(pdf)
 
@@ -903,50 +1054,82 @@ class GroupBy(object):
                 # When Spark output type is specified, without executing it, we don't know
                 # if we should restore the index or not. For instance, see the example in
                 # https://github.com/databricks/koalas/issues/628.
+                columns = output_columns(pdf.index, pdf.columns)
+                pdf = pdf.reset_index()
+                pdf.columns = columns
 
-                # TODO: deduplicate this logic with _InternalFrame.from_pandas
-                columns = pdf.columns
-
-                index = pdf.index
-
-                index_map = []
-                if isinstance(index, pd.MultiIndex):
-                    if index.names is None:
-                        index_map = [('__index_level_{}__'.format(i), None)
-                                     for i in range(len(index.levels))]
-                    else:
-                        index_map = [
-                            ('__index_level_{}__'.format(i) if name is None else name, name)
-                            for i, name in enumerate(index.names)]
-                else:
-                    index_map = [(index.name
-                                  if index.name is not None else '__index_level_0__', index.name)]
-
-                new_index_columns = [index_column for index_column, _ in index_map]
-                new_data_columns = [str(col) for col in columns]
-
-                reset_index = pdf.reset_index()
-                reset_index.columns = new_index_columns + new_data_columns
-                for name, col in reset_index.iteritems():
-                    dt = col.dtype
-                    if is_datetime64_dtype(dt) or is_datetime64tz_dtype(dt):
-                        continue
-                    reset_index[name] = col.replace({np.nan: None})
-                pdf = reset_index
-
-            # Just positionally map the column names to given schema's.
-            pdf = pdf.rename(columns=dict(zip(pdf.columns, return_schema.fieldNames())))
+            # Just positionally map the column names to given schema's. The missing values
+            # are converted to nulls by Arrow without changing the dtypes here.
+            pdf.columns = return_schema.fieldNames()
 
             return pdf
 
-        grouped_map_func = pandas_udf(return_schema, PandasUDFType.GROUPED_MAP)(rename_output)
+        wrapped_func = wrap_pandas_udf_func(name, rename_output, grouped=True)
 
         sdf = self._kdf._sdf
+        if pred is not None:
+            sdf = sdf.filter(pred)
+
+        groupkey_columns = self._groupkey_columns()
+        partitioned_by = self._kdf._internal.partitioned_by
+        if (groupkey_columns is not None and partitioned_by is not None
+                and set(partitioned_by).issubset(groupkey_columns)):
+            logger.info("%s runs within each partition since the rows are already partitioned "
+                        "by %s.", name, partitioned_by)
+            return GroupBy._spark_partition_local_apply(
+                sdf, groupkey_columns, wrapped_func, return_schema)
+
+        grouped_map_func = pandas_udf(return_schema, PandasUDFType.GROUPED_MAP)(wrapped_func)
         input_groupkeys = [s._scol for s in self._groupkeys]
         sdf = sdf.groupby(*input_groupkeys).apply(grouped_map_func)
 
         return sdf
 
+    @staticmethod
+    def _spark_partition_local_apply(sdf, groupkey_columns, func, return_schema):
+        """
+        Applies `func` to each group of `sdf` grouped by `groupkey_columns` within each
+        partition, without shuffling. This is only correct when all the rows of each group are
+        in the same partition.
+
+        As grouped map pandas UDFs, `func` takes the pandas DataFrame of all the columns of a
+        group, and the missing group keys make one group. The rows are sorted by the keys
+        within each partition, and the groups are converted one by one as they are streamed,
+        so only one group is held in a Python worker at a time.
+        """
+        input_schema = sdf.schema
+        key_indices = [input_schema.names.index(column) for column in groupkey_columns]
+
+        def group_key(row):
+            # NaN is not equal to itself, but Spark puts the NaN keys in one group.
+            return tuple((True, None) if isinstance(row[i], float) and np.isnan(row[i])
+                         else (False, row[i]) for i in key_indices)
+
+        def apply_partition(rows):
+            for _, group in itertools.groupby(rows, key=group_key):
+                pdf = func(_rows_to_pandas(list(group), input_schema))
+                for row in _pandas_to_rows(pdf, return_schema):
+                    yield row
+
+        sdf = sdf.sortWithinPartitions(*[scol_for(sdf, column) for column in groupkey_columns])
+        return default_session().createDataFrame(sdf.rdd.mapPartitions(apply_partition),
+                                                 return_schema)
+
+    def _groupkey_columns(self):
+        """
+        Returns the Spark field names of the group keys if all of them are the columns of the
+        grouped DataFrame as they are, otherwise None.
+        """
+        internal = self._kdf._internal
+        columns = []
+        for s in self._groupkeys:
+            column = s._internal.data_columns[0]
+            if column not in internal.columns or \
+                    not s._scol._jc.expr().semanticEquals(internal.scol_for(column)._jc.expr()):
+                return None
+            columns.append(column)
+        return columns
+
     def rank(self, method='average', ascending=True):
         """
         Provide the rank of values within each group.
@@ -1139,8 +1322,7 @@ class GroupBy(object):
         kdf = DataFrame(internal)
         return kdf
 
-    # TODO: add keep parameter
-    def nsmallest(self, n=5):
+    def nsmallest(self, n=5, keep='first'):
         """
         Return the first n rows ordered by columns in ascending order in group.
 
@@ -1151,6 +1333,9 @@ class GroupBy(object):
         ----------
         n : int
             Number of items to retrieve.
+        keep : {'first'}, default 'first'
+            When there are duplicate values, take the first occurrences. 'last' and 'all'
+            are not supported yet.
 
         See Also
         --------
@@ -1170,23 +1355,9 @@ class GroupBy(object):
         3  6    3
         Name: b, dtype: int64
         """
-        if len(self._kdf._internal.index_names) > 1:
-            raise ValueError('idxmax do not support multi-index now')
-        groupkeys = self._groupkeys
-        sdf = self._kdf._sdf
-        name = self._agg_columns[0].name
-        index = self._kdf._internal.index_columns[0]
-        window = Window.partitionBy([s._scol for s in groupkeys]).orderBy(F.col(name))
-        sdf = sdf.withColumn('rank', F.row_number().over(window)).filter(F.col('rank') <= n)
-        internal = _InternalFrame(sdf=sdf,
-                                  data_columns=[name],
-                                  index_map=[(s.name, s.name) for s in self._groupkeys] +
-                                            [(index, None)])
-        kdf = _col(DataFrame(internal))
-        return kdf
+        return self._select_n(n, ascending=True, keep=keep)
 
-    # TODO: add keep parameter
-    def nlargest(self, n=5):
+    def nlargest(self, n=5, keep='first'):
         """
         Return the first n rows ordered by columns in descending order in group.
 
@@ -1197,6 +1368,9 @@ class GroupBy(object):
         ----------
         n : int
             Number of items to retrieve.
+        keep : {'first'}, default 'first'
+            When there are duplicate values, take the first occurrences. 'last' and 'all'
+            are not supported yet.
 
         See Also
         --------
@@ -1216,20 +1390,50 @@ class GroupBy(object):
         3  7    4
         Name: b, dtype: int64
         """
+        return self._select_n(n, ascending=False, keep=keep)
+
+    def _select_n(self, n, ascending, keep):
+        """
+        Returns the first `n` values of each group ordered by the values, skipping nulls. The
+        ties are broken by the positions of the rows so that the first occurrences are taken
+        as pandas does with `keep='first'`. The rows are numbered within each group by a
+        window, which only needs the rows of each group to be sorted.
+        """
+        if keep not in ('first', 'last', 'all'):
+            raise ValueError('keep must be either "first", "last" or "all"')
+        if keep != 'first':
+            raise NotImplementedError("keep currently works only for 'first'")
         if len(self._kdf._internal.index_names) > 1:
             raise ValueError('idxmax do not support multi-index now')
         groupkeys = self._groupkeys
-        sdf = self._kdf._sdf
-        name = self._agg_columns[0].name
+        kser = self._agg_columns[0]
+        name = kser.name
         index = self._kdf._internal.index_columns[0]
-        window = Window.partitionBy([s._scol for s in groupkeys]).orderBy(F.col(name).desc())
-        sdf = sdf.withColumn('rank', F.row_number().over(window)).filter(F.col('rank') <= n)
+
+        # `monotonically_increasing_id` increases with the positions of the rows.
+        sdf = self._kdf._sdf.select([s._scol.alias(s.name) for s in groupkeys] +
+                                    [self._kdf._internal.index_scols[0], kser._scol.alias(name),
+                                     F.monotonically_increasing_id().alias('__position__')])
+        cond = scol_for(sdf, name).isNotNull()
+        if isinstance(kser.spark_type, (FloatType, DoubleType)):
+            cond = cond & ~F.isnan(scol_for(sdf, name))
+        sdf = sdf.where(cond)
+
+        # The rows are numbered within each group in the JVM. A buffer per group in Python
+        # would pickle every row and would not spill with many groups.
+        order = scol_for(sdf, name) if ascending else scol_for(sdf, name).desc()
+        window = Window.partitionBy([scol_for(sdf, s.name) for s in groupkeys]) \
+            .orderBy(order, scol_for(sdf, '__position__'))
+        sdf = sdf.withColumn('__rank__', F.row_number().over(window)) \
+            .where(F.col('__rank__') <= n)
+
+        sdf = sdf.select([scol_for(sdf, s.name) for s in groupkeys] +
+                         [scol_for(sdf, index), scol_for(sdf, name)])
         internal = _InternalFrame(sdf=sdf,
                                   data_columns=[name],
-                                  index_map=[(s.name, s.name) for s in self._groupkeys] +
+                                  index_map=[(s.name, s.name) for s in groupkeys] +
                                             [(index, None)])
-        kdf = _col(DataFrame(internal))
-        return kdf
+        return _col(DataFrame(internal))
 
     def fillna(self, value=None, method=None, axis=None, inplace=False, limit=None):
         """Fill NA/NaN values in group.
@@ -1422,6 +1626,12 @@ class GroupBy(object):
         .. note:: the series within ``func`` is actually a pandas series. Therefore,
             any pandas APIs within this function is allowed.
 
+        .. note:: if ``func`` only combines the series with its aggregates, such as
+            ``x - x.mean()``, ``x / x.sum()``, ``x.rank()`` or
+            ``(x - x.min()) / (x.max() - x.min())``, it is computed with Spark window
+            expressions without pandas UDFs, and the index is kept. Which way is taken is
+            logged at INFO level by the 'databricks.koalas.groupby' logger.
+
 
         Parameters
         ----------
@@ -1500,6 +1710,10 @@ class GroupBy(object):
         return_sig = spec.annotations.get("return", None)
         input_groupnames = [s.name for s in self._groupkeys]
 
+        transformed = self._native_transform(func, return_sig)
+        if transformed is not None:
+            return transformed
+
         def pandas_transform(pdf):
             # pandas GroupBy.transform drops grouping columns.
             pdf = pdf.drop(columns=input_groupnames)
@@ -1519,7 +1733,7 @@ class GroupBy(object):
                 return kdf
 
             sdf = self._spark_group_map_apply(
-                pandas_transform, return_schema, retain_index=True)
+                pandas_transform, return_schema, retain_index=True, name="GroupBy.transform")
             # If schema is inferred, we can restore indexes too.
             internal = kdf._internal.copy(sdf=sdf)
         else:
@@ -1529,13 +1743,48 @@ class GroupBy(object):
                 StructField(c, return_type) for c in data_columns if c not in input_groupnames])
 
             sdf = self._spark_group_map_apply(
-                pandas_transform, return_schema, retain_index=False)
+                pandas_transform, return_schema, retain_index=False, name="GroupBy.transform")
             # Otherwise, it loses index.
             internal = _InternalFrame(sdf=sdf)
 
         return DataFrame(internal)
 
-    def nunique(self, dropna=True):
+    def _native_transform(self, func, return_sig):
+        """
+        Runs `transform` with Spark window expressions if the function can be traced.
+
+        `func` is called with a `_SeriesTrace` of each column, whose aggregates are computed
+        over the window of each group. If every column is transformed into a `_SeriesTrace`,
+        the results are selected as they are. Otherwise, returns None so that the pandas UDF
+        is used.
+        """
+        window = Window.partitionBy(*[s._scol for s in self._groupkeys])
+        part_cols = [s._scol for s in self._groupkeys]
+        try:
+            applied = []
+            for kser in self._agg_columns:
+                if not isinstance(kser.spark_type, NumericType):
+                    raise TypeError("{} is not numeric.".format(kser.name))
+                traced = func(_SeriesTrace(kser, window, part_cols))
+                if not isinstance(traced, _SeriesTrace):
+                    raise TypeError("the result is {}, not a Series.".format(type(traced)))
+                scol = traced._kser._scol
+                if return_sig is not None:
+                    scol = scol.cast(_infer_return_type(func).tpe)
+                applied.append(scol.alias(kser.name))
+        except Exception as e:
+            logger.info("GroupBy.transform runs with a pandas UDF since the function cannot be "
+                        "traced: %s", e)
+            return None
+
+        logger.info("GroupBy.transform runs with Spark window expressions.")
+        internal = self._kdf._internal
+        sdf = internal.sdf.select(internal.index_scols + applied)
+        return DataFrame(internal.copy(sdf=sdf,
+                                       data_columns=[kser.name for kser in self._agg_columns],
+                                       column_index=None))
+
+    def nunique(self, dropna=True, approx=False, rsd=0.05):
         """
         Return DataFrame with number of distinct observations per group for each column.
 
@@ -1543,6 +1792,14 @@ class GroupBy(object):
         ----------
         dropna : boolean, default True
             Don’t include NaN in the counts.
+        approx: bool, default False
+            If False, will use the exact algorithm and return the exact number of unique.
+            If True, it uses the HyperLogLog approximate algorithm, which is significantly faster
+            for large amount of data.
+            Note: This parameter is specific to Koalas and is not found in pandas.
+        rsd: float, default 0.05
+            Maximum estimation error allowed in the HyperLogLog algorithm.
+            Note: Just like ``approx`` this parameter is specific to Koalas.
 
         Returns
         -------
@@ -1577,17 +1834,109 @@ class GroupBy(object):
         ham     1
         spam    2
         Name: value1, dtype: int64
+
+        On big data, we recommend using the approximate algorithm to speed up this function.
+        The result will be very close to the exact unique count.
+
+        >>> df.groupby('id')['value1'].nunique(approx=True) # doctest: +NORMALIZE_WHITESPACE
+        id
+        egg     1
+        ham     1
+        spam    2
+        Name: value1, dtype: int64
         """
         if isinstance(self, DataFrameGroupBy):
             self._agg_columns = self._groupkeys + self._agg_columns
+        if approx:
+            count_fn = lambda col: F.approx_count_distinct(col, rsd=rsd)
+        else:
+            count_fn = F.countDistinct
         if dropna:
-            stat_function = lambda col: F.countDistinct(col)
+            stat_function = count_fn
         else:
             stat_function = lambda col: \
-                (F.countDistinct(col) +
+                (count_fn(col) +
                  F.when(F.count(F.when(col.isNull(), 1).otherwise(None)) >= 1, 1).otherwise(0))
         return self._reduce_for_stat_function(stat_function, only_numeric=False)
 
+    def approx_nunique(self, dropna=True, rsd=0.05):
+        """
+        Return the approximate number of distinct observations per group for each column,
+        using the HyperLogLog algorithm.
+
+        This is equivalent to ``nunique(approx=True)`` and is specific to Koalas.
+
+        Parameters
+        ----------
+        dropna : boolean, default True
+            Don’t include NaN in the counts.
+        rsd: float, default 0.05
+            Maximum estimation error allowed in the HyperLogLog algorithm.
+
+        Returns
+        -------
+        approx_nunique : DataFrame
+
+        See Also
+        --------
+        databricks.koalas.groupby.GroupBy.nunique
+
+        Examples
+        --------
+        >>> df = ks.DataFrame({'id': ['spam', 'egg', 'egg', 'spam', 'ham', 'ham'],
+        ...                    'value': [1, 5, 5, 2, 5, 6]}, columns=['id', 'value'])
+        >>> df.groupby('id')['value'].approx_nunique(rsd=0.01) # doctest: +NORMALIZE_WHITESPACE
+        id
+        egg     1
+        ham     2
+        spam    2
+        Name: value, dtype: int64
+        """
+        return self.nunique(dropna=dropna, approx=True, rsd=rsd)
+
+    def approx_quantile(self, q=0.5, accuracy=10000):
+        """
+        Return an approximate quantile of the values per group for each numeric column.
+
+        The approximation is computed by Spark's `approx_percentile`, see `Series.quantile`.
+        This method is specific to Koalas.
+
+        Parameters
+        ----------
+        q : float, default 0.5
+            Quantile to compute, between 0 and 1 inclusive.
+        accuracy : int, default 10000
+            Default accuracy of approximation. Larger value means better accuracy.
+            The relative error can be deduced by 1.0 / accuracy.
+
+        Returns
+        -------
+        approx_quantile : DataFrame
+
+        See Also
+        --------
+        databricks.koalas.Series.quantile
+
+        Examples
+        --------
+        >>> df = ks.DataFrame({'A': [1, 1, 1, 2, 2],
+        ...                    'B': [1., 2., 3., 4., 5.],
+        ...                    'C': list('abcde')}, columns=['A', 'B', 'C'])
+        >>> df.groupby('A').approx_quantile(0.5)  # doctest: +NORMALIZE_WHITESPACE
+             B
+        A
+        1  2.0
+        2  4.0
+        """
+        if not isinstance(accuracy, int):
+            raise ValueError("accuracy must be an integer; however, got [%s]" % type(accuracy))
+        if not isinstance(q, float):
+            raise ValueError("q must be a float; however, [%s] found." % type(q))
+        if q < 0.0 or q > 1.0:
+            raise ValueError("percentiles should all be in the interval [0, 1].")
+        return self._reduce_for_stat_function(
+            'approx_percentile({{}}, {}, {})'.format(q, accuracy), only_numeric=True)
+
     # TODO: add bins, normalize parameter
     def value_counts(self, sort=None, ascending=None, dropna=True):
         """
@@ -1632,7 +1981,7 @@ class GroupBy(object):
         groupkeys = self._groupkeys + self._agg_columns
         groupkey_cols = [s._scol.alias('__index_level_{}__'.format(i))
                          for i, s in enumerate(groupkeys)]
-        sdf = self._kdf._sdf
+        sdf = self._kdf._internal.index_agnostic_sdf
         agg_column = self._agg_columns[0].name
         sdf = sdf.groupby(*groupkey_cols).count().withColumnRenamed('count', agg_column)
 
@@ -1649,14 +1998,19 @@ class GroupBy(object):
         return _col(DataFrame(internal))
 
     def _reduce_for_stat_function(self, sfun, only_numeric):
+        """
+        `sfun` is either a function from a Spark Column to an aggregated Column, or a Spark SQL
+        aggregate expression with a `{}` placeholder for the column, e.g.
+        'approx_percentile({}, 0.5, 10000)'.
+        """
         groupkeys = self._groupkeys
         groupkey_cols = [s._scol.alias('__index_level_{}__'.format(i))
                          for i, s in enumerate(groupkeys)]
-        sdf = self._kdf._sdf
+        sdf = self._kdf._internal.index_agnostic_sdf
 
         data_columns = []
         if len(self._agg_columns) > 0:
-            stat_exprs = []
+            scols = []
             for ks in self._agg_columns:
                 spark_type = ks.spark_type
                 # TODO: we should have a function that takes dataframes and converts the numeric
@@ -1664,11 +2018,23 @@ class GroupBy(object):
                 # Special handle floating point types because Spark's count treats nan as a valid
                 # value, whereas Pandas count doesn't include nan.
                 if isinstance(spark_type, DoubleType) or isinstance(spark_type, FloatType):
-                    stat_exprs.append(sfun(F.nanvl(ks._scol, F.lit(None))).alias(ks.name))
+                    scols.append(F.nanvl(ks._scol, F.lit(None)))
                     data_columns.append(ks.name)
                 elif isinstance(spark_type, NumericType) or not only_numeric:
-                    stat_exprs.append(sfun(ks._scol).alias(ks.name))
+                    scols.append(ks._scol)
                     data_columns.append(ks.name)
+            if isinstance(sfun, str):
+                # SQL expressions can only refer to columns by name, so project them first.
+                agg_names = ['__agg_{}__'.format(i) for i in range(len(scols))]
+                sdf = sdf.select(groupkey_cols +
+                                 [scol.alias(name) for scol, name in zip(scols, agg_names)])
+                groupkey_cols = [F.col('__index_level_{}__'.format(i))
+                                 for i in range(len(groupkeys))]
+                stat_exprs = [F.expr(sfun.format('`{}`'.format(name))).alias(data_column)
+                              for name, data_column in zip(agg_names, data_columns)]
+            else:
+                stat_exprs = [sfun(scol).alias(data_column)
+                              for scol, data_column in zip(scols, data_columns)]
             sdf = sdf.groupby(*groupkey_cols).agg(*stat_exprs)
         else:
             sdf = sdf.select(*groupkey_cols).distinct()
@@ -1683,6 +2049,261 @@ class GroupBy(object):
         return kdf
 
 
+class _GroupTrace(object):
+    """
+    A symbolic stand-in of the pandas DataFrame of each group, used to trace predicates.
+
+    Only the columns and their aggregates are supported. Anything else fails, which means
+    the function cannot be traced.
+    """
+
+    def __init__(self, kdf: DataFrame, window):
+        self._kdf = kdf
+        self._window = window
+
+    def __getitem__(self, key):
+        if not isinstance(key, str) or key not in self._kdf._internal.data_columns:
+            raise KeyError(key)
+        return _ColumnTrace(self._kdf[key], self._window)
+
+    def __getattr__(self, key):
+        if key.startswith('_'):
+            raise AttributeError(key)
+        return self[key]
+
+
+class _ColumnTrace(object):
+    """ A symbolic stand-in of a column of each group. Only its aggregates are supported. """
+
+    def __init__(self, kser: Series, window):
+        self._kser = kser
+        self._window = window
+
+    def _aggregate(self, sfun, default=None):
+        scol = self._kser._scol
+        if isinstance(self._kser.spark_type, (FloatType, DoubleType)):
+            scol = F.nanvl(scol, F.lit(None))
+        scol = sfun(scol).over(self._window)
+        if default is not None:
+            scol = F.coalesce(scol, F.lit(default))
+        return _AggregateTrace(scol)
+
+    def sum(self):
+        return self._aggregate(F.sum, default=0)
+
+    def mean(self):
+        return self._aggregate(F.mean)
+
+    def min(self):
+        return self._aggregate(F.min)
+
+    def max(self):
+        return self._aggregate(F.max)
+
+    def count(self):
+        return self._aggregate(F.count)
+
+    def std(self):
+        # Spark returns NaN instead of null for a single value.
+        return _AggregateTrace(F.nanvl(self._aggregate(F.stddev)._scol, F.lit(None)))
+
+    def var(self):
+        return _AggregateTrace(F.nanvl(self._aggregate(F.variance)._scol, F.lit(None)))
+
+    def nunique(self):
+        return self._aggregate(lambda scol: F.size(F.collect_set(scol)))
+
+
+class _AggregateTrace(object):
+    """
+    A symbolic aggregate of each group. The comparisons with missing values are False except
+    for `!=`, as in pandas.
+    """
+
+    def __init__(self, scol: Column):
+        self._scol = scol
+
+    def _op(self, other, op):
+        if isinstance(other, _AggregateTrace):
+            other = other._scol
+        elif isinstance(other, (np.number, np.bool_)):
+            other = other.item()
+        elif not isinstance(other, (bool, int, float)):
+            raise TypeError("cannot trace an operation with {}.".format(type(other)))
+        return _AggregateTrace(op(self._scol, other))
+
+    def _compare(self, other, op, missing=False):
+        return self._op(other, lambda x, y: F.coalesce(op(x, y), F.lit(missing)))
+
+    def __add__(self, other):
+        return self._op(other, lambda x, y: x + y)
+
+    def __radd__(self, other):
+        return self._op(other, lambda x, y: y + x)
+
+    def __sub__(self, other):
+        return self._op(other, lambda x, y: x - y)
+
+    def __rsub__(self, other):
+        return self._op(other, lambda x, y: y - x)
+
+    def __mul__(self, other):
+        return self._op(other, lambda x, y: x * y)
+
+    def __rmul__(self, other):
+        return self._op(other, lambda x, y: y * x)
+
+    def __truediv__(self, other):
+        return self._op(other, lambda x, y: x / y)
+
+    def __rtruediv__(self, other):
+        return self._op(other, lambda x, y: y / x)
+
+    def __lt__(self, other):
+        return self._compare(other, lambda x, y: x < y)
+
+    def __le__(self, other):
+        return self._compare(other, lambda x, y: x <= y)
+
+    def __gt__(self, other):
+        return self._compare(other, lambda x, y: x > y)
+
+    def __ge__(self, other):
+        return self._compare(other, lambda x, y: x >= y)
+
+    def __eq__(self, other):
+        return self._compare(other, lambda x, y: x == y)
+
+    def __ne__(self, other):
+        return self._compare(other, lambda x, y: x != y, missing=True)
+
+    def __and__(self, other):
+        return self._op(other, lambda x, y: x & y)
+
+    def __or__(self, other):
+        return self._op(other, lambda x, y: x | y)
+
+    def __invert__(self):
+        return _AggregateTrace(~self._scol)
+
+    def __bool__(self):
+        raise TypeError("cannot trace the truth value of an aggregate.")
+
+
+class _SeriesTrace(object):
+    """
+    A symbolic stand-in of the pandas Series of each group, used to trace transforms.
+
+    The arithmetic runs on the underlying Koalas Series, and the aggregates are computed
+    over the window of each group. Anything else fails, which means the function cannot
+    be traced.
+    """
+
+    def __init__(self, kser: Series, window, part_cols):
+        self._kser = kser
+        self._window = window
+        self._part_cols = part_cols
+
+    def _with_kser(self, kser):
+        return _SeriesTrace(kser, self._window, self._part_cols)
+
+    def _op(self, other, op):
+        if isinstance(other, _SeriesTrace):
+            other = other._kser
+        elif isinstance(other, (np.number, np.bool_)):
+            other = other.item()
+        elif not isinstance(other, (bool, int, float)):
+            raise TypeError("cannot trace an operation with {}.".format(type(other)))
+        return self._with_kser(op(self._kser, other))
+
+    def _aggregate(self, sfun, default=None):
+        scol = self._kser._scol
+        if isinstance(self._kser.spark_type, (FloatType, DoubleType)):
+            scol = F.nanvl(scol, F.lit(None))
+        scol = sfun(scol).over(self._window)
+        if default is not None:
+            scol = F.coalesce(scol, F.lit(default))
+        return self._with_kser(self._kser._with_new_scol(scol))
+
+    def sum(self):
+        return self._aggregate(F.sum, default=0)
+
+    def mean(self):
+        return self._aggregate(F.mean)
+
+    def min(self):
+        return self._aggregate(F.min)
+
+    def max(self):
+        return self._aggregate(F.max)
+
+    def count(self):
+        return self._aggregate(F.count)
+
+    def std(self):
+        # Spark returns NaN instead of null for a single value.
+        traced = self._aggregate(F.stddev)
+        return self._with_kser(traced._kser._with_new_scol(
+            F.nanvl(traced._kser._scol, F.lit(None))))
+
+    def var(self):
+        traced = self._aggregate(F.variance)
+        return self._with_kser(traced._kser._with_new_scol(
+            F.nanvl(traced._kser._scol, F.lit(None))))
+
+    def rank(self, method='average', ascending=True):
+        # Unlike `Series.rank`, the missing values are not ranked, as in pandas.
+        if method not in ('average', 'min', 'max', 'dense'):
+            raise ValueError("cannot trace rank with method '{}'.".format(method))
+        scol = self._kser._scol
+        if isinstance(self._kser.spark_type, (FloatType, DoubleType)):
+            scol = F.nanvl(scol, F.lit(None))
+        ordered = Window.partitionBy(*self._part_cols).orderBy(
+            scol.asc_nulls_last() if ascending else scol.desc_nulls_last())
+        if method == 'dense':
+            rank = F.dense_rank().over(ordered)
+        else:
+            low = F.rank().over(ordered)
+            high = low + F.count(F.lit(1)).over(
+                Window.partitionBy(*(list(self._part_cols) + [scol]))) - 1
+            rank = {'min': low, 'max': high, 'average': (low + high) / 2}[method]
+        scol = F.when(scol.isNull(), F.lit(None)).otherwise(rank).cast(DoubleType())
+        return self._with_kser(self._kser._with_new_scol(scol))
+
+    def __add__(self, other):
+        return self._op(other, lambda x, y: x + y)
+
+    def __radd__(self, other):
+        return self._op(other, lambda x, y: y + x)
+
+    def __sub__(self, other):
+        return self._op(other, lambda x, y: x - y)
+
+    def __rsub__(self, other):
+        return self._op(other, lambda x, y: y - x)
+
+    def __mul__(self, other):
+        return self._op(other, lambda x, y: x * y)
+
+    def __rmul__(self, other):
+        return self._op(other, lambda x, y: y * x)
+
+    def __truediv__(self, other):
+        return self._op(other, lambda x, y: x / y)
+
+    def __rtruediv__(self, other):
+        return self._op(other, lambda x, y: y / x)
+
+    def __pow__(self, other):
+        return self._op(other, lambda x, y: x ** y)
+
+    def __neg__(self):
+        return self._with_kser(-self._kser)
+
+    def __bool__(self):
+        raise TypeError("cannot trace the truth value of a Series.")
+
+
 class DataFrameGroupBy(GroupBy):
 
     def __init__(self, kdf: DataFrame, by: List[Series], as_index: bool = True,
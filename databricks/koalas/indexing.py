@@ -17,8 +17,11 @@
 """
 A loc indexer for Koalas DataFrame/Series.
 """
+from bisect import bisect_right
 from functools import reduce
+from itertools import accumulate, islice
 
+import numpy as np
 import pandas as pd
 from pandas.api.types import is_list_like
 from pyspark import sql as spark
@@ -26,9 +29,10 @@ from pyspark.sql import functions as F
 from pyspark.sql.types import BooleanType
 from pyspark.sql.utils import AnalysisException
 
+from databricks.koalas.config import get_option
 from databricks.koalas.internal import _InternalFrame
 from databricks.koalas.exceptions import SparkPandasIndexingError, SparkPandasNotImplementedError
-from databricks.koalas.utils import column_index_level
+from databricks.koalas.utils import column_index_level, default_session
 
 
 def _make_col(c):
@@ -42,6 +46,42 @@ def _make_col(c):
             description="Can only convert a string to a column type.")
 
 
+def _take_positions(sdf, counts, positions):
+    """
+    Return a Spark DataFrame of the rows at the given 0-based positions of the given Spark
+    DataFrame, in the given order including duplicates.
+
+    The partitions holding the positions are found from the row counts of the partitions, and
+    a single Spark job runs only on them, reading each partition up to the last row needed.
+
+    :param sdf: the Spark DataFrame to take the rows from.
+    :param counts: the number of rows in each partition of `sdf`.
+    :param positions: the positions of the rows, which must be within the number of rows.
+    """
+    offsets = [0] + list(accumulate(counts))
+    wanted = {}  # type: dict
+    for position in positions:
+        partition_id = bisect_right(offsets, position) - 1
+        wanted.setdefault(partition_id, set()).add(position - offsets[partition_id])
+    if len(wanted) == 0:
+        return default_session().createDataFrame([], schema=sdf.schema)
+    wanted = dict((partition_id, sorted(local)) for partition_id, local in wanted.items())
+
+    def take(partition_id, iterator):
+        local = wanted.get(partition_id, [])
+        if len(local) == 0:
+            return
+        needed = set(local)
+        for i, row in enumerate(islice(iterator, local[-1] + 1)):
+            if i in needed:
+                yield offsets[partition_id] + i, row
+
+    rdd = sdf.rdd.mapPartitionsWithIndex(take, preservesPartitioning=True)
+    taken = dict(rdd.context.runJob(rdd, lambda iterator: list(iterator), sorted(wanted)))
+    return default_session().createDataFrame(
+        [taken[position] for position in positions], schema=sdf.schema)
+
+
 def _unfold(key, kseries):
     """ Return row selection and column selection pair.
 
@@ -162,10 +202,16 @@ class AtIndexer(object):
         sdf = self._ks._kdf._sdf if self._ks is not None else self._kdf._sdf
 
         row = key[0] if self._ks is None else key
-        pdf = (sdf
-               .where(self._kdf._internal.index_scols[0] == row)
-               .select(_make_col(column))
-               .toPandas())
+        pdf = None
+        key_index = self._kdf._internal.key_index
+        if key_index is not None:
+            # Read only the partition which contains the row, see `DataFrame.create_index`.
+            pdf = key_index.lookup([row], [column])
+        if pdf is None:
+            pdf = (sdf
+                   .where(self._kdf._internal.index_scols[0] == row)
+                   .select(_make_col(column))
+                   .toPandas())
         if len(pdf) < 1:
             raise KeyError(row)
 
@@ -400,7 +446,10 @@ class LocIndexer(object):
                 rows_sel = list(rows_sel)
             except TypeError:
                 raiseNotImplemented("Cannot use a scalar value for row selection with Spark.")
-            if len(rows_sel) == 0:
+            key_index = self._kdf._internal.key_index
+            if len(rows_sel) == 0 or (key_index is not None
+                                      and key_index.partitions_for(rows_sel) == []):
+                # No partition can contain the labels, see `DataFrame.create_index`.
                 sdf = sdf.where(F.lit(False))
             elif len(self._kdf._internal.index_columns) == 1:
                 index_column = self._kdf.index.to_series()
@@ -523,13 +572,14 @@ class ILocIndexer(object):
     - A list or array of integers for column selection, e.g. ``[4, 3, 0]``.
     - A boolean array for column selection.
     - A slice object with ints for column selection, e.g. ``1:7``.
-    - A slice object with ints without start and step for row selection, e.g. ``:7``.
+    - A slice object with ints and a positive step for row selection, e.g. ``1:7:2``.
+    - A list or array of integers for row selection, e.g. ``[4, 3, 0]``.
     - A conditional boolean Index for row selection.
 
     Not allowed inputs which pandas allows are:
 
     - An integer for row selection, e.g. ``5``.
-    - A list or array of integers for row selection, e.g. ``[4, 3, 0]``.
+    - A slice object with a negative step for row selection, e.g. ``::-1``.
     - A boolean array for row selection.
     - A ``callable`` function with one argument (the calling Series, DataFrame
       or Panel) and that returns valid output for indexing (one of the above).
@@ -540,6 +590,15 @@ class ILocIndexer(object):
     out-of-bounds, except *slice* indexers which allow out-of-bounds
     indexing (this conforms with python/numpy *slice* semantics).
 
+    .. note:: The positions of the rows follow the order of the partitions and of the rows
+        within each partition, as ``head`` does. Except for a slice with only the stop, the rows
+        are selected by the positions computed from the row counts of the partitions, which
+        are cached as the 'distributed-sequence' default index does. Up to
+        'compute.shortcut_limit' rows, a Spark job reads only the partitions holding them.
+
+    .. note:: With a list or array of integers for row selection of more than
+        'compute.shortcut_limit' rows, the positions should be ascending without duplicates.
+
     See Also
     --------
     DataFrame.loc : Purely label-location based indexer for selection by label.
@@ -568,12 +627,12 @@ class ILocIndexer(object):
      ...
     databricks.koalas.exceptions.SparkPandasNotImplementedError: ...
 
-    A list of integers for row selection is not allowed.
+    A list of integers for row selection.
 
-    >>> df.iloc[[0]]
-    Traceback (most recent call last):
-     ...
-    databricks.koalas.exceptions.SparkPandasNotImplementedError: ...
+    >>> df.iloc[[0, -1]]
+          a     b     c     d
+    0     1     2     3     4
+    2  1000  2000  3000  4000
 
     With a `slice` object.
 
@@ -583,6 +642,10 @@ class ILocIndexer(object):
     1   100   200   300   400
     2  1000  2000  3000  4000
 
+    >>> df.iloc[1::2]
+         a    b    c    d
+    1  100  200  300  400
+
     Conditional that returns a boolean Series
 
     >>> df.iloc[df.index % 2 == 0]
@@ -652,27 +715,62 @@ class ILocIndexer(object):
         rows_sel, cols_sel = _unfold(key, self._ks)
 
         sdf = self._kdf._sdf
+        taken = None
         if isinstance(rows_sel, Index):
             sdf_for_check_schema = sdf.select(rows_sel._scol)
             assert isinstance(sdf_for_check_schema.schema.fields[0].dataType, BooleanType), \
                 (str(sdf_for_check_schema), sdf_for_check_schema.schema.fields[0].dataType)
             sdf = sdf.where(rows_sel._scol)
         elif isinstance(rows_sel, slice):
+            for s in (rows_sel.start, rows_sel.stop, rows_sel.step):
+                if s is not None and not isinstance(s, int):
+                    raise TypeError("cannot do slice indexing with these indexers [{}] of {}"
+                                    .format(s, type(s)))
             if rows_sel == slice(None):
                 # If slice is None - select everything, so nothing to do
                 pass
-            elif (rows_sel.start is not None) or (rows_sel.step is not None):
-                raiseNotImplemented("Cannot use start or step with Spark.")
-            elif not isinstance(rows_sel.stop, int):
-                raise TypeError("cannot do slice indexing with these indexers [{}] of {}"
-                                .format(rows_sel.stop, type(rows_sel.stop)))
-            elif rows_sel.stop >= 0:
+            elif rows_sel.step is not None and rows_sel.step <= 0:
+                if rows_sel.step == 0:
+                    raise ValueError("slice step cannot be zero")
+                raiseNotImplemented("Cannot use negative step with Spark.")
+            elif rows_sel.start is None and rows_sel.step is None and rows_sel.stop >= 0:
                 sdf = sdf.limit(rows_sel.stop)
             else:
-                sdf = sdf.limit(sdf.count() + rows_sel.stop)
+                counts = _InternalFrame._partition_counts(sdf)
+                positions = range(sum(counts))[rows_sel]
+                if len(positions) <= get_option("compute.shortcut_limit"):
+                    # Read only the partitions holding the positions computed from the cached
+                    # row counts of the partitions, after the columns are selected below.
+                    taken = (counts, positions)
+                else:
+                    position, _ = _InternalFrame._sequence_scol(sdf)
+                    cond = (position >= positions.start) & (position < positions.stop)
+                    if positions.step > 1:
+                        cond = cond & ((position - positions.start) % positions.step == 0)
+                    sdf = sdf.where(cond)
+        elif (is_list_like(rows_sel) and not isinstance(rows_sel, (Series, DataFrame))
+              and all(isinstance(i, (int, np.integer)) and not isinstance(i, (bool, np.bool_))
+                      for i in rows_sel)):
+            counts = _InternalFrame._partition_counts(sdf)
+            count = sum(counts)
+            positions = []
+            for i in rows_sel:
+                if not -count <= i < count:
+                    raise IndexError("positional indexers are out-of-bounds")
+                positions.append(int(i) + count if i < 0 else int(i))
+            if len(positions) <= get_option("compute.shortcut_limit"):
+                taken = (counts, positions)
+            elif all(prev < cur for prev, cur in zip(positions, positions[1:])):
+                # Filtering keeps the rows in the order of their positions, which is the order
+                # requested only if the positions strictly ascend.
+                position, _ = _InternalFrame._sequence_scol(sdf)
+                sdf = sdf.where(position.isin(positions))
+            else:
+                raiseNotImplemented("Cannot select more than 'compute.shortcut_limit' rows by "
+                                    "unordered or duplicated positions.")
         else:
-            raiseNotImplemented(".iloc requires numeric slice or conditional boolean Index, "
-                                "got {}".format(rows_sel))
+            raiseNotImplemented(".iloc requires numeric slice, list of integers or conditional "
+                                "boolean Index, got {}".format(rows_sel))
 
         # make cols_sel a 1-tuple of string if a single string
         if isinstance(cols_sel, Series):
@@ -701,6 +799,9 @@ class ILocIndexer(object):
 
         try:
             sdf = sdf.select(self._kdf._internal.index_scols + columns)
+            if taken is not None:
+                # Selecting the columns does not change the partitions or the rows in them.
+                sdf = _take_positions(sdf, *taken)
             index_columns = self._kdf._internal.index_columns
             data_columns = [column for column in sdf.columns if column not in index_columns]
             internal = _InternalFrame(
@@ -18,24 +18,33 @@
 An internal immutable DataFrame with some metadata to manage indexes.
 """
 
-from typing import Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from distutils.version import LooseVersion
+import logging
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from itertools import accumulate
 
 import numpy as np
 import pandas as pd
 from pandas.api.types import is_datetime64_dtype, is_datetime64tz_dtype, is_list_like
+from pandas.core.dtypes.cast import find_common_type
+from py4j.protocol import Py4JError
+import pyspark
 from pyspark import sql as spark
 from pyspark._globals import _NoValue, _NoValueType
 from pyspark.sql import functions as F, Window
-from pyspark.sql.functions import PandasUDFType, pandas_udf
-from pyspark.sql.types import DataType, StructField, StructType, to_arrow_type, LongType
+from pyspark.sql.types import BooleanType, DataType, DoubleType, FloatType, IntegralType, \
+    LongType, NumericType, StringType, StructField, StructType, TimestampType, to_arrow_type
 
 from databricks import koalas as ks  # For running doctests and reference resolution in PyCharm.
-from databricks.koalas.config import get_option
+from databricks.koalas.config import get_option, _caches
 from databricks.koalas.typedef import infer_pd_series_spark_type
 from databricks.koalas.utils import column_index_level, default_session, lazy_property, scol_for
 
 
+logger = logging.getLogger(__name__)
+
+
 IndexMap = Tuple[str, Optional[str]]
 
 
@@ -49,6 +58,8 @@ class _InternalFrame(object):
                        and the index name to be seen in Koalas DataFrame.
     :ivar _scol: Spark Column
     :ivar _data_columns: list of the Spark field names to be seen as columns in Koalas DataFrame.
+    :ivar _partitioned_by: list of the Spark field names which the rows are known to be
+                           partitioned by, or None if unknown.
 
     .. note:: this is an internal class. It is not supposed to be exposed to users and users
         should not directly access to it.
@@ -345,7 +356,9 @@ class _InternalFrame(object):
                  scol: Optional[spark.Column] = None,
                  data_columns: Optional[List[str]] = None,
                  column_index: Optional[List[Tuple[str]]] = None,
-                 column_index_names: Optional[List[str]] = None) -> None:
+                 column_index_names: Optional[List[str]] = None,
+                 partitioned_by: Optional[List[str]] = None,
+                 key_index: Optional['_KeyIndex'] = None) -> None:
         """
         Create a new internal immutable DataFrame to manage Spark DataFrame, column fields and
         index fields and names.
@@ -353,7 +366,8 @@ class _InternalFrame(object):
         :param sdf: Spark DataFrame to be managed.
         :param index_map: list of string pair
                            Each pair holds the index field name which exists in Spark fields,
-                           and the index name.
+                           and the index name. If this is None, the default index is attached
+                           lazily when an operation needs it.
         :param scol: Spark Column to be managed.
         :param data_columns: list of string
                               Field names to appear as columns. If scol is not None, this
@@ -361,6 +375,12 @@ class _InternalFrame(object):
         :param column_index: list of tuples with the same length
                               The multi-level values in the tuples.
         :param column_index_names: Names for each of the index levels.
+        :param partitioned_by: list of string
+                                Field names which the rows of the Spark DataFrame are known to be
+                                partitioned by, that is, the rows with the same values of them
+                                are in the same partition. None if unknown.
+        :param key_index: the lookup structure of the partitions by the index values, built by
+                           `DataFrame.create_index` for the Spark DataFrame. None if not built.
         """
         assert isinstance(sdf, spark.DataFrame)
         if index_map is None:
@@ -368,9 +388,12 @@ class _InternalFrame(object):
             assert "__index_level_0__" not in sdf.schema.names, \
                 "Default index column should not appear in columns of the Spark DataFrame"
 
-            # Create default index.
+            # Create default index. It is attached lazily when an operation needs it.
             index_map = [('__index_level_0__', None)]
-            sdf = _InternalFrame.attach_default_index(sdf)
+            self._virtual_index = _VirtualIndex(
+                sdf, get_option("compute.default_index_type"))  # type: Optional[_VirtualIndex]
+        else:
+            self._virtual_index = None
 
         assert index_map is not None
         assert all(isinstance(index_field, str)
@@ -378,8 +401,11 @@ class _InternalFrame(object):
                    for index_field, index_name in index_map)
         assert scol is None or isinstance(scol, spark.Column)
         assert data_columns is None or all(isinstance(col, str) for col in data_columns)
+        assert partitioned_by is None or (len(partitioned_by) > 0 and
+                                          all(isinstance(col, str) for col in partitioned_by))
+        assert key_index is None or isinstance(key_index, _KeyIndex)
 
-        self._sdf = sdf  # type: spark.DataFrame
+        self._sdf = sdf if self._virtual_index is None else None  # type: Optional[spark.DataFrame]
         self._index_map = index_map  # type: List[IndexMap]
         self._scol = scol  # type: Optional[spark.Column]
         if scol is not None:
@@ -411,55 +437,27 @@ class _InternalFrame(object):
         else:
             self._column_index_names = column_index_names
 
+        self._partitioned_by = partitioned_by
+        self._key_index = key_index
+
     @staticmethod
-    def attach_default_index(sdf):
+    def attach_default_index(sdf, default_index_type=None):
         """
         This method attaches a default index to Spark DataFrame. Spark does not have the index
         notion so corresponding column should be generated.
         There are several types of default index can be configured by `compute.default_index_type`.
         """
-        default_index_type = get_option("compute.default_index_type")
+        if default_index_type is None:
+            default_index_type = get_option("compute.default_index_type")
         if default_index_type == "sequence":
             sequential_index = F.row_number().over(
                 Window.orderBy(F.monotonically_increasing_id().asc())) - 1
             scols = [scol_for(sdf, column) for column in sdf.columns]
             return sdf.select(sequential_index.alias("__index_level_0__"), *scols)
         elif default_index_type == "distributed-sequence":
-            # 1. Calculates counts per each partition ID. `counts` here is, for instance,
-            #     {
-            #         1: 83,
-            #         6: 83,
-            #         3: 83,
-            #         ...
-            #     }
-            counts = map(lambda x: (x["key"], x["count"]),
-                         sdf.groupby(F.spark_partition_id().alias("key")).count().collect())
-
-            # 2. Calculates cumulative sum in an order of partition id.
-            #     Note that it does not matter if partition id guarantees its order or not.
-            #     We just need a one-by-one sequential id.
-
-            # sort by partition key.
-            sorted_counts = sorted(counts, key=lambda x: x[0])
-            # get cumulative sum in an order of partition key.
-            cumulative_counts = accumulate(map(lambda count: count[1], sorted_counts))
-            # zip it with partition key.
-            sums = dict(zip(map(lambda count: count[0], sorted_counts), cumulative_counts))
-
-            # 3. Group by partition id and assign each range.
-            def default_index(pdf):
-                current_partition_max = sums[pdf["__spark_partition_id"].iloc[0]]
-                offset = len(pdf)
-                pdf["__index_level_0__"] = list(range(
-                    current_partition_max - offset, current_partition_max))
-                return pdf.drop(columns=["__spark_partition_id"])
-
-            return_schema = StructType(
-                [StructField("__index_level_0__", LongType())] + list(sdf.schema))
-            grouped_map_func = pandas_udf(return_schema, PandasUDFType.GROUPED_MAP)(default_index)
-
-            sdf = sdf.withColumn("__spark_partition_id", F.spark_partition_id())
-            return sdf.groupBy("__spark_partition_id").apply(grouped_map_func)
+            sequential_index, _ = _InternalFrame._sequence_scol(sdf)
+            scols = [scol_for(sdf, column) for column in sdf.columns]
+            return sdf.select(sequential_index.alias("__index_level_0__"), *scols)
         elif default_index_type == "distributed":
             scols = [scol_for(sdf, column) for column in sdf.columns]
             return sdf.select(
@@ -468,6 +466,202 @@ class _InternalFrame(object):
             raise ValueError("'compute.default_index_type' should be one of 'sequence',"
                              " 'distributed-sequence' and 'distributed'")
 
+    @staticmethod
+    def _sequence_scol(sdf: spark.DataFrame) -> Tuple[spark.Column, int]:
+        """
+        Return the Spark Column of the 0-based positions of the rows in the given Spark
+        DataFrame, in the order of the partitions and of the rows within each partition, and
+        the number of the rows.
+
+        The Column must be evaluated on the partitions of the given Spark DataFrame, that is,
+        before any shuffle.
+        """
+        # `monotonically_increasing_id` puts the partition ID in the upper 31 bits and the
+        # record number within each partition in the lower 33 bits. Therefore, the
+        # sequential index can be computed by replacing the upper bits with the offset of
+        # each partition, without shuffling or serializing the data into Python workers.
+        #
+        # 1. Calculates the offset per each partition ID, in an order of partition ID.
+        #     Note that it does not matter if partition id guarantees its order or not.
+        #     We just need a one-by-one sequential id. `offsets` here is, for instance,
+        #     [0, 83, 166, 249, ...]
+        counts = _InternalFrame._partition_counts(sdf)
+        offsets = [0] + list(accumulate(counts))[:-1]
+
+        # 2. Add the offset of the current partition to the record number within it.
+        partition_offset = F.array(*[F.lit(offset).cast(LongType()) for offset in offsets])[
+            F.spark_partition_id()]
+        record_number = F.monotonically_increasing_id().bitwiseAND(F.lit((1 << 33) - 1))
+        return (partition_offset + record_number).cast(LongType()), sum(counts)
+
+    @staticmethod
+    def _partition_counts(sdf: spark.DataFrame) -> List[int]:
+        """
+        Return the number of rows in each partition of the given Spark DataFrame, in an order of
+        partition ID. Empty partitions are counted as zero.
+
+        This runs a single Spark job which only aggregates the counts within each partition and
+        transfers as many rows as the number of partitions to the driver. The counts are cached
+        per the analyzed plan of the Spark DataFrame, bounded by `compute.index_cache_size`.
+        """
+        maxsize = get_option("compute.index_cache_size")
+        if maxsize == 0:
+            return _InternalFrame._compute_partition_counts(sdf)
+        return _InternalFrame._cached_by_plan(
+            "compute.index_cache_size", sdf, maxsize,
+            lambda: _InternalFrame._compute_partition_counts(sdf))
+
+    @staticmethod
+    def _compute_partition_counts(sdf: spark.DataFrame) -> List[int]:
+        counts = dict(map(lambda x: (x["key"], x["count"]),
+                          sdf.groupby(F.spark_partition_id().alias("key")).count().collect()))
+        if len(counts) == 0:
+            return []
+        return [counts.get(partition_id, 0) for partition_id in range(max(counts) + 1)]
+
+    def ordered_ranges(self, scols: List[spark.Column]) -> Optional[Tuple[spark.Column, int]]:
+        """
+        Split the rows into ranges of the values of the given columns so that the windows
+        ordered over the whole data can be computed per range in parallel, instead of moving
+        all the rows into a single partition.
+
+        Returns the Spark Column of the number of the range each row belongs to, which
+        ascends with the values where nulls come first, and the number of the ranges. The
+        ranges have about 'compute.ordered_window_rows' rows each. Their boundaries are
+        sampled from the data and cached as the partition counts are. Returns None if the
+        option is not set or the data fits in a single range.
+
+        :param scols: the Spark Columns of the managed Spark DataFrame to order by.
+        """
+        rows = get_option("compute.ordered_window_rows")
+        if rows is None:
+            return None
+        sdf = self.sdf
+        count = sum(_InternalFrame._partition_counts(sdf))
+        if count <= rows:
+            return None
+        num_ranges = -(-count // rows)
+
+        values = F.struct(*[scol.alias('_{}'.format(i)) for i, scol in enumerate(scols)])
+        maxsize = get_option("compute.index_cache_size")
+        compute = lambda: _InternalFrame._sample_boundaries(sdf, values, count, num_ranges)
+        if maxsize == 0:
+            boundaries = compute()
+        else:
+            boundaries = _InternalFrame._cached_by_plan(
+                "compute.index_cache_size", sdf, maxsize, compute,
+                extra_key=('ordered_ranges', str(values), num_ranges))
+        if len(boundaries) == 0:
+            return None
+
+        fields = sdf.select(values).schema.fields[0].dataType.fields
+        boundary_scols = [F.struct(*[F.lit(value).cast(field.dataType).alias(field.name)
+                                     for value, field in zip(boundary, fields)])
+                          for boundary in boundaries]
+
+        # The range is the number of the boundaries not greater than the values, found by a
+        # binary search over the sorted boundaries so that each row is compared only
+        # log2(the number of the ranges) times.
+        def search(lo, hi):
+            if lo == hi:
+                return F.lit(lo)
+            mid = (lo + hi) // 2
+            return F.when(values < boundary_scols[mid], search(lo, mid)) \
+                .otherwise(search(mid + 1, hi))
+
+        return search(0, len(boundaries)), len(boundaries) + 1
+
+    @staticmethod
+    def _sample_boundaries(sdf: spark.DataFrame, values: spark.Column, count: int,
+                           num_ranges: int) -> List[Tuple]:
+        # Samples about 100 rows per range, and picks the distinct boundaries between them.
+        fraction = min(1.0, 100.0 * num_ranges / count)
+        sample = [tuple(row[0]) for row in
+                  sdf.select(values.alias('values')).sample(False, fraction).sort('values')
+                  .collect()]
+        boundaries = []  # type: List[Tuple]
+        for i in range(1, num_ranges):
+            boundary = sample[len(sample) * i // num_ranges] if len(sample) > 0 else None
+            if boundary is not None and (len(boundaries) == 0 or boundary != boundaries[-1]):
+                boundaries.append(boundary)
+        return boundaries
+
+    @staticmethod
+    def _cached_by_plan(cache_key: str, sdf: spark.DataFrame, maxsize: int, compute,
+                        extra_key: Tuple = (), weigh=None):
+        """
+        Return the value computed from the given Spark DataFrame by `compute`, caching it in
+        the cache bounded by the option `cache_key`.
+
+        The values are cached per the analyzed plan of the Spark DataFrame. The plans are
+        compared including the IDs of their attributes, so the same Spark DataFrame hits the
+        cache whereas a file or table read again, which may have changed, does not.
+
+        :param cache_key: the option key which bounds the cache.
+        :param sdf: the Spark DataFrame which the value is computed from.
+        :param maxsize: the maximum size of the cache.
+        :param compute: the function which computes the value.
+        :param extra_key: the other values the computed value depends on.
+        :param weigh: the function which returns the weight of the value. 1 if not given.
+        :return: the cached or computed value.
+        """
+        cache = _caches[cache_key]
+        plan = sdf._jdf.queryExecution().analyzed()
+        key = (plan.semanticHash(),) + tuple(extra_key)
+        entry = cache.get(key, match=lambda entry: entry[0].equals(plan))
+        if entry is not None:
+            return entry[1]
+        value = compute()
+        cache.put(key, (plan, value), maxsize=maxsize,
+                  weight=1 if weigh is None else weigh(value))
+        return value
+
+    @staticmethod
+    def _peek_by_plan(cache_key: str, sdf: spark.DataFrame, extra_key: Tuple = ()):
+        """
+        Return the value cached by `_cached_by_plan` for the given Spark DataFrame without
+        computing it, or None if it is not cached.
+        """
+        cache = _caches[cache_key]
+        plan = sdf._jdf.queryExecution().analyzed()
+        key = (plan.semanticHash(),) + tuple(extra_key)
+        entry = cache.get(key, match=lambda entry: entry[0].equals(plan))
+        return None if entry is None else entry[1]
+
+    @staticmethod
+    def _estimated_size(sdf: spark.DataFrame) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Return the number of rows and the size in bytes of the given Spark DataFrame as far as
+        they are known without running a Spark job. Each of them is None if it is not known.
+
+        The number of rows is taken from the partition counts cached for the same plan, or
+        from the statistics of the optimized plan. The size in bytes is taken from the
+        statistics, which Spark estimates from the sources or, once cached data is
+        materialized, from its in-memory size. If Spark cannot estimate a source, the size is
+        estimated from the number of rows and the default sizes of the column types as Spark
+        does.
+        """
+        counts = _InternalFrame._peek_by_plan("compute.index_cache_size", sdf)
+        rows = None if counts is None else sum(counts)
+        size = None
+        try:
+            plan = sdf._jdf.queryExecution().optimizedPlan()
+            # Spark assumes 'spark.sql.defaultSizeInBytes' for the sources it cannot estimate,
+            # which makes the statistics of the whole plan meaningless.
+            default_size = sdf.sql_ctx._jsparkSession.sessionState().conf().defaultSizeInBytes()
+            leaves = plan.collectLeaves()
+            if all(int(leaves.apply(i).stats().sizeInBytes().toString()) < default_size
+                   for i in range(leaves.size())):
+                stats = plan.stats()
+                size = int(stats.sizeInBytes().toString())
+                if rows is None and stats.rowCount().isDefined():
+                    rows = int(stats.rowCount().get().toString())
+            elif rows is not None:
+                size = rows * (8 + sdf._jdf.schema().defaultSize())
+        except Py4JError:
+            pass
+        return rows, size
+
     @lazy_property
     def _column_index_map(self) -> Dict[Tuple[str], str]:
         return dict(zip(self.column_index, self.data_columns))
@@ -487,17 +681,49 @@ class _InternalFrame(object):
                                        or column_name_or_index == self._column_index[0]):
             return self._scol
         else:
-            return scol_for(self._sdf, self.column_name_for(column_name_or_index))
+            column_name = self.column_name_for(column_name_or_index)
+            return scol_for(self._sdf_for(column_name), column_name)
 
     def spark_type_for(self, column_name_or_index: Union[str, Tuple[str]]) -> DataType:
         """ Return DataType for the given column name or index. """
-        return self._sdf.schema[self.column_name_for(column_name_or_index)].dataType
+        column_name = self.column_name_for(column_name_or_index)
+        return self._sdf_for(column_name).schema[column_name].dataType
+
+    def _sdf_for(self, column_name: str) -> spark.DataFrame:
+        """
+        Return the Spark DataFrame to resolve the given column. The virtual default index is
+        attached only when the given column is the index column.
+        """
+        if self.has_virtual_index and column_name not in self.index_columns:
+            return self._virtual_index.sdf
+        else:
+            return self.sdf
 
     @property
     def sdf(self) -> spark.DataFrame:
         """ Return the managed Spark DataFrame. """
+        if self._sdf is None:
+            self._sdf = self._virtual_index.indexed_sdf
         return self._sdf
 
+    @property
+    def has_virtual_index(self) -> bool:
+        """
+        Return whether the managed Spark DataFrame has a default index which is not attached yet.
+        """
+        return self._virtual_index is not None and not self._virtual_index.is_attached
+
+    @property
+    def index_agnostic_sdf(self) -> spark.DataFrame:
+        """
+        Return the Spark DataFrame for the operations which do not need the index, such as
+        aggregations or writers. The virtual default index is not attached to it.
+        """
+        if self.has_virtual_index:
+            return self._virtual_index.sdf
+        else:
+            return self.sdf
+
     @property
     def data_columns(self) -> List[str]:
         """ Return the managed column field names. """
@@ -541,6 +767,28 @@ class _InternalFrame(object):
         """ Return the managed index names. """
         return [index_name for _, index_name in self.index_map]
 
+    @property
+    def partitioned_by(self) -> Optional[List[str]]:
+        """
+        Return the field names which the rows are known to be partitioned by, or None if unknown.
+
+        This tracks the partitioning which Spark does not know by itself, such as the outputs
+        of pandas UDFs grouped by columns. The partitioning in Spark's physical plan, e.g., of
+        bucketed tables or of aggregations, is already used by Spark to avoid shuffles.
+        """
+        return self._partitioned_by
+
+    @property
+    def key_index(self) -> Optional['_KeyIndex']:
+        """
+        Return the lookup structure of the partitions by the index values built by
+        `DataFrame.create_index`, or None if it is not built or the index is changed.
+        """
+        if self._key_index is not None and self.index_columns == [self._key_index.index_column]:
+            return self._key_index
+        else:
+            return None
+
     @property
     def scol(self) -> Optional[spark.Column]:
         """ Return the managed Spark Column. """
@@ -576,7 +824,7 @@ class _InternalFrame(object):
                 if column != name:
                     scol = scol.alias(name)
                 data_columns.append(scol)
-        return self._sdf.select(self.index_scols + data_columns)
+        return self.sdf.select(self.index_scols + data_columns)
 
     @lazy_property
     def spark_df(self) -> spark.DataFrame:
@@ -590,17 +838,132 @@ class _InternalFrame(object):
                 if column != name:
                     scol = scol.alias(name)
                 data_columns.append(scol)
-        return self._sdf.select(data_columns)
+        return self.index_agnostic_sdf.select(data_columns)
 
     @lazy_property
     def pandas_df(self):
-        """ Return as pandas DataFrame. """
+        """
+        Return as pandas DataFrame. It is cached per the analyzed plan if `compute.result_cache`
+        is enabled, so it must not be modified.
+        """
         sdf = self.spark_internal_df
+        if not get_option("compute.result_cache"):
+            return self._to_pandas(sdf)
+
+        maxsize = get_option("compute.result_cache_bytes")
+        if maxsize == 0:
+            return self._to_pandas(sdf)
+
+        # The metadata to restore the index and columns of pandas DataFrame.
+        metadata = (tuple(self.index_map), tuple(self.data_columns), tuple(self.column_index),
+                    None if self.column_index_names is None else tuple(self.column_index_names))
+        pdf = _InternalFrame._cached_by_plan(
+            "compute.result_cache_bytes", sdf, maxsize, lambda: self._to_pandas(sdf),
+            extra_key=metadata,
+            weigh=lambda pdf: int(pdf.memory_usage(index=True, deep=True).sum()))
+        # The cached pandas DataFrame is shared as is. `to_pandas` copies it as it always did
+        # before handing it out, and the internal uses do not modify it.
+        return pdf
+
+    def _to_pandas(self, sdf: spark.DataFrame) -> pd.DataFrame:
+        """ Collect the given Spark DataFrame and restore the index and columns. """
         pdf = sdf.toPandas()
         if len(pdf) == 0 and len(sdf.schema) > 0:
             pdf = pdf.astype({field.name: to_arrow_type(field.dataType).to_pandas_dtype()
                               for field in sdf.schema})
+        return self._restore_index_and_columns(pdf)
+
+    def pandas_df_iter(self, batch_rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Return an iterator of pandas DataFrames with at most `batch_rows` rows each.
+
+        The rows are fetched partition by partition, so the driver holds at most one partition
+        and one batch at a time. The index and columns are restored per batch.
+        """
+        for pdf in _InternalFrame._row_batches(self.spark_internal_df, batch_rows):
+            yield self._restore_index_and_columns(pdf)
 
+    def bounded_pandas_df(self, batch_rows: int) -> pd.DataFrame:
+        """
+        Return as pandas DataFrame, converted in batches of at most `batch_rows` rows.
+
+        The number of rows is known from the cached partition counts, so the columns are
+        allocated once, and each batch is copied into them as it is converted. This keeps the
+        driver memory close to the size of the result. The batches are converted from the rows
+        fetched partition by partition with `toLocalIterator`.
+        """
+        sdf = self.spark_internal_df
+        count = sum(_InternalFrame._partition_counts(sdf))
+        index_columns = [column for column in self.index_columns
+                         if column not in self.data_columns]
+
+        pdf = None
+        index_values = OrderedDict()  # type: Dict[str, np.ndarray]
+        offset = 0
+        for batch in _InternalFrame._row_batches(sdf, batch_rows):
+            if offset + len(batch) > count:
+                raise ValueError("The number of rows changed while collecting them.")
+            if pdf is None:
+                # Allocate all the rows at once with the dtypes of the first batch.
+                pdf = pd.DataFrame(OrderedDict(
+                    (name, np.empty(count, dtype=batch[name].dtype))
+                    for name in batch.columns if name not in index_columns),
+                    index=pd.RangeIndex(count))
+                for name in index_columns:
+                    index_values[name] = np.empty(count, dtype=batch[name].dtype)
+
+            end = offset + len(batch)
+            for name in index_columns:
+                values = batch[name].values
+                dtype = find_common_type([index_values[name].dtype, values.dtype])
+                if dtype != index_values[name].dtype:
+                    index_values[name] = index_values[name].astype(dtype)
+                index_values[name][offset:end] = values
+            for i, name in enumerate(pdf.columns):
+                values = batch[name].values
+                dtype = find_common_type([pdf.dtypes.iloc[i], values.dtype])
+                if dtype != pdf.dtypes.iloc[i]:
+                    # Only this column is copied, as `pd.concat` would upcast it.
+                    pdf[name] = pdf[name].astype(dtype)
+                pdf.iloc[offset:end, i] = values
+            offset = end
+
+        if pdf is None:
+            return self._restore_index_and_columns(_rows_to_pandas([], sdf.schema))
+        if offset < count:
+            raise ValueError("The number of rows changed while collecting them.")
+
+        # Set the index without `set_index`, which copies the data columns.
+        index_values = [index_values[name] if name in index_values else pdf[name].values
+                        for name in self.index_columns]
+        if len(index_values) == 1:
+            pdf.index = pd.Index(index_values[0], name=self.index_names[0])
+        elif len(index_values) > 1:
+            pdf.index = pd.MultiIndex.from_arrays(index_values, names=self.index_names)
+        columns = [str(name) if len(name) > 1 else name[0] for name in self.column_index]
+        if list(pdf.columns) != columns:
+            # The index columns which are also data columns come first in the Spark DataFrame.
+            pdf = pdf[columns]
+        return self._restore_columns(pdf)
+
+    @staticmethod
+    def _row_batches(sdf: spark.DataFrame, batch_rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Return an iterator of pandas DataFrames with at most `batch_rows` rows each, converted
+        from the rows of the given Spark DataFrame fetched partition by partition.
+        """
+        schema = sdf.schema
+        rows = []  # type: List[spark.Row]
+        for row in sdf.toLocalIterator():
+            rows.append(row)
+            if len(rows) == batch_rows:
+                yield _rows_to_pandas(rows, schema)
+                rows = []
+        if len(rows) > 0:
+            yield _rows_to_pandas(rows, schema)
+
+    def _restore_index_and_columns(self, pdf: pd.DataFrame) -> pd.DataFrame:
+        """ Restore the index and columns of the pandas DataFrame collected from Spark. """
         index_columns = self.index_columns
         if len(index_columns) > 0:
             append = False
@@ -610,16 +973,19 @@ class _InternalFrame(object):
                 append = True
             pdf = pdf[[str(name) if len(name) > 1 else name[0] for name in self.column_index]]
 
+        index_names = self.index_names
+        if len(index_names) > 0:
+            pdf.index.names = index_names
+        return self._restore_columns(pdf)
+
+    def _restore_columns(self, pdf: pd.DataFrame) -> pd.DataFrame:
+        """ Restore the columns of the pandas DataFrame collected from Spark in place. """
         if self.column_index_level > 1:
             pdf.columns = pd.MultiIndex.from_tuples(self._column_index)
         else:
             pdf.columns = [idx[0] for idx in self._column_index]
         if self._column_index_names is not None:
             pdf.columns.names = self._column_index_names
-
-        index_names = self.index_names
-        if len(index_names) > 0:
-            pdf.index.names = index_names
         return pdf
 
     def copy(self, sdf: Union[spark.DataFrame, _NoValueType] = _NoValue,
@@ -627,7 +993,9 @@ class _InternalFrame(object):
              scol: Union[spark.Column, _NoValueType] = _NoValue,
              data_columns: Union[List[str], _NoValueType] = _NoValue,
              column_index: Union[List[Tuple[str]], _NoValueType] = _NoValue,
-             column_index_names: Union[List[str], _NoValueType] = _NoValue,) -> '_InternalFrame':
+             column_index_names: Union[List[str], _NoValueType] = _NoValue,
+             partitioned_by: Union[List[str], None, _NoValueType] = _NoValue,
+             key_index: Union['_KeyIndex', None, _NoValueType] = _NoValue) -> '_InternalFrame':
         """ Copy the immutable DataFrame.
 
         :param sdf: the new Spark DataFrame. If None, then the original one is used.
@@ -636,10 +1004,13 @@ class _InternalFrame(object):
         :param data_columns: the new column field names. If None, then the original ones are used.
         :param column_index: the new column index.
         :param column_index_names: the new names of the index levels.
+        :param partitioned_by: the field names which the rows are partitioned by. If not given,
+                               the original ones are used when the Spark DataFrame is not
+                               changed, otherwise it becomes unknown.
+        :param key_index: the lookup structure by the index values. If not given, the original
+                          one is used when the Spark DataFrame is not changed, otherwise None.
         :return: the copied immutable DataFrame.
         """
-        if sdf is _NoValue:
-            sdf = self._sdf
         if index_map is _NoValue:
             index_map = self._index_map
         if scol is _NoValue:
@@ -657,8 +1028,44 @@ class _InternalFrame(object):
         #     column_index = self._column_index
         if column_index_names is _NoValue:
             column_index_names = self._column_index_names
+        if partitioned_by is _NoValue:
+            partitioned_by = self._partitioned_by if sdf is _NoValue else None
+        if key_index is _NoValue:
+            key_index = self._key_index if sdf is _NoValue else None
+        if sdf is _NoValue:
+            if (self.has_virtual_index
+                    and [index_column for index_column, _ in index_map] == self.index_columns
+                    and not any(column in self.index_columns for column in data_columns)):
+                # Keep the default index virtual. It is attached once for all the copies.
+                internal = _InternalFrame(self._virtual_index.sdf, index_map=index_map,
+                                          scol=scol, data_columns=data_columns,
+                                          column_index=column_index,
+                                          column_index_names=column_index_names,
+                                          partitioned_by=partitioned_by, key_index=key_index)
+                internal._sdf = None
+                internal._virtual_index = self._virtual_index
+                return internal
+            sdf = self.sdf
         return _InternalFrame(sdf, index_map=index_map, scol=scol, data_columns=data_columns,
-                              column_index=column_index, column_index_names=column_index_names)
+                              column_index=column_index, column_index_names=column_index_names,
+                              partitioned_by=partitioned_by, key_index=key_index)
+
+    def with_filter(self, pred: spark.Column) -> '_InternalFrame':
+        """ Return a copy of the immutable DataFrame filtered by the given predicate.
+
+        If the default index is virtual, it stays virtual. The predicate is applied after the
+        index is attached so that the filtered rows keep their original index. The partitioning
+        is kept since filtering does not move rows.
+
+        :param pred: the predicate as a boolean Spark Column.
+        :return: the filtered immutable DataFrame.
+        """
+        if self.has_virtual_index:
+            internal = self.copy()
+            internal._virtual_index = _VirtualIndex(self._virtual_index, pred=pred)
+            return internal
+        else:
+            return self.copy(sdf=self.sdf.filter(pred), partitioned_by=self._partitioned_by)
 
     @staticmethod
     def from_pandas(pdf: pd.DataFrame) -> '_InternalFrame':
@@ -693,14 +1100,227 @@ class _InternalFrame(object):
 
         reset_index = pdf.reset_index()
         reset_index.columns = index_columns + data_columns
+        nullables = reset_index.isnull().any()
         schema = StructType([StructField(name, infer_pd_series_spark_type(col),
-                                         nullable=bool(col.isnull().any()))
-                             for name, col in reset_index.iteritems()])
-        for name, col in reset_index.iteritems():
-            dt = col.dtype
-            if is_datetime64_dtype(dt) or is_datetime64tz_dtype(dt):
-                continue
-            reset_index[name] = col.replace({np.nan: None})
-        sdf = default_session().createDataFrame(reset_index, schema=schema)
+                                         nullable=bool(nullable))
+                             for (name, col), nullable in zip(reset_index.iteritems(), nullables)])
+        sdf = _InternalFrame._create_spark_dataframe(reset_index, schema)
         return _InternalFrame(sdf=sdf, index_map=index_map, data_columns=data_columns,
                               column_index=column_index, column_index_names=column_index_names)
+
+    @staticmethod
+    def _create_spark_dataframe(pdf: pd.DataFrame, schema: StructType) -> spark.DataFrame:
+        """ Create a Spark DataFrame from pandas DataFrame, treating NaN as null.
+
+        If Arrow is enabled in the session, the pandas DataFrame is passed to `createDataFrame`
+        as is, since Arrow takes the null mask from NaN. Spark's fallback to the conversion
+        without Arrow, which would keep NaN, is disabled during the call. If Arrow cannot
+        convert it, or Arrow is disabled, NaN is replaced by None, which Spark converts to null
+        without Arrow.
+
+        :param pdf: :class:`pd.DataFrame`
+        :param schema: the Spark schema of the created Spark DataFrame.
+        :return: the created Spark DataFrame
+        """
+        session = default_session()
+        arrow_enabled = session.conf.get("spark.sql.execution.arrow.enabled", "false")
+        # Spark 2.3 always falls back without Arrow when Arrow fails.
+        if (len(pdf) > 0 and arrow_enabled.lower() == "true"
+                and LooseVersion(pyspark.__version__) >= LooseVersion("2.4")):
+            fallback_key = "spark.sql.execution.arrow.fallback.enabled"
+            fallback = session.conf.get(fallback_key, None)
+            session.conf.set(fallback_key, "false")
+            try:
+                return session.createDataFrame(pdf, schema=schema)
+            except (ImportError, TypeError, ValueError, NotImplementedError) as e:
+                # pyarrow is missing or older than required, or Arrow cannot convert the values
+                # or types. Arrow's conversion errors subclass these.
+                logger.warning("Arrow cannot create the Spark DataFrame; creating it without "
+                               "Arrow instead: %s", e)
+            finally:
+                if fallback is None:
+                    session.conf.unset(fallback_key)
+                else:
+                    session.conf.set(fallback_key, fallback)
+
+        replaced = pdf.copy(deep=False)
+        for name, col in pdf.iteritems():
+            dt = col.dtype
+            if (not schema[name].nullable or
+                    is_datetime64_dtype(dt) or is_datetime64tz_dtype(dt)):
+                continue
+            replaced[name] = col.replace({np.nan: None})
+        return session.createDataFrame(replaced, schema=schema)
+
+
+def _rows_to_pandas(rows: List[spark.Row], schema: StructType) -> pd.DataFrame:
+    """
+    Convert the collected rows to pandas DataFrame with the dtypes corresponding to the schema.
+
+    Integral and boolean columns which contain nulls are kept as inferred by pandas, as
+    `toPandas` does without Arrow.
+    """
+    pdf = pd.DataFrame.from_records(rows, columns=schema.names)
+    for field in schema:
+        if isinstance(field.dataType, TimestampType):
+            pdf[field.name] = pd.to_datetime(pdf[field.name])
+        elif isinstance(field.dataType, (NumericType, BooleanType)):
+            if (isinstance(field.dataType, (IntegralType, BooleanType))
+                    and pdf[field.name].isnull().any()):
+                continue
+            try:
+                dtype = to_arrow_type(field.dataType).to_pandas_dtype()
+            except TypeError:
+                continue
+            pdf[field.name] = pdf[field.name].astype(dtype, copy=False)
+    return pdf
+
+
+def _pandas_to_rows(pdf: pd.DataFrame, schema: StructType) -> List[tuple]:
+    """
+    Convert pandas DataFrame to the rows of Python objects following the schema, treating NaN as
+    null, to create a Spark DataFrame from them. This is the inverse of `_rows_to_pandas`.
+    """
+    columns = []
+    for i, field in enumerate(schema):
+        col = pdf.iloc[:, i]
+        if isinstance(field.dataType, IntegralType):
+            convert = int
+        elif isinstance(field.dataType, (FloatType, DoubleType)):
+            convert = float
+        else:
+            convert = lambda value: value
+        columns.append([None if null else convert(value)
+                        for null, value in zip(col.isnull().values, col.astype(object).values)])
+    return list(zip(*columns))
+
+
+class _VirtualIndex(object):
+    """
+    The default index which is attached to the Spark DataFrame only when an operation needs it.
+
+    The attached Spark DataFrame is shared by all the copies of `_InternalFrame` so that the
+    index column is resolved to the same one in all of them.
+
+    :ivar sdf: Spark DataFrame without the default index.
+    :ivar indexed_sdf: Spark DataFrame with the default index attached.
+    """
+
+    def __init__(self, sdf_or_parent: Union[spark.DataFrame, '_VirtualIndex'],
+                 default_index_type: Optional[str] = None,
+                 pred: Optional[spark.Column] = None) -> None:
+        """
+        :param sdf_or_parent: Spark DataFrame to attach the default index, or the parent virtual
+                              index to be filtered by `pred`.
+        :param default_index_type: the default index type to attach.
+        :param pred: the predicate to filter the parent virtual index.
+        """
+        if isinstance(sdf_or_parent, _VirtualIndex):
+            assert pred is not None
+            self._parent = sdf_or_parent  # type: Optional[_VirtualIndex]
+            self._sdf = sdf_or_parent.sdf.filter(pred)
+        else:
+            assert pred is None
+            self._parent = None
+            self._sdf = sdf_or_parent
+        self._default_index_type = default_index_type
+        self._pred = pred
+
+    @property
+    def sdf(self) -> spark.DataFrame:
+        return self._sdf
+
+    @property
+    def is_attached(self) -> bool:
+        if self._parent is not None:
+            return self._parent.is_attached
+        else:
+            return hasattr(self, '_lazy_indexed_sdf')
+
+    @lazy_property
+    def indexed_sdf(self) -> spark.DataFrame:
+        if self._parent is not None:
+            return self._parent.indexed_sdf.filter(self._pred)
+        else:
+            return _InternalFrame.attach_default_index(self._sdf, self._default_index_type)
+
+
+class _KeyIndex(object):
+    """
+    The lookup structure of the partitions by the index values, built by `DataFrame.create_index`.
+
+    The Spark DataFrame is range-partitioned and sorted by the index, and persisted. The minimum
+    and maximum index values of each partition are kept in the driver so that looking up labels
+    reads only the partitions whose ranges contain them.
+
+    :ivar sdf: the persisted Spark DataFrame.
+    :ivar index_column: the index field name.
+    """
+
+    def __init__(self, sdf: spark.DataFrame, index_column: str) -> None:
+        self._sdf = sdf
+        self._index_column = index_column
+
+        # The partition IDs are the ones of the persisted data since nothing is shuffled before
+        # the aggregation. NaN is excluded since Spark orders it after all the other values.
+        scol = scol_for(sdf, index_column)
+        if isinstance(sdf.schema[index_column].dataType, (FloatType, DoubleType)):
+            scol = F.when(~F.isnan(scol), scol)
+        # This also materializes the persisted data.
+        bounds = sdf.groupby(F.spark_partition_id().alias('partition_id')) \
+            .agg(F.min(scol).alias('lower'), F.max(scol).alias('upper')) \
+            .where(F.col('lower').isNotNull()).collect()
+        self._bounds = sorted((row['partition_id'], row['lower'], row['upper'])
+                              for row in bounds)
+
+    @property
+    def sdf(self) -> spark.DataFrame:
+        return self._sdf
+
+    @property
+    def index_column(self) -> str:
+        return self._index_column
+
+    def partitions_for(self, keys: List) -> Optional[List[int]]:
+        """
+        Return the ids of the partitions which may contain any of the given keys, or None if
+        the keys cannot be looked up with this index, e.g., when the Spark DataFrame is not
+        persisted anymore or the keys are not of the types comparable with the index values.
+        """
+        if not self._sdf.is_cached:
+            return None
+        spark_type = self._sdf.schema[self._index_column].dataType
+        if isinstance(spark_type, (IntegralType, FloatType, DoubleType)):
+            types = (int, float, np.integer, np.floating)
+        elif isinstance(spark_type, StringType):
+            types = (str,)
+        else:
+            return None
+        if not all(isinstance(key, types) and not isinstance(key, (bool, np.bool_))
+                   and key == key for key in keys):
+            return None
+        return [partition_id for partition_id, lower, upper in self._bounds
+                if any(lower <= key <= upper for key in keys)]
+
+    def lookup(self, keys: List, columns: List[str]) -> Optional[pd.DataFrame]:
+        """
+        Return pandas DataFrame of the given columns of the rows whose index values are any of
+        the given keys, reading only the partitions which may contain them. Returns None if the
+        keys cannot be looked up with this index.
+        """
+        partitions = self.partitions_for(keys)
+        if partitions is None:
+            return None
+        schema = StructType([self._sdf.schema[column] for column in columns])
+        if len(partitions) == 0:
+            return _rows_to_pandas([], schema)
+
+        # The rows are filtered in the JVM, with the in-memory batches pruned by their
+        # statistics, and only the matched rows are sent to Python. The filter does not change
+        # the partitions, so the job runs only on the partitions which may contain the keys.
+        keys = [key.item() if isinstance(key, np.generic) else key for key in keys]
+        sdf = self._sdf.where(scol_for(self._sdf, self._index_column).isin(keys)) \
+            .select([scol_for(self._sdf, column) for column in columns])
+        rdd = sdf.rdd
+        rows = rdd.context.runJob(rdd, lambda rows: list(rows), partitions)
+        return _rows_to_pandas(rows, schema)
@@ -41,8 +41,6 @@ class _MissingPandasLikeDataFrame(object):
     ix = unsupported_property('ix', deprecated=True)
 
     # Functions
-    agg = unsupported_function('agg')
-    aggregate = unsupported_function('aggregate')
     align = unsupported_function('align')
     apply = unsupported_function('apply')
     asfreq = unsupported_function('asfreq')
@@ -97,7 +95,6 @@ class _MissingPandasLikeDataFrame(object):
     stack = unsupported_function('stack')
     swapaxes = unsupported_function('swapaxes')
     swaplevel = unsupported_function('swaplevel')
-    tail = unsupported_function('tail')
     take = unsupported_function('take')
     to_feather = unsupported_function('to_feather')
     to_gbq = unsupported_function('to_gbq')
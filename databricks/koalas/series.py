@@ -29,7 +29,8 @@ from pandas.core.accessor import CachedAccessor
 
 from pyspark import sql as spark
 from pyspark.sql import functions as F, Column
-from pyspark.sql.types import BooleanType, StructType
+from pyspark.sql.types import BooleanType, DateType, NumericType, StringType, StructType, \
+    TimestampType
 from pyspark.sql.window import Window
 
 from databricks import koalas as ks  # For running doctests and reference resolution in PyCharm.
@@ -351,7 +352,7 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
     @property
     def spark_type(self):
         """ Returns the data type as defined by Spark, as a Spark DataType object."""
-        return self.schema.fields[-1].dataType
+        return self._internal.index_agnostic_sdf.select(self._scol).schema.fields[-1].dataType
 
     plot = CachedAccessor("plot", KoalasSeriesPlotMethods)
 
@@ -1197,6 +1198,9 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         3    0.2
         Name: dogs, dtype: float64
         """
+        batch_rows = get_option("compute.to_pandas_batch_rows")
+        if batch_rows is not None:
+            return _col(self._internal.bounded_pandas_df(batch_rows))
         return _col(self._internal.pandas_df.copy())
 
     # Alias to maintain backward compatibility with Spark
@@ -1222,9 +1226,10 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         """Fill NA/NaN values.
 
         .. note:: the current implementation of 'method' parameter in fillna uses Spark's Window
-            without specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            without specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is filled per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine.
 
         Parameters
         ----------
@@ -1338,9 +1343,14 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
                 else:
                     end = Window.unboundedFollowing
 
-            window = Window.partitionBy(*part_cols).orderBy(self._internal.index_scols)\
-                .rowsBetween(begin, end)
-            scol = F.when(scol.isNull(), func(scol, True).over(window)).otherwise(scol)
+            filled = None
+            if len(part_cols) == 0:
+                filled = self._fill_by_ranges(func, begin, end, limit)
+            if filled is None:
+                window = Window.partitionBy(*part_cols).orderBy(self._internal.index_scols)\
+                    .rowsBetween(begin, end)
+                filled = func(scol, True).over(window)
+            scol = F.when(scol.isNull(), filled).otherwise(scol)
         kseries = self._with_new_scol(scol).rename(column_name)
         if inplace:
             self._internal = kseries._internal
@@ -1348,6 +1358,63 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         else:
             return kseries
 
+    def _fill_by_ranges(self, func, begin, end, limit):
+        """
+        Returns the Spark Column of the values `func` takes over the rows between `begin` and
+        `end` per range of the index given by `_InternalFrame.ordered_ranges` in parallel, or
+        None if the data fits in a single range.
+
+        First, the last non-null value of each range, or the first one for backward fills,
+        and the number of the nulls after it, or before it, are collected. Then, the nulls
+        which have no non-null value to take within their range take the value carried from
+        the preceding ranges, or the following ranges, as far as `limit` allows.
+        """
+        spark_type = self.spark_type
+        if not isinstance(spark_type,
+                          (NumericType, StringType, BooleanType, DateType, TimestampType)):
+            return None
+        index_scols = self._internal.index_scols
+        ranges = self._internal.ordered_ranges(index_scols)
+        if ranges is None:
+            return None
+        range_scol, num_ranges = ranges
+        forward = func == F.last
+
+        # `position` is the position of each row from the side of its range which the values
+        # are carried to, that is, from the start for forward fills and from the end otherwise.
+        order = index_scols if forward else [scol.desc() for scol in index_scols]
+        position = F.row_number().over(Window.partitionBy(range_scol).orderBy(order))
+
+        # The non-null value of each range which is the farthest from that side, and its
+        # position, so that the nulls after it are counted by `count - position`.
+        sdf = self._internal.sdf.select(range_scol.alias('range'), position.alias('position'),
+                                        self._scol.alias('value'))
+        edge = F.when(F.col('value').isNotNull(), F.struct('position', 'value'))
+        stats = dict((row['range'], (row['count'], row['edge'])) for row in sdf.groupby('range')
+                     .agg(F.count(F.lit(1)).alias('count'), F.max(edge).alias('edge')).collect())
+
+        carried = []
+        value, gap = None, 0
+        for i in (range(num_ranges) if forward else reversed(range(num_ranges))):
+            carried.append((value, gap))
+            count, edge = stats.get(i, (0, None))
+            if edge is None:
+                gap += count
+            else:
+                value, gap = edge['value'], count - edge['position']
+        if not forward:
+            carried.reverse()
+
+        carried_scol = F.array(*[F.lit(value).cast(spark_type) for value, _ in carried])
+        leading_window = Window.partitionBy(range_scol).orderBy(order) \
+            .rowsBetween(Window.unboundedPreceding, Window.currentRow)
+        cond = F.count(self._scol).over(leading_window) == 0
+        if limit is not None:
+            reach_scol = F.array(*[F.lit(limit - gap) for _, gap in carried])
+            cond = cond & (position <= reach_scol[range_scol])
+        window = Window.partitionBy(range_scol).orderBy(index_scols).rowsBetween(begin, end)
+        return F.when(cond, carried_scol[range_scol]).otherwise(func(self._scol, True).over(window))
+
     def dropna(self, axis=0, inplace=False, **kwargs):
         """
         Return a new Series with missing values removed.
@@ -1458,6 +1525,34 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         """
         return _col(self.to_dataframe().head(n))
 
+    def tail(self, n=5):
+        """
+        Return the last `n` rows.
+
+        This function returns last `n` rows from the object based on position. For negative
+        values of `n`, this function returns all rows except the first `n` rows.
+
+        .. note:: The partitions are scanned from the last one until `n` rows are collected,
+            see `DataFrame.tail`.
+
+        Parameters
+        ----------
+        n : Integer, default =  5
+
+        Returns
+        -------
+        The last `n` rows of the caller object.
+
+        Examples
+        --------
+        >>> df = ks.DataFrame({'animal':['alligator', 'bee', 'falcon', 'lion']})
+        >>> df.animal.tail(2)  # doctest: +NORMALIZE_WHITESPACE
+        2    falcon
+        3      lion
+        Name: animal, dtype: object
+        """
+        return _col(self.to_dataframe().tail(n))
+
     # TODO: Categorical type isn't supported (due to PySpark's limitation) and
     # some doctests related with timestamps were not added.
     def unique(self):
@@ -1951,7 +2046,7 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         c = df.corr(method=method)
         return c.loc["corr_arg1", "corr_arg2"]
 
-    def nsmallest(self, n: int = 5) -> 'Series':
+    def nsmallest(self, n: int = 5, keep: str = 'first') -> 'Series':
         """
         Return the smallest `n` elements.
 
@@ -1959,6 +2054,9 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         ----------
         n : int, default 5
             Return this many ascending sorted values.
+        keep : {'first'}, default 'first'
+            When there are duplicate values, take the first occurrences. 'last' and 'all'
+            are not supported yet.
 
         Returns
         -------
@@ -1974,9 +2072,7 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         Notes
         -----
         Faster than ``.sort_values().head(n)`` for small `n` relative to
-        the size of the ``Series`` object.
-        In Koalas, thanks to Spark's lazy execution and query optimizer,
-        the two would have same performance.
+        the size of the ``Series`` object, see `DataFrame.nsmallest`.
 
         Examples
         --------
@@ -2009,15 +2105,18 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         2    3.0
         Name: 0, dtype: float64
         """
-        return _col(self._kdf.nsmallest(n=n, columns=self.name))
+        return _col(self.to_dataframe().nsmallest(n=n, columns=self.name, keep=keep))
 
-    def nlargest(self, n: int = 5) -> 'Series':
+    def nlargest(self, n: int = 5, keep: str = 'first') -> 'Series':
         """
         Return the largest `n` elements.
 
         Parameters
         ----------
         n : int, default 5
+        keep : {'first'}, default 'first'
+            When there are duplicate values, take the first occurrences. 'last' and 'all'
+            are not supported yet.
 
         Returns
         -------
@@ -2033,10 +2132,7 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         Notes
         -----
         Faster than ``.sort_values(ascending=False).head(n)`` for small `n`
-        relative to the size of the ``Series`` object.
-
-        In Koalas, thanks to Spark's lazy execution and query optimizer,
-        the two would have same performance.
+        relative to the size of the ``Series`` object, see `DataFrame.nlargest`.
 
         Examples
         --------
@@ -2071,7 +2167,7 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
 
 
         """
-        return _col(self._kdf.nlargest(n=n, columns=self.name))
+        return _col(self.to_dataframe().nlargest(n=n, columns=self.name, keep=keep))
 
     def count(self):
         """
@@ -2506,9 +2602,10 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         assigned a rank that is the average of the ranks of those values.
 
         .. note:: the current implementation of rank uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the values in
+            parallel, otherwise all data is moved into single partition in single
+            machine.
 
         Parameters
         ----------
@@ -2587,6 +2684,11 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         index_column = self._internal.index_columns[0]
         column_name = self.name
 
+        if len(part_cols) == 0:
+            ranges = self._internal.ordered_ranges([self._scol])
+            if ranges is not None:
+                return self._rank_by_ranges(method, ascending, *ranges)
+
         if method == 'first':
             window = Window.orderBy(
                 asc_func(column_name), asc_func(index_column)
@@ -2613,8 +2715,61 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         kser = self._with_new_scol(scol).rename(column_name)
         return kser.astype(np.float64)
 
-    def describe(self, percentiles: Optional[List[float]] = None) -> 'Series':
-        return _col(self.to_dataframe().describe(percentiles))
+    def _rank_by_ranges(self, method, ascending, range_scol, num_ranges):
+        """
+        Computes `_rank` per range of the values given by `_InternalFrame.ordered_ranges` in
+        parallel. The same values are always in the same range, so the ties are resolved within
+        each range. The number of rows of each range, or of distinct values for 'dense', is
+        collected, and the ranks within each range are offset by those of the preceding ranges.
+        """
+        scol = self._scol
+        if ascending:
+            ordered = lambda scol: scol.asc()
+        else:
+            ordered = lambda scol: scol.desc()
+
+        counts = self._internal.sdf.groupby(range_scol.alias('range')).agg(
+            F.count(F.lit(1)).alias('count'),
+            (F.countDistinct(scol) + F.max(scol.isNull()).cast('int')).alias('distinct'))
+        counts = dict((row['range'], row['distinct'] if method == 'dense' else row['count'])
+                      for row in counts.collect())
+
+        # The ranges ascend with the values, where nulls come first as `asc` does, so they are
+        # in the reversed order for `desc`, where nulls come last.
+        offsets = [0] * num_ranges
+        offset = 0
+        for i in range(num_ranges) if ascending else reversed(range(num_ranges)):
+            offsets[i] = offset
+            offset += counts.get(i, 0)
+        offset_scol = F.array(*[F.lit(value) for value in offsets])[range_scol]
+
+        if method == 'first':
+            window = Window.partitionBy(range_scol) \
+                .orderBy(ordered(scol), ordered(self._internal.index_scols[0])) \
+                .rowsBetween(Window.unboundedPreceding, Window.currentRow)
+            rank = F.row_number().over(window)
+        elif method == 'dense':
+            window = Window.partitionBy(range_scol).orderBy(ordered(scol)) \
+                .rowsBetween(Window.unboundedPreceding, Window.currentRow)
+            rank = F.dense_rank().over(window)
+        else:
+            if method == 'average':
+                stat_func = F.mean
+            elif method == 'min':
+                stat_func = F.min
+            elif method == 'max':
+                stat_func = F.max
+            window1 = Window.partitionBy(range_scol).orderBy(ordered(scol)) \
+                .rowsBetween(Window.unboundedPreceding, Window.currentRow)
+            window2 = Window.partitionBy(range_scol, scol) \
+                .rowsBetween(Window.unboundedPreceding, Window.unboundedFollowing)
+            rank = stat_func(F.row_number().over(window1)).over(window2)
+        kser = self._with_new_scol(offset_scol + rank).rename(self.name)
+        return kser.astype(np.float64)
+
+    def describe(self, percentiles: Optional[List[float]] = None,
+                 accuracy: int = 10000) -> 'Series':
+        return _col(self.to_dataframe().describe(percentiles, accuracy))
 
     describe.__doc__ = DataFrame.describe.__doc__
 
@@ -2626,9 +2781,11 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
         DataFrame (default is the element in the same column of the previous row).
 
         .. note:: the current implementation of diff uses Spark's Window without
-            specifying partition specification. This leads to move all data into
-            single partition in single machine and could cause serious
-            performance degradation. Avoid this method against very large dataset.
+            specifying partition specification. When the data has more rows than
+            'compute.ordered_window_rows' if set, it is computed per range of the index in
+            parallel, otherwise all data is moved into single partition in single
+            machine. Note that the 'sequence' default index still moves all data
+            into single partition to be attached.
 
         Parameters
         ----------
@@ -2689,9 +2846,7 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
     def _diff(self, periods, part_cols=()):
         if not isinstance(periods, int):
             raise ValueError('periods should be an int; however, got [%s]' % type(periods))
-        window = Window.partitionBy(*part_cols).orderBy(self._internal.index_scols)\
-            .rowsBetween(-periods, -periods)
-        scol = self._scol - F.lag(self._scol, periods).over(window)
+        scol = self._scol - self._lag(periods, part_cols)
         return self._with_new_scol(scol).rename(self.name)
 
     def idxmax(self, skipna=True):
@@ -2882,6 +3037,11 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
 
         column_name = self.name
 
+        if len(part_cols) == 0:
+            ranges = self._internal.ordered_ranges(self._internal.index_scols)
+            if ranges is not None:
+                return self._cum_by_ranges(func, skipna, *ranges)
+
         if skipna:
             # There is a behavior difference between pandas and PySpark. In case of cummax,
             #
@@ -2956,6 +3116,55 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
 
         return self._with_new_scol(scol).rename(column_name)
 
+    def _cum_by_ranges(self, func, skipna, range_scol, num_ranges):
+        """
+        Computes `_cum` per range of the index given by `_InternalFrame.ordered_ranges` in
+        parallel. First, the aggregate of each range and whether it has nulls are collected.
+        Then, the aggregates of the preceding ranges are combined with the cumulative values
+        within each range.
+        """
+        window = Window.partitionBy(range_scol).orderBy(self._internal.index_scols) \
+            .rowsBetween(Window.unboundedPreceding, Window.currentRow)
+
+        totals = self._internal.sdf.groupby(range_scol.alias('range')).agg(
+            func(self._scol).alias('total'), F.max(self._scol.isNull()).alias('has_null'))
+        total_type = totals.schema['total'].dataType
+        totals = dict((row['range'], (row['total'], row['has_null'])) for row in totals.collect())
+
+        if func == F.max:
+            combine, combine_scol = max, F.greatest
+        elif func == F.min:
+            combine, combine_scol = min, F.least
+        else:
+            # cumsum, and cumprod which sums the logarithms.
+            combine, combine_scol = (lambda x, y: x + y), (lambda x, y: x + F.coalesce(y, F.lit(0)))
+
+        carried = []
+        carried_null = []
+        total = None
+        has_null = False
+        for i in range(num_ranges):
+            carried.append(F.lit(total).cast(total_type))
+            carried_null.append(F.lit(has_null))
+            range_total, range_has_null = totals.get(i, (None, False))
+            if range_total is not None:
+                total = range_total if total is None else combine(total, range_total)
+            has_null = has_null or range_has_null
+
+        scol = combine_scol(func(self._scol).over(window), F.array(*carried)[range_scol])
+        if skipna:
+            scol = F.when(self._scol.isNull(), F.lit(None)).otherwise(scol)
+        else:
+            scol = F.when(
+                F.max(self._scol.isNull()).over(window) | F.array(*carried_null)[range_scol],
+                F.lit(None)
+            ).otherwise(scol)
+
+        if func.__name__ == "cumprod":
+            scol = F.exp(scol)
+
+        return self._with_new_scol(scol).rename(self.name)
+
     # ----------------------------------------------------------------------
     # Accessor Methods
     # ----------------------------------------------------------------------
@@ -2993,7 +3202,7 @@ class Series(_Frame, IndexOpsMixin, Generic[T]):
             assert num_args == 2
             # Pass in both the column and its data type if sfun accepts two args
             col_sdf = sfun(col_sdf, col_type)
-        return _unpack_scalar(self._kdf._sdf.select(col_sdf))
+        return _unpack_scalar(self._kdf._internal.index_agnostic_sdf.select(col_sdf))
 
     def __len__(self):
         return len(self.to_dataframe())
@@ -95,3 +95,14 @@ class ConfigTest(ReusedSQLTestCase):
 
         with self.assertRaisesRegex(config.OptionError, "test.config"):
             ks.reset_option('unknown')
+
+    def test_cache_info(self):
+        ks.config.clear_cache('compute.index_cache_size')
+        info = ks.config.cache_info('compute.index_cache_size')
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+        with self.assertRaisesRegex(config.OptionError, "No such cache"):
+            ks.config.cache_info('unknown')
+
+        with self.assertRaisesRegex(config.OptionError, "Available caches"):
+            ks.config.clear_cache('unknown')
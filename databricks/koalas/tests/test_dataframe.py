@@ -254,6 +254,50 @@ class DataFrameTest(ReusedSQLTestCase, SQLTestUtils):
             kdf = ks.from_pandas(pdf)
             self.assert_eq(kdf, pdf)
 
+    def test_from_pandas_nan_as_null(self):
+        pdf = pd.DataFrame({'a': [1.0, np.nan, 3.0], 'b': [1, 2, 3]})
+
+        with self.sql_conf({'spark.sql.execution.arrow.enabled': False}):
+            kdf = ks.from_pandas(pdf)
+            self.assertEqual(
+                self.spark.conf.get('spark.sql.execution.arrow.enabled'), 'false')
+
+        sdf = kdf.to_spark()
+        self.assertEqual(sdf.filter(sdf.a.isNull()).count(), 1)
+        self.assertEqual([field.nullable for field in sdf.schema], [True, False])
+        self.assert_eq(kdf, pdf)
+
+        # The session configurations are left alone.
+        with self.sql_conf({'spark.sql.execution.arrow.fallback.enabled': True}):
+            kdf = ks.from_pandas(pdf)
+            self.assertEqual(
+                self.spark.conf.get('spark.sql.execution.arrow.fallback.enabled'), 'true')
+        self.assert_eq(kdf, pdf)
+
+    def test_to_pandas_iter(self):
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5], 'b': [1.0, np.nan, 3.0, 4.0, 5.0],
+                            'c': [True, False, None, True, False]},
+                           index=list('vwxyz'))
+        kdf = ks.from_pandas(pdf)
+
+        pdfs = list(kdf.to_pandas_iter(batch_rows=2))
+        self.assertEqual([len(p) for p in pdfs], [2, 2, 1])
+        self.assert_eq(pd.concat(pdfs), pdf)
+
+        self.assertEqual(list(kdf[kdf.a > 10].to_pandas_iter()), [])
+        self.assertRaises(ValueError, lambda: kdf.to_pandas_iter(batch_rows=0))
+
+        set_option('compute.to_pandas_batch_rows', 2)
+        try:
+            self.assert_eq(kdf.to_pandas(), pdf)
+            self.assert_eq(kdf.a.to_pandas(), pdf.a)
+            self.assert_eq(kdf[kdf.a > 10].to_pandas(), pdf[pdf.a > 10])
+            self.assert_eq(kdf.set_index('a', append=True).to_pandas(),
+                           pdf.set_index('a', append=True))
+        finally:
+            reset_option('compute.to_pandas_batch_rows')
+        self.assertRaises(ValueError, lambda: set_option('compute.to_pandas_batch_rows', True))
+
     def test_assign(self):
         kdf = self.kdf.copy()
         pdf = self.pdf.copy()
@@ -284,6 +328,23 @@ class DataFrameTest(ReusedSQLTestCase, SQLTestUtils):
         self.assert_eq(kdf.head(2), pdf.head(2))
         self.assert_eq(kdf.head(3), pdf.head(3))
 
+        self.assert_eq(kdf.tail(2), pdf.tail(2))
+        self.assert_eq(kdf.tail(3), pdf.tail(3))
+        self.assert_eq(kdf.tail(0), pdf.tail(0))
+        self.assert_eq(kdf.tail(-3), pdf.tail(-3))
+        self.assert_eq(kdf.tail(100), pdf.tail(100))
+
+        # The trailing rows are collected across several partitions, some of which are empty.
+        pdf = pd.DataFrame({'a': range(30), 'b': [str(i) for i in range(30)]},
+                           index=np.random.rand(30))
+        kdf = ks.from_pandas(pdf)
+        kdf = ks.DataFrame(kdf._internal.copy(sdf=kdf._sdf.repartition(40)))
+        expected = kdf.to_pandas()
+        for n in [1, 5, 17, 29, 30, 31, np.int64(7), np.int32(-3)]:
+            self.assert_eq(kdf.tail(n), expected.tail(n))
+        with self.assertRaisesRegex(TypeError, 'n must be an integer'):
+            kdf.tail('1')
+
     def test_attributes(self):
         kdf = self.kdf
 
@@ -515,6 +576,55 @@ class DataFrameTest(ReusedSQLTestCase, SQLTestUtils):
         self.assert_eq(ks.DataFrame({'A': range(100)}).nunique(approx=True, rsd=0.01),
                        pd.Series([100], index=['A'], name='0'))
 
+    def test_describe(self):
+        # Nine non-null values per column so that the exact percentiles are values of the column.
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, 6, 7, 8, 9, np.nan],
+                            'b': [0.5, np.nan, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5],
+                            'c': ['x', 'y', 'x', None, 'x', 'y', 'z', 'x', 'y', 'x']},
+                           columns=['a', 'b', 'c'])
+        kdf = ks.from_pandas(pdf)
+
+        self.assert_eq(kdf.describe(), pdf.describe())
+        self.assert_eq(kdf.a.describe(), pdf.a.describe())
+        self.assert_eq(kdf.describe(percentiles=[0.1, 0.9], accuracy=100000).loc[['10%', '90%']],
+                       pd.DataFrame({'a': [1.0, 9.0], 'b': [0.5, 8.5]}, index=['10%', '90%'],
+                                    columns=['a', 'b']))
+
+        self.assert_eq(kdf[['c']].describe(),
+                       pd.DataFrame({'c': ['9', '3', 'x', '5']},
+                                    index=['count', 'unique', 'top', 'freq']))
+
+        kdf = ks.DataFrame({'t': pd.to_datetime(['2019-01-01', '2019-01-02', '2019-01-02'])})
+        self.assert_eq(kdf.describe(),
+                       pd.DataFrame({'t': ['3', '2', '2019-01-02 00:00:00', '2',
+                                           '2019-01-01 00:00:00', '2019-01-02 00:00:00']},
+                                    index=['count', 'unique', 'top', 'freq', 'first', 'last']))
+
+        with self.assertRaisesRegex(ValueError, "accuracy must be an integer"):
+            kdf.describe(accuracy=0.1)
+
+    def test_aggregate(self):
+        pdf = pd.DataFrame({'A': [1, 2, 3, 4],
+                            'B': [0.362, 0.227, np.nan, -0.562]},
+                           columns=['A', 'B'])
+        kdf = ks.from_pandas(pdf)
+
+        self.assert_eq(kdf.agg(['sum', 'min', 'max', 'count']),
+                       pdf.agg(['sum', 'min', 'max', 'count']))
+        self.assert_eq(kdf.agg({'A': ['sum', 'max'], 'B': ['min', 'max']}).sort_index(),
+                       pdf.agg({'A': ['sum', 'max'], 'B': ['min', 'max']}).sort_index())
+        self.assert_eq(kdf.agg({'A': 'sum', 'B': 'min'}).sort_index(),
+                       pdf.agg({'A': 'sum', 'B': 'min'}).sort_index())
+        self.assert_eq(kdf.agg({'A': ['nunique']}), pd.DataFrame({'A': [4]}, index=['nunique']))
+        self.assert_eq(kdf.agg({'A': 'max'}), pdf.agg({'A': 'max'}))
+        self.assertEqual(kdf.agg(['sum', 'min']).dtypes.tolist(),
+                         pdf.agg(['sum', 'min']).dtypes.tolist())
+
+        with self.assertRaisesRegex(ValueError, "should only contains function names"):
+            kdf.agg([np.sum])
+        with self.assertRaisesRegex(ValueError, "aggs must be a dict mapping"):
+            kdf.agg(0)
+
     def test_sort_values(self):
         pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, None, 7],
                             'b': [7, 6, 5, 4, 3, 2, 1]})
@@ -585,6 +695,37 @@ class DataFrameTest(ReusedSQLTestCase, SQLTestUtils):
         self.assert_eq(kdf.nsmallest(n=5, columns='a'), pdf.nsmallest(5, columns='a'))
         self.assert_eq(kdf.nsmallest(n=5, columns=['a', 'b']), pdf.nsmallest(5, columns=['a', 'b']))
 
+    def test_nlargest_nsmallest_keep_first(self):
+        pdf = pd.DataFrame({'a': [i % 5 for i in range(40)],
+                            'b': [i % 3 for i in range(40)],
+                            'c': [str(i) for i in range(40)]},
+                           index=np.random.rand(40))
+        kdf = ks.from_pandas(pdf)
+
+        # The top-k operator for small n, and the sort otherwise.
+        for limit in [1000, 0]:
+            set_option('compute.shortcut_limit', limit)
+            try:
+                for n in [1, 3, 10]:
+                    self.assert_eq(kdf.nlargest(n, 'a'), pdf.nlargest(n, 'a'))
+                    self.assert_eq(kdf.nsmallest(n, 'a'), pdf.nsmallest(n, 'a'))
+                    self.assert_eq(kdf.a.nlargest(n), pdf.a.nlargest(n))
+                    self.assert_eq(kdf.a.nsmallest(n), pdf.a.nsmallest(n))
+                    self.assert_eq(kdf.nlargest(n, ['a', 'b']),
+                                   pdf.sort_values(['a', 'b'], ascending=False,
+                                                   kind='mergesort').head(n))
+                    self.assert_eq(kdf.nsmallest(n, ['b', 'a'], keep='first'),
+                                   pdf.sort_values(['b', 'a'], kind='mergesort').head(n))
+            finally:
+                reset_option('compute.shortcut_limit')
+
+        with self.assertRaisesRegex(ValueError, 'keep must be either'):
+            kdf.nlargest(3, 'a', keep='middle')
+        with self.assertRaisesRegex(NotImplementedError, "only for 'first'"):
+            kdf.nsmallest(3, 'a', keep='last')
+        with self.assertRaisesRegex(NotImplementedError, "only for 'first'"):
+            kdf.a.nlargest(3, keep='all')
+
     def test_missing(self):
         kdf = self.kdf
 
@@ -800,6 +941,64 @@ class DataFrameTest(ReusedSQLTestCase, SQLTestUtils):
                                     'Cannot resolve column name "`id`"'):
             left.merge(right, on='id')
 
+    def test_merge_broadcast(self):
+        from databricks.koalas.internal import _InternalFrame
+
+        left_pdf = pd.DataFrame({'key': [1, 2, 3, 4, 5], 'x': [1.0, 2.0, 3.0, 4.0, 5.0]})
+        right_pdf = pd.DataFrame({'key': [2, 3, 4, 6], 'y': [6.0, 7.0, 8.0, 9.0]})
+        left_kdf = ks.from_pandas(left_pdf)
+        right_kdf = ks.from_pandas(right_pdf)
+
+        def check(how, broadcast, message):
+            with self.assertLogs('databricks.koalas.frame', level='INFO') as cm:
+                kdf = left_kdf.merge(right_kdf, on='key', how=how, broadcast=broadcast)
+            self.assertTrue(any(message in output for output in cm.output), cm.output)
+            plan = kdf._sdf._jdf.queryExecution().executedPlan().toString()
+            if 'broadcasts the' in message:
+                self.assertIn('BroadcastHashJoin', plan)
+            else:
+                self.assertNotIn('BroadcastHashJoin', plan)
+            self.assert_eq(kdf.sort_values('key').reset_index(drop=True),
+                           left_pdf.merge(right_pdf, on='key', how=how)
+                           .sort_values('key').reset_index(drop=True))
+
+        check('inner', False, 'does not broadcast as requested')
+        check('left', True, 'broadcasts the right side')
+        check('right', True, 'broadcasts the left side')
+        check('outer', 'auto', 'does not broadcast')
+
+        # Spark cannot estimate the sizes of the pandas DataFrames converted to Spark.
+        check('inner', 'auto', 'does not broadcast')
+
+        # The row counts cached by Koalas are used without running a Spark job.
+        _InternalFrame._partition_counts(right_kdf._sdf)
+        check('inner', 'auto', 'broadcasts the right side')
+        check('left', 'auto', 'broadcasts the right side')
+        check('right', 'auto', 'does not broadcast')
+
+        set_option('compute.broadcast_join_rows', 3)
+        try:
+            check('inner', 'auto', 'does not broadcast')
+            set_option('compute.broadcast_join_rows', 0)
+            check('inner', 'auto', 'broadcasts the right side')
+        finally:
+            reset_option('compute.broadcast_join_rows')
+
+        # The size in bytes must fit even when the number of rows does.
+        with self.sql_conf({'spark.sql.autoBroadcastJoinThreshold': 10}):
+            check('inner', 'auto', 'does not broadcast')
+        with self.sql_conf({'spark.sql.autoBroadcastJoinThreshold': -1}):
+            check('inner', 'auto', 'does not broadcast')
+
+        self.assert_eq(left_kdf.set_index('key').join(right_kdf.set_index('key'), broadcast=True)
+                       .sort_index(),
+                       left_pdf.set_index('key').join(right_pdf.set_index('key')).sort_index())
+
+        with self.assertRaisesRegex(ValueError, "broadcast=True is not supported"):
+            left_kdf.merge(right_kdf, on='key', how='outer', broadcast=True)
+        with self.assertRaisesRegex(ValueError, "broadcast must be either"):
+            left_kdf.merge(right_kdf, on='key', broadcast='yes')
+
     def test_append(self):
         pdf = pd.DataFrame([[1, 2], [3, 4]], columns=list('AB'))
         kdf = ks.from_pandas(pdf)
@@ -1473,6 +1672,55 @@ class DataFrameTest(ReusedSQLTestCase, SQLTestUtils):
         with self.assertRaisesRegex(ValueError, msg):
             kdf.diff(1.5)
 
+    def test_ordered_windows_by_ranges(self):
+        pdf = pd.DataFrame({'a': [float(i % 7) if i % 5 else np.nan for i in range(100)],
+                            'b': [(i * 37) % 101 for i in range(100)],
+                            'c': [1.0 + (i % 3) / 100 for i in range(100)]},
+                           index=np.arange(100) * 2, columns=['a', 'b', 'c'])
+        kdf = ks.from_pandas(pdf)
+
+        set_option('compute.ordered_window_rows', 10)
+        try:
+            ranges = kdf._internal.ordered_ranges(kdf._internal.index_scols)
+            self.assertIsNotNone(ranges)
+            self.assertEqual(ranges[1], 10)
+
+            for skipna in [True, False]:
+                self.assert_eq(kdf.cummin(skipna=skipna), pdf.cummin(skipna=skipna))
+                self.assert_eq(kdf.cummax(skipna=skipna), pdf.cummax(skipna=skipna))
+                self.assert_eq(kdf.cumsum(skipna=skipna), pdf.cumsum(skipna=skipna))
+                self.assert_eq(kdf[['c']].cumprod(skipna=skipna),
+                               pdf[['c']].cumprod(skipna=skipna), almost=True)
+
+            # The values are carried across several ranges when periods exceed a range.
+            for periods in [1, 3, 25, -1, -12]:
+                self.assert_eq(kdf.shift(periods).sort_index(), pdf.shift(periods))
+                self.assert_eq(kdf.diff(periods).sort_index(), pdf.diff(periods))
+            self.assert_eq(kdf.b.shift(2, fill_value=0).sort_index(),
+                           pdf.b.shift(2, fill_value=0))
+        finally:
+            reset_option('compute.ordered_window_rows')
+
+    def test_fillna_by_ranges(self):
+        # The null runs in 'x' span several ranges.
+        pdf = pd.DataFrame({'x': [np.nan if i < 4 or 15 <= i < 48 or i >= 80 else float(i)
+                                  for i in range(100)],
+                            'y': [np.nan if i % 4 else float(i) for i in range(100)]},
+                           index=np.arange(100) * 2, columns=['x', 'y'])
+        kdf = ks.from_pandas(pdf)
+
+        set_option('compute.ordered_window_rows', 10)
+        try:
+            for limit in [None, 2, 12, 40]:
+                self.assert_eq(kdf.ffill(limit=limit).sort_index(), pdf.ffill(limit=limit))
+                self.assert_eq(kdf.bfill(limit=limit).sort_index(), pdf.bfill(limit=limit))
+                self.assert_eq(kdf.x.fillna(method='pad', limit=limit).sort_index(),
+                               pdf.x.fillna(method='pad', limit=limit))
+                self.assert_eq(kdf.x.fillna(method='backfill', limit=limit).sort_index(),
+                               pdf.x.fillna(method='backfill', limit=limit))
+        finally:
+            reset_option('compute.ordered_window_rows')
+
     def test_duplicated(self):
         pdf = pd.DataFrame({'a': [1, 1, 1, 3], 'b': [1, 1, 1, 4], 'c': [1, 1, 1, 5]})
         kdf = ks.from_pandas(pdf)
@@ -1580,8 +1828,67 @@ class DataFrameTest(ReusedSQLTestCase, SQLTestUtils):
         try:
             self.assert_eq(kdf.transform(lambda x: x + 1).sort_index(),
                            pdf.transform(lambda x: x + 1).sort_index())
+
+            # 'a' and 'c' are transformed by a single evaluation of one fused pandas UDF.
+            plan = kdf[['a', 'c']].transform(lambda x: x + 1)._sdf._jdf.queryExecution() \
+                .executedPlan().toString()
+            self.assertEqual(plan.count('ArrowEvalPython'), 1)
+            self.assertEqual(plan.count('transform_all('), 1)
+
+            set_option("compute.fused_transform", False)
+            self.assert_eq(kdf.transform(lambda x: x + 1).sort_index(),
+                           pdf.transform(lambda x: x + 1).sort_index())
         finally:
             reset_option("compute.shortcut_limit")
+            reset_option("compute.fused_transform")
 
         with self.assertRaisesRegex(AssertionError, "the first argument should be a callable"):
             kdf.transform(1)
+
+    def test_transform_udf_metrics(self):
+        def plus_one(x) -> ks.Series[np.int64]:
+            assert len(x) <= 2
+            return x + 1
+
+        kdf = ks.DataFrame({'a': [1, 2, 3, 4, 5]})
+        ks.config.clear_udf_metrics()
+        set_option('compute.udf_metrics', True)
+        set_option('compute.udf_max_rows_per_call', 2)
+        try:
+            for _ in range(2):
+                self.assert_eq(kdf.transform(plus_one).sort_index(),
+                               pd.DataFrame({'a': [2, 3, 4, 5, 6]}))
+
+            # The pandas UDFs of the same operation are accumulated together.
+            metrics = ks.config.udf_metrics()
+            self.assertEqual(len(metrics), 1)
+            self.assertEqual(metrics[0].name, 'plus_one(a)')
+            self.assertEqual(metrics[0].rows, 10)
+            self.assertGreater(metrics[0].batches, 0)
+            self.assertGreater(metrics[0].bytes, 0)
+        finally:
+            reset_option('compute.udf_metrics')
+            reset_option('compute.udf_max_rows_per_call')
+
+        ks.config.clear_udf_metrics()
+        self.assertEqual(ks.config.udf_metrics(), [])
+
+    def test_cache(self):
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5], 'b': [1., 2., 3., 4., 5.]},
+                           columns=['a', 'b'])
+        kdf = ks.from_pandas(pdf)
+
+        with kdf.cache() as cached:
+            self.assertTrue(cached._sdf.is_cached)
+            self.assert_eq(cached, pdf)
+        self.assertFalse(cached._sdf.is_cached)
+
+        # Frames built from a Spark DataFrame have the default index attached lazily.
+        for kdf in [ks.range(10), ks.DataFrame(self.spark.range(10))]:
+            self.assertTrue(kdf._internal.has_virtual_index)
+            cached = kdf.cache()
+            try:
+                self.assertTrue(cached._sdf.is_cached)
+                self.assert_eq(cached.sort_index(), pd.DataFrame({'id': range(10)}))
+            finally:
+                cached.unpersist()
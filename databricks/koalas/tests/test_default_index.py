@@ -16,6 +16,7 @@
 import pandas as pd
 
 from databricks import koalas as ks
+from databricks.koalas import config
 from databricks.koalas.config import set_option, reset_option
 from databricks.koalas.testing.utils import ReusedSQLTestCase, TestUtils
 
@@ -36,6 +37,25 @@ class OneByOneDefaultIndexTest(ReusedSQLTestCase, TestUtils):
         sdf = self.spark.range(1000)
         self.assert_eq(ks.DataFrame(sdf).sort_index(), pd.DataFrame({'id': list(range(1000))}))
 
+    def test_virtual_default_index(self):
+        sdf = self.spark.range(10)
+        pdf = pd.DataFrame({'id': list(range(10))})
+
+        kdf = ks.DataFrame(sdf)
+        self.assertTrue(kdf._internal.has_virtual_index)
+
+        # Index-agnostic operations do not attach the default index.
+        kdf = kdf[kdf.id % 2 == 0]
+        kdf['id'].sum()
+        self.assertEqual(len(kdf), 5)
+        self.assertTrue(kdf._internal.has_virtual_index)
+        self.assertEqual(kdf.to_spark().columns, ['id'])
+        self.assertTrue(kdf._internal.has_virtual_index)
+
+        # The filtered rows keep their original index once it is attached.
+        self.assert_eq(kdf.sort_index(), pdf[pdf.id % 2 == 0])
+        self.assertFalse(kdf._internal.has_virtual_index)
+
 
 class DistributedOneByOneDefaultIndexTest(ReusedSQLTestCase, TestUtils):
 
@@ -53,6 +73,46 @@ class DistributedOneByOneDefaultIndexTest(ReusedSQLTestCase, TestUtils):
         sdf = self.spark.range(1000)
         self.assert_eq(ks.DataFrame(sdf).sort_index(), pd.DataFrame({'id': list(range(1000))}))
 
+    def test_default_index_multiple_partitions(self):
+        sdf = self.spark.range(1000, numPartitions=7)
+        self.assert_eq(ks.DataFrame(sdf).sort_index(), pd.DataFrame({'id': list(range(1000))}))
+
+        # Empty partitions should not break the sequence.
+        sdf = self.spark.range(10, numPartitions=3).repartition(20)
+        pdf = ks.DataFrame(sdf).to_pandas()
+        self.assertEqual(sorted(pdf.index), list(range(10)))
+
+    def test_partition_counts_cache(self):
+        config.clear_cache('compute.index_cache_size')
+        sdf = self.spark.range(100, numPartitions=4)
+
+        # The default index is attached lazily.
+        ks.DataFrame(sdf)._internal.sdf
+        info = config.cache_info('compute.index_cache_size')
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 1, 1))
+
+        # Wrapping the same Spark DataFrame again reuses the cached counts.
+        self.assert_eq(ks.DataFrame(sdf).sort_index(), pd.DataFrame({'id': list(range(100))}))
+        info = config.cache_info('compute.index_cache_size')
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+        set_option('compute.index_cache_size', 1)
+        try:
+            ks.DataFrame(self.spark.range(10))._internal.sdf
+            info = config.cache_info('compute.index_cache_size')
+            self.assertEqual((info.misses, info.maxsize, info.currsize), (2, 1, 1))
+        finally:
+            reset_option('compute.index_cache_size')
+            config.clear_cache('compute.index_cache_size')
+
+        # Reading the same path again after it is overwritten does not reuse the cached counts.
+        with self.temp_dir() as tmp:
+            path = '{}/data.parquet'.format(tmp)
+            self.spark.range(10, numPartitions=2).write.parquet(path)
+            self.assertEqual(sorted(ks.read_parquet(path).to_pandas().index), list(range(10)))
+            self.spark.range(30, numPartitions=3).write.mode('overwrite').parquet(path)
+            self.assertEqual(sorted(ks.read_parquet(path).to_pandas().index), list(range(30)))
+
 
 class DistributedDefaultIndexTest(ReusedSQLTestCase, TestUtils):
 
@@ -16,6 +16,8 @@
 
 import inspect
 from distutils.version import LooseVersion
+
+import numpy as np
 import pandas as pd
 
 from databricks import koalas
@@ -166,6 +168,34 @@ class GroupByTest(ReusedSQLTestCase, TestUtils):
             self.assert_eq(kdf.groupby("a", as_index=as_index).agg({"b": "nunique"}),
                            pdf.groupby("a", as_index=as_index).agg({"b": "nunique"}))
 
+    def test_approx_aggregates(self):
+        pdf = pd.DataFrame({'a': [1, 1, 1, 1, 1, 0, 0, 0, 0, 0],
+                            'b': [2, 2, 2, 3, 3, 4, 4, 5, 5, 5],
+                            'c': [1., 2., 3., np.nan, 5., 6., 7., 8., 9., 10.]})
+        kdf = koalas.DataFrame(pdf)
+
+        # The estimates are exact for such small numbers of distinct values.
+        self.assert_eq(kdf.groupby("a").nunique(approx=True, rsd=0.01),
+                       pdf.groupby("a").nunique())
+        self.assert_eq(kdf.groupby("a").approx_nunique(dropna=False),
+                       pdf.groupby("a").nunique(dropna=False))
+        self.assert_eq(kdf.groupby("a")['b'].approx_nunique(),
+                       pdf.groupby("a")['b'].nunique())
+        self.assert_eq(kdf.groupby("a").agg({"b": "approx_nunique"}, rsd=0.01),
+                       pdf.groupby("a").agg({"b": "nunique"}))
+
+        self.assert_eq(kdf.groupby("a").approx_quantile(0.0).sort_index(),
+                       pdf.groupby("a").min().sort_index())
+        self.assert_eq(kdf.groupby("a")['c'].approx_quantile(1.0).sort_index(),
+                       pdf.groupby("a")['c'].max().sort_index())
+        self.assert_eq(kdf.groupby("a").agg({"c": ["min", "approx_quantile"]}, q=0.0)
+                       .sort_index()[("c", "approx_quantile")].rename("c"),
+                       pdf.groupby("a")['c'].min().sort_index())
+
+        self.assertRaises(ValueError, lambda: kdf.groupby("a").approx_quantile(1))
+        self.assertRaises(ValueError, lambda: kdf.groupby("a").approx_quantile(1.5))
+        self.assertRaises(ValueError, lambda: kdf.groupby("a").approx_quantile(0.5, 1.0))
+
     def test_value_counts(self):
         pdf = pd.DataFrame({'A': [1, 2, 2, 3, 3, 3],
                             'B': [1, 1, 2, 3, 3, 3]}, columns=['A', 'B'])
@@ -302,6 +332,24 @@ class GroupByTest(ReusedSQLTestCase, TestUtils):
         with self.assertRaisesRegex(ValueError, "idxmax do not support multi-index now"):
             kdf.set_index(['a', 'b']).groupby(['c'])['d'].nlargest(1)
 
+    def test_nlargest_nsmallest_keep_first(self):
+        pdf = pd.DataFrame({'a': [i % 3 for i in range(60)],
+                            'b': [np.nan if i % 11 == 0 else float(i % 4) for i in range(60)],
+                            'c': [i % 2 for i in range(60)]},
+                           index=np.random.rand(60))
+        kdf = koalas.from_pandas(pdf)
+
+        for n in [1, 2, 5]:
+            self.assert_eq(kdf.groupby('a')['b'].nlargest(n).sort_index(),
+                           pdf.groupby('a')['b'].nlargest(n).sort_index())
+            self.assert_eq(kdf.groupby('a')['b'].nsmallest(n).sort_index(),
+                           pdf.groupby('a')['b'].nsmallest(n).sort_index())
+            self.assert_eq(kdf.groupby(['a', 'c'])['b'].nlargest(n).sort_index(),
+                           pdf.groupby(['a', 'c'])['b'].nlargest(n).sort_index())
+
+        with self.assertRaisesRegex(NotImplementedError, "only for 'first'"):
+            kdf.groupby('a')['b'].nlargest(1, keep='last')
+
     def test_fillna(self):
         pdf = pd.DataFrame({'A': [1, 1, 2, 2],
                             'B': [2, 4, None, 3],
@@ -378,6 +426,64 @@ class GroupByTest(ReusedSQLTestCase, TestUtils):
         finally:
             reset_option('compute.shortcut_limit')
 
+    def test_apply_with_probe(self):
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, 6] * 300,
+                            'b': [1, 1, 2, 3, 5, 8] * 300,
+                            'c': [1, 4, 9, 16, 25, 36] * 300}, columns=['a', 'b', 'c'])
+        kdf = koalas.DataFrame(pdf)
+
+        set_option('compute.shortcut_limit', 1000)
+        try:
+            # Two groups have 900 rows, which are reused, but all the five groups do not fit.
+            for probe_groups in [2, 5]:
+                set_option('compute.groupby_probe_groups', probe_groups)
+                self.assert_eq(kdf.groupby("b").apply(lambda x: x + 1).sort_index(),
+                               pdf.groupby("b").apply(lambda x: x + 1).sort_index())
+                self.assert_eq(kdf.groupby(['a', 'b']).apply(lambda x: x * x).sort_index(),
+                               pdf.groupby(['a', 'b']).apply(lambda x: x * x).sort_index())
+
+            koalas.config.clear_udf_metrics()
+            set_option('compute.groupby_probe_groups', 2)
+            set_option('compute.udf_metrics', True)
+            kdf.groupby("b").apply(lambda x: x + 1)
+            metrics = koalas.config.udf_metrics()
+            self.assertEqual([m.name for m in metrics], ['GroupBy.apply probe', 'GroupBy.apply'])
+            self.assertEqual((metrics[0].rows, metrics[0].batches), (900, 2))
+        finally:
+            reset_option('compute.shortcut_limit')
+            reset_option('compute.groupby_probe_groups')
+            reset_option('compute.udf_metrics')
+            koalas.config.clear_udf_metrics()
+
+    def test_apply_partition_local(self):
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, 6] * 300,
+                            'b': [1, 1, 2, 3, 5, 8] * 300,
+                            'c': [1., 4., 9., np.nan, 25., 36.] * 300}, columns=['a', 'b', 'c'])
+        kdf = koalas.DataFrame(pdf)
+        self.assertIsNone(kdf._internal.partitioned_by)
+
+        # The fallback of filter keeps the rows of each group in the same partition.
+        kfiltered = kdf.groupby("b").filter(lambda x: len(x) > 300)
+        pfiltered = pdf.groupby("b").filter(lambda x: len(x) > 300)
+        self.assert_eq(kfiltered.sort_index(), pfiltered.sort_index())
+        self.assertEqual(kfiltered._internal.partitioned_by, ['b'])
+
+        for by in ["b", ['a', 'b']]:
+            with self.assertLogs('databricks.koalas.groupby', level='INFO') as cm:
+                self.assert_eq(kfiltered.groupby(by).apply(lambda x: x + x.min()).sort_index(),
+                               pfiltered.groupby(by).apply(lambda x: x + x.min()).sort_index())
+            self.assertTrue(any('within each partition' in output for output in cm.output))
+
+        with self.assertLogs('databricks.koalas.groupby', level='INFO') as cm:
+            self.assert_eq(kfiltered.groupby("b").transform(lambda x: x.cumsum()).sort_index(),
+                           pfiltered.groupby("b").transform(lambda x: x.cumsum()).sort_index())
+        self.assertTrue(any('within each partition' in output for output in cm.output))
+
+        # Grouping by other keys shuffles.
+        self.assertIsNone(kfiltered.groupby(kfiltered.b + 1)._groupkey_columns())
+        self.assert_eq(kfiltered.groupby("a").apply(lambda x: x + x.min()).sort_index(),
+                       pfiltered.groupby("a").apply(lambda x: x + x.min()).sort_index())
+
     def test_apply_with_new_dataframe(self):
         pdf = pd.DataFrame({
             "timestamp": [0.0, 0.5, 1.0, 0.0, 0.5],
@@ -416,6 +522,25 @@ class GroupByTest(ReusedSQLTestCase, TestUtils):
         self.assert_eq(kdf.groupby(['b'])['a'].transform(lambda x: x).sort_index(),
                        pdf.groupby(['b'])['a'].transform(lambda x: x).sort_index())
 
+        # Aggregates of each group run with Spark window expressions.
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, 6, 7],
+                            'b': [1, 1, 2, 3, 3, 3, 8],
+                            'c': [1., 4., 9., np.nan, 25., 25., 49.]}, columns=['a', 'b', 'c'])
+        kdf = koalas.DataFrame(pdf)
+        for func in [lambda x: x - x.mean(),
+                     lambda x: x / x.sum(),
+                     lambda x: x.rank(),
+                     lambda x: (x - x.min()) / (x.max() - x.min()),
+                     lambda x: 2 * x.std() + x.count()]:
+            with self.assertLogs('databricks.koalas.groupby', level='INFO') as cm:
+                self.assert_eq(kdf.groupby("b").transform(func).sort_index(),
+                               pdf.groupby("b").transform(func).sort_index(), almost=True)
+            self.assertIn('Spark window expressions', cm.output[0])
+
+        with self.assertLogs('databricks.koalas.groupby', level='INFO') as cm:
+            kdf.groupby("b").transform(lambda x: x.cumsum())
+        self.assertIn('pandas UDF', cm.output[0])
+
         set_option('compute.shortcut_limit', 1000)
         try:
             pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, 6] * 300,
@@ -445,6 +570,45 @@ class GroupByTest(ReusedSQLTestCase, TestUtils):
         with self.assertRaisesRegex(TypeError, "<class 'int'> object is not callable"):
             kdf.groupby("b").filter(1)
 
+        # Aggregate predicates run with Spark window aggregates.
+        for func in [lambda x: x.b.mean() < 4,
+                     lambda x: (x['c'].sum() > 20) & (x.a.count() == 1),
+                     lambda x: x.c.max() - x.c.min() != 0,
+                     lambda x: (x.a.nunique() > 1) | (x.c.std() > 1)]:
+            with self.assertLogs('databricks.koalas.groupby', level='INFO') as cm:
+                self.assert_eq(kdf.groupby("b").filter(func).sort_index(),
+                               pdf.groupby("b").filter(func).sort_index())
+            self.assertIn('Spark window aggregates', cm.output[0])
+
+        with self.assertLogs('databricks.koalas.groupby', level='INFO') as cm:
+            kdf.groupby("b").filter(lambda x: len(x) > 1)
+        self.assertIn('pandas UDF', cm.output[0])
+
+        # Missing values in the groups are kept as nulls with a multi-index.
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, 6],
+                            'b': [1, 1, 2, 3, 5, 8],
+                            'c': [1.0, None, 9.0, 16.0, None, 36.0],
+                            'd': ['x', None, 'y', None, 'z', 'w']},
+                           index=pd.MultiIndex.from_tuples(
+                               [('x', 1), ('x', 2), ('y', 1), ('y', 2), ('z', 1), ('z', 2)]),
+                           columns=['a', 'b', 'c', 'd'])
+        kdf = koalas.DataFrame(pdf)
+        self.assert_eq(kdf.groupby("b").filter(lambda x: x.a.sum() > 2).sort_index(),
+                       pdf.groupby("b").filter(lambda x: x.a.sum() > 2).sort_index())
+
+        # The groups of missing keys are dropped in both ways.
+        pdf = pd.DataFrame({'a': [1, 2, 3, 4, 5, 6],
+                            'b': [1.0, 1.0, None, None, 5.0, np.nan],
+                            'd': ['x', None, 'y', None, 'x', 'w']}, columns=['a', 'b', 'd'])
+        kdf = koalas.DataFrame(pdf)
+        for by in ['b', 'd', ['b', 'd']]:
+            with self.assertLogs('databricks.koalas.groupby', level='INFO') as cm:
+                self.assert_eq(kdf.groupby(by).filter(lambda x: x.a.sum() > 0).sort_index(),
+                               pdf.groupby(by).filter(lambda x: x.a.sum() > 0).sort_index())
+            self.assertIn('Spark window aggregates', cm.output[0])
+            self.assert_eq(kdf.groupby(by).filter(lambda x: len(x) > 0).sort_index(),
+                           pdf.groupby(by).filter(lambda x: len(x) > 0).sort_index())
+
     def test_idxmax(self):
         pdf = pd.DataFrame({'a': [1, 1, 2, 2, 3],
                             'b': [1, 2, 3, 4, 5],
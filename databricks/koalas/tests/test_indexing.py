@@ -21,6 +21,7 @@ import numpy as np
 import pandas as pd
 
 from databricks import koalas as ks
+from databricks.koalas.config import set_option, reset_option
 from databricks.koalas.exceptions import SparkPandasIndexingError, SparkPandasNotImplementedError
 from databricks.koalas.testing.utils import ComparisonTestBase, ReusedSQLTestCase, compare_both
 
@@ -172,6 +173,53 @@ class IndexingTest(ReusedSQLTestCase):
 
         self.assert_eq(kdf.at['B', ('bar', 'one')], pdf.at['B', ('bar', 'one')])
 
+    def test_create_index(self):
+        pdf = pd.DataFrame({'a': [float(i) for i in range(20)],
+                            'b': ['x%d' % i for i in range(20)]},
+                           index=[(i * 7) % 20 for i in range(20)])
+        pdf = pd.concat([pdf, pd.DataFrame({'a': [100.0], 'b': ['y']}, index=[3])])
+
+        with ks.from_pandas(pdf).create_index(num_partitions=4) as kdf:
+            key_index = kdf._internal.key_index
+            self.assertIsNotNone(key_index)
+            self.assertEqual(len(key_index.partitions_for([5])), 1)
+            self.assertEqual(key_index.partitions_for([50]), [])
+            self.assertIsNone(key_index.partitions_for(['5']))
+
+            # Looking up a label runs a single task on the partition which contains it.
+            sc = self.spark.sparkContext
+            sc.setJobGroup('test_create_index', 'lookup')
+            try:
+                self.assertEqual(kdf.at[5, 'b'], pdf.at[5, 'b'])
+            finally:
+                sc.setLocalProperty('spark.jobGroup.id', None)
+            tracker = sc.statusTracker()
+            job_ids = tracker.getJobIdsForGroup('test_create_index')
+            self.assertEqual(len(job_ids), 1)
+            stage_ids = tracker.getJobInfo(job_ids[0]).stageIds
+            self.assertEqual([tracker.getStageInfo(i).numTasks for i in stage_ids], [1])
+
+            self.assertEqual(kdf.a.at[12], pdf.a.at[12])
+            np.testing.assert_array_equal(np.sort(kdf.at[3, 'a']), np.sort(pdf.at[3, 'a']))
+            with self.assertRaises(KeyError):
+                kdf.at[50, 'a']
+
+            self.assert_eq(kdf.loc[[5, 12]].sort_index(), pdf.loc[[5, 12]].sort_index())
+            self.assertEqual(len(kdf.loc[[50]].to_pandas()), 0)
+            self.assert_eq(kdf.loc[2:6].sort_index(), pdf.loc[2:6].sort_index())
+
+            # The index is kept on the copies with the same data, and dropped otherwise.
+            self.assertIsNotNone(kdf[['b']]._internal.key_index)
+            self.assertIsNone(kdf.set_index('b')._internal.key_index)
+            self.assertIsNone(kdf[kdf.a > 3]._internal.key_index)
+
+        # The lookups fall back to scanning the data after uncached.
+        self.assertIsNone(key_index.partitions_for([5]))
+        self.assertEqual(kdf.at[5, 'b'], pdf.at[5, 'b'])
+
+        with self.assertRaisesRegex(ValueError, "only supports indices with level 1"):
+            ks.from_pandas(pdf.set_index('b', append=True)).create_index()
+
     def test_loc(self):
         kdf = self.kdf
         pdf = self.pdf
@@ -507,26 +555,76 @@ class IndexingTest(ReusedSQLTestCase):
         self.assert_eq(kseries.iloc[:], pseries.iloc[:])
         self.assert_eq(kseries.iloc[:1], pseries.iloc[:1])
         self.assert_eq(kseries.iloc[:-1], pseries.iloc[:-1])
+        self.assert_eq(kseries.iloc[1:], pseries.iloc[1:])
+        self.assert_eq(kseries.iloc[[2, 0]].sort_index(), pseries.iloc[[0, 2]])
+
+    def test_iloc_positions(self):
+        pdf = pd.DataFrame({'a': range(50), 'b': [str(i) for i in range(50)]},
+                           index=np.random.rand(50))
+        kdf = ks.from_pandas(pdf)
+
+        for indexer in [slice(10, 20), slice(-15, None), slice(-30, -5), slice(3, None, 7),
+                        slice(None, -1, 4), slice(48, 100), slice(60, 70), slice(-100, 2)]:
+            self.assert_eq(kdf.iloc[indexer], pdf.iloc[indexer])
+            self.assert_eq(kdf.b.iloc[indexer], pdf.b.iloc[indexer])
+            self.assert_eq(kdf.iloc[indexer, [1]], pdf.iloc[indexer, [1]])
+
+        for indexer in [[0], [1, 7, 49], [-1, 3], np.array([5, 25, 45]), [], [2, 0, 0]]:
+            self.assert_eq(kdf.iloc[indexer], pdf.iloc[indexer])
+            self.assert_eq(kdf.a.iloc[indexer], pdf.a.iloc[indexer])
+
+        sdf = self.spark.createDataFrame(pdf.reset_index()).repartition(4)
+        kdf = ks.DataFrame(sdf).set_index('index')
+        pdf = kdf.to_pandas()
+        try:
+            for limit in [1000, 5]:
+                set_option("compute.shortcut_limit", limit)
+                for indexer in [slice(10, 20), slice(3, None, 7), [1, 7, 49], [-1, 3]]:
+                    self.assert_eq(kdf.iloc[indexer], pdf.iloc[indexer])
+                    self.assert_eq(kdf.iloc[indexer, [1]], pdf.iloc[indexer, [1]])
+
+            set_option("compute.shortcut_limit", 2)
+            self.assert_eq(kdf.iloc[[2, 5, 40]], pdf.iloc[[2, 5, 40]])
+            with self.assertRaisesRegex(SparkPandasNotImplementedError,
+                                        'unordered or duplicated positions'):
+                kdf.iloc[[2, 0, 0]]
+        finally:
+            reset_option("compute.shortcut_limit")
+
+        # Taking the rows runs a single task on the partition which holds them.
+        sc = self.spark.sparkContext
+        sc.setJobGroup('test_iloc_positions', 'iloc')
+        try:
+            kdf.iloc[[3, 1, 3]]
+        finally:
+            sc.setLocalProperty('spark.jobGroup.id', None)
+        tracker = sc.statusTracker()
+        job_ids = tracker.getJobIdsForGroup('test_iloc_positions')
+        self.assertEqual(len(job_ids), 1)
+        stage_ids = tracker.getJobInfo(job_ids[0]).stageIds
+        self.assertEqual([tracker.getStageInfo(i).numTasks for i in stage_ids], [1])
 
     def test_iloc_raises(self):
         pdf = pd.DataFrame({"A": [1, 2], "B": [3, 4], "C": [5, 6]})
         kdf = ks.from_pandas(pdf)
 
         with self.assertRaisesRegex(SparkPandasNotImplementedError,
-                                    'Cannot use start or step with Spark.'):
-            kdf.iloc[0:]
+                                    'Cannot use negative step with Spark.'):
+            kdf.iloc[::-1]
 
-        with self.assertRaisesRegex(SparkPandasNotImplementedError,
-                                    'Cannot use start or step with Spark.'):
-            kdf.iloc[:2:2]
+        with self.assertRaisesRegex(ValueError, 'slice step cannot be zero'):
+            kdf.iloc[::0]
+
+        with self.assertRaisesRegex(IndexError, 'positional indexers are out-of-bounds'):
+            kdf.iloc[[0, 2], :]
 
         with self.assertRaisesRegex(SparkPandasNotImplementedError,
-                                    '.iloc requires numeric slice or conditional boolean Index'):
-            kdf.iloc[[0, 1], :]
+                                    '.iloc requires numeric slice, list of integers'):
+            kdf.iloc[[True, False], :]
 
         with self.assertRaisesRegex(SparkPandasNotImplementedError,
-                                    '.iloc requires numeric slice or conditional boolean Index'):
-            kdf.A.iloc[[0, 1]]
+                                    '.iloc requires numeric slice, list of integers'):
+            kdf.A.iloc[0]
 
         with self.assertRaisesRegex(SparkPandasIndexingError,
                                     'Only accepts pairs of candidates'):
@@ -14,6 +14,7 @@
 # limitations under the License.
 #
 from databricks import koalas as ks
+from databricks.koalas import config
 from databricks.koalas.config import set_option, reset_option
 from databricks.koalas.testing.utils import ReusedSQLTestCase
 
@@ -93,3 +94,39 @@ class ReprTests(ReusedSQLTestCase):
             self.assertEqual(kdf._repr_html_(), kdf.to_pandas()._repr_html_())
         finally:
             set_option("display.max_rows", ReprTests.max_display_count)
+
+    def test_repr_result_cache(self):
+        kdf = ks.range(ReprTests.max_display_count + 1)
+
+        # The result cache is disabled by default.
+        config.clear_cache('compute.result_cache_bytes')
+        repr(kdf)
+        info = config.cache_info('compute.result_cache_bytes')
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+        set_option('compute.result_cache', True)
+        try:
+            kdf = ks.range(ReprTests.max_display_count + 1)
+            expected = repr(kdf)
+            info = config.cache_info('compute.result_cache_bytes')
+            self.assertEqual((info.hits, info.misses), (0, 1))
+            self.assertGreater(info.currsize, 0)
+
+            # Displaying the unchanged DataFrame again reuses the collected result.
+            self.assertEqual(repr(kdf), expected)
+            info = config.cache_info('compute.result_cache_bytes')
+            self.assertEqual((info.hits, info.misses), (1, 1))
+
+            # Modifying the returned pandas DataFrame does not affect the cache.
+            kdf.head(ReprTests.max_display_count + 1).to_pandas()['id'] = -1
+            self.assertEqual(repr(kdf), expected)
+
+            set_option('compute.result_cache_bytes', 1)
+            config.clear_cache('compute.result_cache_bytes')
+            repr(ks.range(ReprTests.max_display_count + 1))
+            info = config.cache_info('compute.result_cache_bytes')
+            self.assertEqual((info.misses, info.currsize), (1, 0))
+        finally:
+            reset_option('compute.result_cache')
+            reset_option('compute.result_cache_bytes')
+            config.clear_cache('compute.result_cache_bytes')
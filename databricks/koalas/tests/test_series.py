@@ -24,6 +24,7 @@ matplotlib.use('agg')
 from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
+from pyspark.sql import functions as F
 
 from databricks import koalas
 from distutils.version import LooseVersion
@@ -87,7 +88,8 @@ class SeriesTest(ReusedSQLTestCase, SQLTestUtils):
 
         self.assert_eq(ks.head(3), ps.head(3))
 
-        # TODO: self.assert_eq(ks.tail(3), ps.tail(3))
+        self.assert_eq(ks.tail(3), ps.tail(3))
+        self.assert_eq(ks.tail(-3), ps.tail(-3))
 
     def test_rename(self):
         ps = pd.Series([1, 2, 3, 4, 5, 6, 7], name='x')
@@ -556,6 +558,26 @@ class SeriesTest(ReusedSQLTestCase, SQLTestUtils):
         with self.assertRaisesRegex(ValueError, msg):
             kser.rank(method='nothing')
 
+    def test_rank_by_ranges(self):
+        # Many ties spread over several ranges of the values.
+        pser = pd.Series([(i * 37) % 23 for i in range(100)], name='x')
+        kser = koalas.from_pandas(pser)
+        self.assertIsNone(kser._internal.ordered_ranges([kser._scol]))
+        koalas.set_option('compute.ordered_window_rows', 10)
+        try:
+            range_scol, num_ranges = kser._internal.ordered_ranges([kser._scol])
+            ranges = kser._kdf._sdf.select(range_scol.alias('range'), kser._scol.alias('x')) \
+                .groupby('range').agg(F.min('x').alias('min'), F.max('x').alias('max')) \
+                .sort('range').collect()
+            self.assertTrue(all(0 <= row['range'] < num_ranges for row in ranges))
+            self.assertTrue(all(prev['max'] <= cur['min'] for prev, cur in zip(ranges, ranges[1:])))
+            for method in ['average', 'min', 'max', 'first', 'dense']:
+                for ascending in [True, False]:
+                    self.assert_eq(kser.rank(method=method, ascending=ascending).sort_index(),
+                                   pser.rank(method=method, ascending=ascending))
+        finally:
+            koalas.reset_option('compute.ordered_window_rows')
+
     def test_round(self):
         pser = pd.Series([0.028208, 0.038683, 0.877076], name='x')
         kser = koalas.from_pandas(pser)
@@ -622,6 +644,24 @@ class SeriesTest(ReusedSQLTestCase, SQLTestUtils):
         with self.assertRaisesRegex(ValueError, 'periods should be an int; however'):
             kser.shift(periods=1.5)
 
+    def test_is_monotonic(self):
+        pser = pd.Series(np.arange(100) // 3, index=np.arange(100) * 2, name='x')
+        cases = [pser, -pser, pser.astype(float), pser.astype(str),
+                 pd.Series([float(i) for i in range(99)] + [np.nan]),
+                 pd.Series([1] * 50 + [None] + [1] * 49),
+                 pd.Series(list(range(50)) + [49] + list(range(49, 0, -1)))]
+        koalas.set_option('compute.ordered_window_rows', 10)
+        try:
+            for pser in cases:
+                kser = koalas.from_pandas(pser)
+                internal = kser._kdf._internal
+                self.assertIsNotNone(internal.ordered_ranges(internal.index_scols))
+                self.assertEqual(kser.is_monotonic, pser.is_monotonic)
+                self.assertEqual(kser.is_monotonic_decreasing, pser.is_monotonic_decreasing)
+                self.assertEqual(kser.index.is_monotonic, pser.index.is_monotonic)
+        finally:
+            koalas.reset_option('compute.ordered_window_rows')
+
     def test_astype(self):
         pser = pd.Series([10, 20, 15, 30, 45], name='x')
         kser = koalas.Series(pser)
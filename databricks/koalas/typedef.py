@@ -31,6 +31,7 @@ from pyspark.sql.functions import pandas_udf
 import pyspark.sql.types as types
 
 from databricks import koalas as ks  # For running doctests and reference resolution in PyCharm.
+from databricks.koalas.utils import wrap_pandas_udf_func
 
 
 __all__ = ['pandas_wraps', 'as_spark_type',
@@ -240,7 +241,6 @@ def _make_fun(f: typing.Callable, return_type: types.DataType, *args, **kwargs)
                 full_kwargs[idx] = arg
         return f(*full_args, **full_kwargs)
 
-    wrapped_udf = pandas_udf(clean_fun, returnType=return_type)
     name_tokens = []
     spark_col_args = []
     for col in col_args:
@@ -251,10 +251,11 @@ def _make_fun(f: typing.Callable, return_type: types.DataType, *args, **kwargs)
     for (key, col) in col_kwargs:
         spark_col_args.append(col._scol)
         kw_name_tokens.append("{}={}".format(key, col.name))
-    col = wrapped_udf(*spark_col_args)
-    series = Series(kdf._internal.copy(scol=col), anchor=kdf)  # type: 'ks.Series'
     all_name_tokens = name_tokens + sorted(kw_name_tokens)
     name = "{}({})".format(f.__name__, ", ".join(all_name_tokens))
+    wrapped_udf = pandas_udf(wrap_pandas_udf_func(name, clean_fun), returnType=return_type)
+    col = wrapped_udf(*spark_col_args)
+    series = Series(kdf._internal.copy(scol=col), anchor=kdf)  # type: 'ks.Series'
     series = series.astype(return_type).alias(name)
     return series
 
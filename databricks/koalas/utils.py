@@ -18,12 +18,16 @@ Commonly used utils in Koalas.
 """
 
 import functools
-from collections import OrderedDict
-from typing import Callable, Dict, List, Tuple, Union
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Dict, List, Tuple, Union
 
 from pyspark import sql as spark
+from pyspark.accumulators import AccumulatorParam
 from pyspark.sql import functions as F
 from pyspark.sql.types import FloatType
+import numpy as np
 import pandas as pd
 
 from databricks import koalas as ks  # For running doctests and reference resolution in PyCharm.
@@ -338,6 +342,177 @@ def lazy_property(fn):
     return _lazy_property
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache(object):
+    """
+    A thread-safe bounded cache which evicts the least recently used entries first.
+
+    Each entry has a weight, 1 by default, and the total weight of the entries is bounded by
+    the maximum size. The maximum size is given when an entry is put so that it can follow
+    the current value of the corresponding option.
+
+    >>> cache = LRUCache()
+    >>> cache.put('a', 1, maxsize=2)
+    >>> cache.put('b', 2, maxsize=2)
+    >>> cache.get('a')
+    1
+    >>> cache.put('c', 3, maxsize=2)
+    >>> cache.get('b') is None
+    True
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=1, maxsize=2, currsize=2)
+
+    >>> cache.put('d', 4, maxsize=3, weight=2)
+    >>> cache.get('a') is None, cache.get('c', match=lambda v: v == 3), cache.get('d')
+    (True, 3, 4)
+    >>> cache.cache_info()
+    CacheInfo(hits=3, misses=2, maxsize=3, currsize=3)
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._weights = dict()  # type: Dict[Any, int]
+        self._currsize = 0
+        self._maxsize = None
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Any, default: Any = None, match: Callable[[Any], bool] = None) -> Any:
+        """
+        Return the cached value for the given key and mark it as recently used.
+
+        If `match` is given, the cached value is returned only when `match` returns True for it.
+        """
+        with self._lock:
+            if key in self._entries and (match is None or match(self._entries[key])):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            else:
+                self._misses += 1
+                return default
+
+    def put(self, key: Any, value: Any, maxsize: int, weight: int = 1) -> None:
+        """
+        Cache the value for the given key, evicting the least recently used entries.
+
+        The value is not cached if its weight alone exceeds the maximum size.
+        """
+        with self._lock:
+            self._maxsize = maxsize
+            self._pop(key)
+            if weight > maxsize:
+                return
+            self._entries[key] = value
+            self._weights[key] = weight
+            self._currsize += weight
+            while self._currsize > maxsize:
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: Any) -> None:
+        if key in self._entries:
+            del self._entries[key]
+            self._currsize -= self._weights.pop(key)
+
+    def clear(self) -> None:
+        """ Remove all the entries and reset the statistics. """
+        with self._lock:
+            self._entries.clear()
+            self._weights.clear()
+            self._currsize = 0
+            self._hits = 0
+            self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """ Return the statistics of the cache. """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, self._currsize)
+
+
+UDFMetrics = namedtuple("UDFMetrics", ["name", "rows", "batches", "python_time", "bytes"])
+
+
+class _UDFMetricsParam(AccumulatorParam):
+    """ Accumulates the tuples of rows, batches, time in seconds and bytes element-wise. """
+
+    def zero(self, value):
+        return 0, 0, 0.0, 0
+
+    def addInPlace(self, value1, value2):
+        return tuple(v1 + v2 for v1, v2 in zip(value1, value2))
+
+
+def _memory_usage(pobj: Any) -> int:
+    if isinstance(pobj, pd.DataFrame):
+        return int(pobj.memory_usage(index=False).sum())
+    elif isinstance(pobj, pd.Series):
+        return int(pobj.memory_usage(index=False))
+    else:
+        return 0
+
+
+def udf_metrics_accumulator(name: str):
+    """
+    Returns the accumulator of the metrics reported by the given name if 'compute.udf_metrics'
+    is enabled, otherwise None. The pandas UDFs of the same name share one accumulator. The
+    accumulator takes tuples of rows, batches, time in seconds and bytes.
+    """
+    from databricks.koalas.config import get_option, _udf_metrics
+
+    if not get_option("compute.udf_metrics"):
+        return None
+    if name not in _udf_metrics:
+        _udf_metrics[name] = default_session().sparkContext.accumulator(
+            (0, 0, 0.0, 0), _UDFMetricsParam())
+    return _udf_metrics[name]
+
+
+def wrap_pandas_udf_func(name: str, func: Callable, grouped: bool = False) -> Callable:
+    """
+    Wraps the function of a pandas UDF to follow 'compute.udf_max_rows_per_call' and
+    'compute.udf_metrics'. The options are read when the pandas UDF is built.
+
+    :param name: the name of the operation reported in the metrics.
+    :param func: the function taking and returning pandas Series or DataFrames.
+    :param grouped: whether `func` is for a grouped map pandas UDF, which takes one
+        pandas DataFrame of a whole group and is not split into calls.
+    :return: the wrapped function, or `func` itself if neither option is set.
+    """
+    from databricks.koalas.config import get_option
+
+    max_rows = None if grouped else get_option("compute.udf_max_rows_per_call")
+    accumulator = udf_metrics_accumulator(name)
+
+    if max_rows is None and accumulator is None:
+        return func
+
+    def call(*args):
+        start = time.time()
+        rows = len(args[0]) if len(args) > 0 else 0
+        if max_rows is not None and rows > max_rows:
+            results = [func(*[arg.iloc[i:i + max_rows] for arg in args])
+                       for i in range(0, rows, max_rows)]
+            if all(isinstance(result, (pd.Series, pd.DataFrame)) for result in results):
+                result = pd.concat(results)
+            else:
+                result = np.concatenate(results)
+        else:
+            result = func(*args)
+        if accumulator is not None:
+            nbytes = sum(_memory_usage(arg) for arg in args) + _memory_usage(result)
+            accumulator.add((rows, 1, time.time() - start, nbytes))
+        return result
+
+    if grouped:
+        # Spark checks the number of the arguments of grouped map pandas UDFs.
+        return functools.wraps(func)(lambda pdf: call(pdf))
+    else:
+        return functools.wraps(func)(call)
+
+
 def scol_for(sdf: spark.DataFrame, column_name: str) -> spark.Column:
     """ Return Spark Column for the given column name. """
     return sdf['`{}`'.format(column_name)]